@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+
+"""
+Store of the benchmark metrics and comparison against a pinned baseline.
+
+Every metric of a benchmark run (see BenchmarkResults.set) is stored as a record with the benchmark name and
+parameters, the metric name, value and unit, and the hashes of the SC node jar and of the zend binary, so the runs
+of different versions can be queried together:
+    {"runId": "sync-1700000000", "benchmark": "sync", "params": {...}, "metric": "timeToTipSecs.2000", "value": 12.5,
+     "unit": "s", "startedAt": 1700000000.0, "jarHash": "...", "zendHash": "..."}
+Nested metrics, e.g. the latency summaries, are flattened as "blockLatencyMs.p95".
+
+The store is a JSONL file, one record per line, or a SQLite database if its name ends with .db or .sqlite.
+
+A baseline is a benchmark results JSON file pinned in a directory, e.g.:
+    cp benchmark_results/sync.json benchmark_baseline/
+    python3 sc_benchmark_sync.py --benchmarkbaseline=benchmark_baseline
+Every metric with a known direction (see get_metric_unit) is compared with the baseline one of the same
+parameters: a change in the worse direction beyond the noise threshold of the metric is a regression.
+"""
+
+# Noise threshold of the metrics without a specific one, relative to the baseline value
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+
+# Metric name suffix, unit and True if higher values are better. The first matching suffix is used.
+METRIC_UNITS = [
+    ("PerSec", "1/s", True),
+    ("BytesPerBlock", "bytes/block", False),
+    ("Bytes", "bytes", False),
+    ("Ms", "ms", False),
+    ("Secs", "s", False),
+    ("Mb", "MB", False),
+    ("Amplification", "ratio", False)
+]
+
+# Changes smaller than these absolute values are noise whatever the relative change, e.g. 0 ms to 1 ms
+MIN_ABSOLUTE_CHANGE = {"ms": 1.0, "s": 0.1, "MB": 1.0, "bytes": 1024, "bytes/block": 16}
+
+
+def get_metric_unit(metric, units=None):
+    """
+    Unit of a metric, as set with BenchmarkResults.set or inferred from the suffix of its name. The innermost part
+    of a flattened name with a known suffix is used, e.g. "blockLatencyMs.p95" and "epochLength10.totalSecs" are
+    in ms and s.
+    Counts of samples ("count" of the latency summaries) and unknown suffixes have no unit and are not compared.
+
+    Parameters:
+     - metric: flattened metric name
+     - units: dict of the metrics units set explicitly
+
+    Output: (unit, True if higher values are better), (None, None) if unknown
+    """
+    path = metric.split(".")
+    if path[-1] == "count":
+        return None, None
+    if units is not None and path[0] in units:
+        return units[path[0]], units[path[0]].endswith("/s")
+    for part in reversed(path):
+        # e.g. "peakRssMb100", the metric of 100 clients
+        name = re.sub(r"\d+$", "", part)
+        for (suffix, unit, higher_is_better) in METRIC_UNITS:
+            if name.lower().endswith(suffix.lower()):
+                return unit, higher_is_better
+    return None, None
+
+
+def flatten_metrics(metrics, prefix=""):
+    """
+    Output: dict of the numeric metrics, nested dicts are flattened with dotted names
+    """
+    flat = {}
+    for (name, value) in metrics.items():
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, prefix + str(name) + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + str(name)] = value
+    return flat
+
+
+def file_sha256(path):
+    """
+    Output: the SHA-256 hex digest of a file, None if it doesn't exist
+    """
+    if path is None or not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_build_hashes(options):
+    """
+    Output: dict with the hashes of the SC node jar (see the scjarpath option) and of the zend binary
+    (see the BITCOIND environment variable), None if not found
+    """
+    jar = re.search(r"[^;:\s]+\.jar", options.scjarpath)
+    zend = shutil.which(os.getenv("BITCOIND", "zend"))
+    return {"jarHash": file_sha256(jar.group(0) if jar is not None else None), "zendHash": file_sha256(zend)}
+
+
+class BenchmarkStore(object):
+    """
+    Append-only store of the benchmark metrics records.
+
+    Parameters:
+     - path: JSONL file, or SQLite database if the name ends with .db or .sqlite
+    """
+
+    columns = ["runId", "benchmark", "params", "metric", "value", "unit", "startedAt", "jarHash", "zendHash"]
+
+    def __init__(self, path):
+        self.path = path
+        self.is_sqlite = path.endswith(".db") or path.endswith(".sqlite")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("CREATE TABLE IF NOT EXISTS metrics ({0})".format(", ".join(self.columns)))
+        return connection
+
+    def append(self, records):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        if self.is_sqlite:
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT INTO metrics VALUES ({0})".format(", ".join("?" * len(self.columns))),
+                    [[json.dumps(record[column], sort_keys=True) if column == "params" else record[column]
+                      for column in self.columns] for record in records])
+            connection.close()
+        else:
+            with open(self.path, "a") as store_file:
+                for record in records:
+                    store_file.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def records(self, benchmark=None):
+        """
+        Output: list of the stored records, only the ones of a benchmark if specified, in insertion order
+        """
+        if not os.path.isfile(self.path):
+            return []
+        if self.is_sqlite:
+            connection = self._connect()
+            rows = connection.execute("SELECT {0} FROM metrics ORDER BY rowid".format(", ".join(self.columns)))
+            records = [dict(zip(self.columns, row)) for row in rows]
+            connection.close()
+            for record in records:
+                record["params"] = json.loads(record["params"])
+        else:
+            with open(self.path) as store_file:
+                records = [json.loads(line) for line in store_file if line.strip() != ""]
+        return [record for record in records if benchmark is None or record["benchmark"] == benchmark]
+
+
+def parse_metric_thresholds(text):
+    """
+    Parse the noise thresholds of specific metrics, e.g. "blockLatencyMs.p99=0.3,connectSecs=0.5".
+    """
+    thresholds = {}
+    for item in text.split(",") if text else []:
+        (metric, threshold) = item.split("=")
+        thresholds[metric.strip()] = float(threshold)
+    return thresholds
+
+
+def compare_to_baseline(results_json, baseline_json, default_threshold=DEFAULT_REGRESSION_THRESHOLD,
+                        thresholds=None):
+    """
+    Compare the metrics of a benchmark run with the pinned baseline run.
+
+    Parameters:
+     - results_json, baseline_json: results of the runs, see BenchmarkResults.to_json
+     - default_threshold: max relative change in the worse direction considered as noise
+     - thresholds: dict of metric name to its own noise threshold
+
+    Output: list of dicts with metric, unit, baseline, value, relative change, threshold and status:
+    "regression", "improvement" or "unchanged". Empty if the runs have different parameters.
+    """
+    # e.g. tuples of the params of a run not read back from JSON
+    if json.loads(json.dumps(results_json["params"])) != json.loads(json.dumps(baseline_json["params"])):
+        logging.warning("Benchmark {0}: baseline has different parameters, not compared".format(
+            results_json["benchmark"]))
+        return []
+    thresholds = thresholds if thresholds is not None else {}
+    baseline = flatten_metrics(baseline_json["metrics"])
+    comparisons = []
+    for (metric, value) in sorted(flatten_metrics(results_json["metrics"]).items()):
+        (unit, higher_is_better) = get_metric_unit(metric, results_json.get("units"))
+        if unit is None or metric not in baseline:
+            continue
+        threshold = thresholds.get(metric, default_threshold)
+        change = value - baseline[metric]
+        relative_change = change / abs(baseline[metric]) if baseline[metric] != 0 else None
+        worse = change < 0 if higher_is_better else change > 0
+        significant = abs(change) > MIN_ABSOLUTE_CHANGE.get(unit, 0) and \
+            (relative_change is None or abs(relative_change) > threshold)
+        comparisons.append({"metric": metric, "unit": unit, "baseline": baseline[metric], "value": value,
+                            "change": relative_change, "threshold": threshold,
+                            "status": ("regression" if worse else "improvement") if significant else "unchanged"})
+    return comparisons
@@ -0,0 +1,386 @@
+import datetime
+import glob
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, stop_sc_nodes
+from SidechainTestFramework.sc_benchmark_store import BenchmarkStore, DEFAULT_REGRESSION_THRESHOLD, \
+    compare_to_baseline, flatten_metrics, get_build_hashes, get_metric_unit, parse_metric_thresholds
+
+"""
+Helpers shared by the benchmark scripts (qa/sc_benchmark_*.py).
+
+A benchmark collects its measurements in a BenchmarkResults: scalar metrics and series of points, for example the
+latency of every request while the memory pool grows. The results are written as JSON to the benchmark directory,
+so runs of different SDK versions can be compared.
+
+Benchmarks are run like the other tests, the results are written to the qa/benchmark_results directory,
+another one can be set with --benchmarkdir:
+    python3 sc_benchmark_mempool.py --benchmarkdir=/tmp/benchmarks
+
+The metrics of every run are also appended to the --benchmarkstore store and, if --benchmarkbaseline is set,
+compared with the pinned baseline results: the run fails on regressions (see sc_benchmark_store).
+"""
+
+# Outside of the test directory, which is removed at the end of the run
+DEFAULT_BENCHMARK_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../', 'benchmark_results'))
+
+
+DEFAULT_BENCHMARK_STORE = os.path.join(DEFAULT_BENCHMARK_DIR, "benchmarks.jsonl")
+
+
+def add_benchmark_options(parser):
+    parser.add_option("--benchmarkdir", dest="benchmarkdir", default=DEFAULT_BENCHMARK_DIR, action="store",
+                      help="Directory of the benchmark JSON results (default: %default)")
+    parser.add_option("--benchmarkstore", dest="benchmarkstore", default=DEFAULT_BENCHMARK_STORE, action="store",
+                      help="JSONL file, or SQLite database if ending with .db or .sqlite, the metrics of every run "
+                           "are appended to, empty to disable (default: %default)")
+    parser.add_option("--benchmarkbaseline", dest="benchmarkbaseline", default=None, action="store",
+                      help="Directory of the pinned baseline JSON results, the run fails on regressions")
+    parser.add_option("--regressionthreshold", dest="regressionthreshold", type="float",
+                      default=DEFAULT_REGRESSION_THRESHOLD,
+                      help="Max relative change of a metric in the worse direction considered as noise "
+                           "(default: %default)")
+    parser.add_option("--metricthresholds", dest="metricthresholds", default="", action="store",
+                      help="Comma separated noise thresholds of specific metrics, e.g. blockLatencyMs.p99=0.3")
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list, None for an empty list.
+    """
+    if len(sorted_values) == 0:
+        return None
+    rank = max(int(round(p / 100.0 * len(sorted_values))), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_summary(values, percentiles=(50, 95, 99)):
+    """
+    Output: dict with count, mean, max and the requested percentiles of the values
+    """
+    sorted_values = sorted(values)
+    summary = {"count": len(sorted_values),
+               "mean": sum(sorted_values) / len(sorted_values) if len(sorted_values) > 0 else None,
+               "max": sorted_values[-1] if len(sorted_values) > 0 else None}
+    for p in percentiles:
+        summary["p" + str(p)] = percentile(sorted_values, p)
+    return summary
+
+
+def start_new_sidechain(test, network):
+    """
+    Replace the SC nodes of the test with the nodes of a new sidechain created on the same MC node, so a benchmark
+    can compare sidechains with different creation parameters in a single run.
+    The SC nodes are stopped and their directories removed, test.sc_nodes is updated in place.
+
+    Parameters:
+     - test: the SidechainTestFramework instance
+     - network: SCNetworkConfiguration of the new sidechain
+
+    Output: the bootstrap info of the new sidechain, also set as test.sc_nodes_bootstrap_info
+    """
+    stop_sc_nodes(test.sc_nodes)
+    for datadir in glob.glob(os.path.join(test.options.tmpdir, "sc_node*")):
+        shutil.rmtree(datadir)
+    test.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(test.options, network)
+    test.sc_nodes.extend(start_sc_nodes(len(network.sc_nodes_configuration), test.options.tmpdir))
+    return test.sc_nodes_bootstrap_info
+
+
+class BenchmarkResults(object):
+    """
+    Measurements of a benchmark run.
+
+    Parameters:
+     - name: benchmark name, used as the results file name
+     - options: test framework options with the benchmarkdir option
+     - params: benchmark parameters, stored with the results
+    """
+
+    def __init__(self, name, options, params=None):
+        self.name = name
+        self.options = options
+        self.output_dir = options.benchmarkdir
+        self.params = params if params is not None else {}
+        self.started_at = time.time()
+        self.build = get_build_hashes(options)
+        self.metrics = {}
+        self.units = {}
+        self.series = {}
+
+    def set(self, metric, value, unit=None):
+        """
+        Set a metric, its unit is inferred from the name suffix if not specified, see get_metric_unit.
+        """
+        self.metrics[metric] = value
+        if unit is not None:
+            self.units[metric] = unit
+
+    def set_for(self, metric, key, value, unit=None):
+        """
+        Set a metric for a value of a benchmark parameter, e.g. the time to sync every chain length.
+        The metric is a dict of the values by key, stored as "metric.key" (see flatten_metrics).
+        """
+        self.metrics.setdefault(metric, {})[str(key)] = value
+        if unit is not None:
+            self.units[metric] = unit
+
+    def add(self, series, **point):
+        self.series.setdefault(series, []).append(point)
+
+    def to_json(self):
+        return {
+            "benchmark": self.name,
+            "params": self.params,
+            "startedAt": self.started_at,
+            "durationSecs": time.time() - self.started_at,
+            "build": self.build,
+            "metrics": self.metrics,
+            "units": self.units,
+            "series": self.series
+        }
+
+    def to_records(self):
+        """
+        Output: a store record for every flattened metric, see BenchmarkStore
+        """
+        run_id = "{0}-{1}".format(self.name, int(self.started_at))
+        return [dict({"runId": run_id, "benchmark": self.name, "params": self.params, "metric": metric,
+                      "value": value, "unit": get_metric_unit(metric, self.units)[0], "startedAt": self.started_at},
+                     **self.build)
+                for (metric, value) in sorted(flatten_metrics(self.metrics).items())]
+
+    def check_baseline(self, results_json):
+        """
+        Compare the results with the pinned baseline ones, if any, and fail on regressions.
+        """
+        baseline_path = os.path.join(self.options.benchmarkbaseline, self.name + ".json")
+        if not os.path.isfile(baseline_path):
+            logging.warning("Benchmark {0}: no baseline {1}".format(self.name, baseline_path))
+            return
+        with open(baseline_path) as baseline_file:
+            baseline_json = json.load(baseline_file)
+        comparisons = compare_to_baseline(results_json, baseline_json, self.options.regressionthreshold,
+                                          parse_metric_thresholds(self.options.metricthresholds))
+        for comparison in comparisons:
+            if comparison["status"] != "unchanged":
+                logging.info("  {status} {metric}: {baseline} -> {value} {unit}".format(**comparison))
+        regressions = [comparison["metric"] for comparison in comparisons if comparison["status"] == "regression"]
+        if len(regressions) > 0:
+            raise AssertionError("Benchmark {0} regressions against the baseline {1} (jar {2}): {3}".format(
+                self.name, baseline_path, baseline_json.get("build", {}).get("jarHash"), ", ".join(regressions)))
+
+    def write(self):
+        if not os.path.isdir(self.output_dir):
+            os.makedirs(self.output_dir)
+        path = os.path.join(self.output_dir, self.name + ".json")
+        results_json = self.to_json()
+        with open(path, "w") as results_file:
+            json.dump(results_json, results_file, indent=2)
+        logging.info("Benchmark {0} results written to {1}".format(self.name, path))
+        for (metric, value) in sorted(self.metrics.items()):
+            logging.info("  {0}: {1}".format(metric, value))
+        if self.options.benchmarkstore:
+            BenchmarkStore(self.options.benchmarkstore).append(self.to_records())
+        if self.options.benchmarkbaseline is not None:
+            self.check_baseline(results_json)
+        return path
+
+
+class ProcessMemorySampler(object):
+    """
+    Sample the resident memory of a process in a background thread, e.g. the SC node java process
+    (see scutil.get_sc_node_pids), to get its peak while a long operation is running.
+    psutil is imported only here, so the regular tests using the other helpers don't require it.
+
+    Parameters:
+     - pid: id of the process to sample
+     - interval: time between two samples in secs
+
+    Example:
+        with ProcessMemorySampler(get_sc_node_pids()[0]) as sampler:
+            wait_for_certificate(sc_node, epoch)
+        results.set("peakRssMb", sampler.peak_rss_mb())
+    """
+
+    def __init__(self, pid, interval=0.1):
+        import psutil
+        self.process = psutil.Process(pid)
+        self.no_such_process = psutil.NoSuchProcess
+        self.interval = interval
+        self.samples = []
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while True:
+            try:
+                self.samples.append((time.time(), self.process.memory_info().rss))
+            except self.no_such_process:
+                return
+            if self._stopped.wait(self.interval):
+                return
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def peak_rss_mb(self):
+        return max(rss for (_, rss) in self.samples) / 1024 ** 2 if len(self.samples) > 0 else None
+
+
+def read_process_io(pid):
+    """
+    Output: the I/O counters of a process from /proc/<pid>/io as a dict, e.g. "write_bytes" is the number of bytes
+    sent to the storage layer and "wchar" the number of bytes passed to write calls; None if not available
+    (not Linux, or the process is not readable)
+    """
+    try:
+        with open("/proc/{0}/io".format(pid)) as io_file:
+            return {name.strip(): int(value) for (name, value) in (line.split(":") for line in io_file)}
+    except (IOError, ValueError):
+        return None
+
+
+class StorageSampler(object):
+    """
+    Sample the on-disk size of the storages of a SC node, e.g. history, state and wallet, each one is a LevelDB
+    database in a sub directory of the node blockchain directory, together with the bytes written by the node process.
+    The node also writes its log file, at debug level by default (--logfilelevel): the growth of the log directory
+    is sampled too and subtracted from the bytes written by the process, so they only account for the storages.
+
+    Parameters:
+     - sc_node: API connection of the SC node, as returned by start_sc_node
+     - pid: id of the SC node process (see scutil.get_sc_node_pids), the bytes written are not sampled if None
+
+    Example:
+        sampler = StorageSampler(sc_node, get_sc_node_pids()[0])
+        previous = sampler.sample()
+        generate_next_blocks(sc_node, "first node", 100)
+        growth = sampler.growth(previous, sampler.sample())
+    """
+
+    def __init__(self, sc_node, pid=None):
+        self.blockchain_dir = os.path.join(sc_node.dataDir, "blockchain")
+        self.log_dir = os.path.dirname(get_sc_node_log_path(sc_node))
+        self.pid = pid
+
+    def sample(self):
+        """
+        Output: dict with "storages": bytes, files count and LevelDB table files count of every storage,
+        "totalBytes", "logBytes": bytes of the node log directory and "io": the process I/O counters
+        """
+        storages = {}
+        for name in sorted(os.listdir(self.blockchain_dir)):
+            storage_dir = os.path.join(self.blockchain_dir, name)
+            if not os.path.isdir(storage_dir):
+                continue
+            files = [os.path.join(root, file_name) for (root, _, file_names) in os.walk(storage_dir)
+                     for file_name in file_names]
+            storages[name] = {
+                "bytes": sum(os.path.getsize(path) for path in files if os.path.isfile(path)),
+                "files": len(files),
+                "tableFiles": len([path for path in files if path.endswith(".ldb") or path.endswith(".sst")])
+            }
+        return {"time": time.time(),
+                "storages": storages,
+                "totalBytes": sum(storage["bytes"] for storage in storages.values()),
+                "logBytes": sum(os.path.getsize(os.path.join(root, file_name))
+                                for (root, _, file_names) in os.walk(self.log_dir) for file_name in file_names),
+                "io": read_process_io(self.pid) if self.pid is not None else None}
+
+    def growth(self, previous, current):
+        """
+        Output: dict with the bytes added to every storage, to all of them and to the log directory, and the bytes
+        written by the process between two samples, without the log ones (None if not sampled)
+        """
+        # A rotation may shrink the log directory
+        log_bytes = max(current["logBytes"] - previous["logBytes"], 0)
+        written = current["io"]["write_bytes"] - previous["io"]["write_bytes"] - log_bytes \
+            if current["io"] is not None and previous["io"] is not None else None
+        return {"storagesBytes": {name: storage["bytes"] - previous["storages"].get(name, {"bytes": 0})["bytes"]
+                                  for (name, storage) in current["storages"].items()},
+                "totalBytes": current["totalBytes"] - previous["totalBytes"],
+                "logBytes": log_bytes,
+                "writtenBytes": written}
+
+
+# Timestamp of the SC node log lines, see LOG_PATTERN in log4j2.xml
+SC_NODE_LOG_TIMESTAMP = re.compile(r"^\[\w+\s*\] (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}:\d{3} [+-]\d{4})")
+
+
+# Log lines marking the SC node startup stages, see SidechainApp and SidechainNodeViewHolder
+SC_NODE_STARTUP_LOG_MARKERS = {
+    "applicationStarted": "Starting application with settings",
+    "restoreStarted": "Restoring persistent state from storage",
+    "restoreFinished": "state, history and wallet storages are consistent"
+}
+
+
+def get_sc_node_log_path(sc_node):
+    # See logDir and logFileName in template.conf
+    return os.path.join(sc_node.dataDir, "log", "debugLog.txt")
+
+
+def read_log_markers(log_path, markers, offset=0):
+    """
+    Find the first SC node log line containing each marker, e.g. to split the startup time of a node in stages.
+
+    Parameters:
+     - log_path: SC node log file, see get_sc_node_log_path
+     - markers: dict of marker name to the text to look for
+     - offset: position in the log file to start from, e.g. its size before the node restart
+
+    Output: dict of marker name to the time in secs since the epoch of its first log line, None if not found
+    """
+    found = {name: None for name in markers}
+    if not os.path.isfile(log_path):
+        return found
+    with open(log_path, "rb") as log_file:
+        log_file.seek(offset)
+        for raw_line in log_file:
+            line = raw_line.decode("utf-8", "replace")
+            for (name, text) in markers.items():
+                if found[name] is None and text in line:
+                    match = SC_NODE_LOG_TIMESTAMP.match(line)
+                    if match is not None:
+                        found[name] = datetime.datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S:%f %z").timestamp()
+            if None not in found.values():
+                break
+    return found
+
+
+def wait_for_sc_node_answer(sc_node, deadline, interval=0.05):
+    """
+    Wait for the first successful block/best answer of a starting SC node, polling every interval secs.
+
+    Output: time of the answer in secs since the epoch
+    """
+    start = time.time()
+    while True:
+        try:
+            if "result" in sc_node.block_best():
+                return time.time()
+        except Exception:
+            # The API is not bound yet
+            pass
+        if time.time() - start > deadline:
+            raise AssertionError("SC node did not answer in {0} secs".format(deadline))
+        time.sleep(interval)
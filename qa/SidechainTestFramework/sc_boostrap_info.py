@@ -9,6 +9,9 @@ SC_CREATION_VERSION_1 = 1
 
 DEFAULT_API_KEY = "TopSecret"
 
+# max P2P message size for a Modifier
+DEFAULT_MAX_PACKET_SIZE = 5242980
+
 """
 All information needed to bootstrap sidechain network within specified mainchain node.
 The JSON representation is only for documentation.
@@ -102,7 +105,8 @@ class SCNodeConfiguration(object):
                  mempool_min_fee_rate = 0,
                  api_key=DEFAULT_API_KEY,
                  max_fee=10000000,
-                 initial_private_keys = []):
+                 initial_private_keys = [],
+                 max_packet_size=DEFAULT_MAX_PACKET_SIZE):
         if submitter_private_keys_indexes is None:
             submitter_private_keys_indexes = list(range(7))
         self.mc_connection_info = mc_connection_info
@@ -118,6 +122,7 @@ class SCNodeConfiguration(object):
         self.mempool_max_size = mempool_max_size
         self.mempool_min_fee_rate = mempool_min_fee_rate
         self.initial_private_keys = initial_private_keys
+        self.max_packet_size = max_packet_size
 
 """
 The full network of many sidechain nodes connected to many mainchain nodes.
@@ -0,0 +1,308 @@
+import hashlib
+import os
+
+"""
+Offline builder of SidechainCoreTransaction, so the transactions can be built and signed by the test without
+any request to the SC node, and only their bytes are sent.
+
+The bytes format is the one of the SDK serializers (see com.horizen.transaction.SidechainCoreTransactionSerializer):
+integers are written as ZigZag + VLQ encoded values, the lists are prefixed with their size, the boxes data and
+the proofs are prefixed with their type id.
+Supported outputs are ZenBoxes and WithdrawalRequestBoxes, inputs are unlocked with Ed25519 signatures.
+
+Example:
+    key = PrivateKey25519.generate()
+    tx = CoreTransaction([box_id], [ZenBoxData(to_public_key, value)], fee=0)
+    tx.sign([key])
+    sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+"""
+
+SIDECHAIN_CORE_TRANSACTION_VERSION = 1
+SIDECHAIN_CORE_TRANSACTION_TYPE_ID = 1
+ZEN_BOX_DATA_TYPE_ID = 1
+WITHDRAWAL_REQUEST_BOX_DATA_TYPE_ID = 2
+SIGNATURE_25519_TYPE_ID = 1
+PRIVATE_KEY_25519_SECRET_TYPE_ID = 0
+
+HORIZEN_PUBLIC_KEY_ADDRESS_PREFIX_LENGTH = 2
+HORIZEN_PUBLIC_KEY_ADDRESS_HASH_LENGTH = 20
+
+# Box data custom fields hash when no custom fields are present, see Utils.ZEROS_HASH
+ZEROS_HASH = bytes(32)
+
+
+def blake2b256(data):
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+# Sparkz VLQ writer encoding of Int and Long values
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def vlq(value):
+    value = zigzag(value)
+    result = bytearray()
+    while True:
+        if value & ~0x7F == 0:
+            result.append(value)
+            return bytes(result)
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+
+def long_to_bytes(value):
+    return value.to_bytes(8, "big", signed=True)
+
+
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def base58_decode(encoded):
+    value = 0
+    for char in encoded:
+        value = value * 58 + _BASE58_ALPHABET.index(char)
+    leading_zeros = len(encoded) - len(encoded.lstrip(_BASE58_ALPHABET[0]))
+    return bytes(leading_zeros) + value.to_bytes((value.bit_length() + 7) // 8, "big")
+
+
+def mc_address_to_public_key_hash(mc_address):
+    """
+    Extract the public key hash from the Horizen base58 public key address, see BytesUtils.fromHorizenPublicKeyAddress.
+    """
+    decoded = base58_decode(mc_address)
+    payload_length = HORIZEN_PUBLIC_KEY_ADDRESS_PREFIX_LENGTH + HORIZEN_PUBLIC_KEY_ADDRESS_HASH_LENGTH
+    payload = decoded[:payload_length]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != decoded[payload_length:]:
+        raise ValueError("Broken Horizen public key address: checksum is wrong.")
+    return payload[HORIZEN_PUBLIC_KEY_ADDRESS_PREFIX_LENGTH:]
+
+
+# Ed25519 (RFC 8032) with points in extended coordinates
+
+_P = 2 ** 255 - 19
+_L = 2 ** 252 + 27742317777372353535851937790883648493
+_D = -121665 * pow(121666, _P - 2, _P) % _P
+_SQRT_M1 = pow(2, (_P - 1) // 4, _P)
+
+
+def _recover_x(y, sign):
+    x2 = (y * y - 1) * pow(_D * y * y + 1, _P - 2, _P)
+    x = pow(x2, (_P + 3) // 8, _P)
+    if (x * x - x2) % _P != 0:
+        x = x * _SQRT_M1 % _P
+    if x & 1 != sign:
+        x = _P - x
+    return x
+
+
+def _point_add(p1, p2):
+    a = (p1[1] - p1[0]) * (p2[1] - p2[0]) % _P
+    b = (p1[1] + p1[0]) * (p2[1] + p2[0]) % _P
+    c = 2 * p1[3] * p2[3] * _D % _P
+    d = 2 * p1[2] * p2[2] % _P
+    e, f, g, h = b - a, d - c, d + c, b + a
+    return e * f % _P, g * h % _P, f * g % _P, e * h % _P
+
+
+def _point_compress(point):
+    z_inv = pow(point[2], _P - 2, _P)
+    x = point[0] * z_inv % _P
+    y = point[1] * z_inv % _P
+    return (y | ((x & 1) << 255)).to_bytes(32, "little")
+
+
+_BASE_Y = 4 * pow(5, _P - 2, _P) % _P
+_BASE_X = _recover_x(_BASE_Y, 0)
+_BASE = (_BASE_X, _BASE_Y, 1, _BASE_X * _BASE_Y % _P)
+
+# 2^i * B for every bit of the scalar, so a base point multiplication needs additions only
+_BASE_POWERS = [_BASE]
+for _ in range(255):
+    _BASE_POWERS.append(_point_add(_BASE_POWERS[-1], _BASE_POWERS[-1]))
+
+
+def _base_mul(scalar):
+    result = (0, 1, 1, 0)
+    for i in range(scalar.bit_length()):
+        if (scalar >> i) & 1:
+            result = _point_add(result, _BASE_POWERS[i])
+    return result
+
+
+def _sha512_mod_l(data):
+    return int.from_bytes(hashlib.sha512(data).digest(), "little") % _L
+
+
+def _expand_private_key(private_key):
+    digest = hashlib.sha512(private_key).digest()
+    scalar = int.from_bytes(digest[:32], "little")
+    scalar &= (1 << 254) - 8
+    scalar |= 1 << 254
+    return scalar, digest[32:]
+
+
+class PrivateKey25519(object):
+    """
+    Ed25519 secret key of the SC wallet, see com.horizen.secret.PrivateKey25519.
+
+    Parameters:
+     - private_key: the 32 bytes private key
+    """
+
+    def __init__(self, private_key):
+        self.private_key = private_key
+        self.scalar, self.prefix = _expand_private_key(private_key)
+        self.public_key = _point_compress(_base_mul(self.scalar))
+
+    @staticmethod
+    def from_seed(seed):
+        """
+        Same key as PrivateKey25519Creator.generateSecret(seed).
+        """
+        return PrivateKey25519(hashlib.sha256(seed).digest())
+
+    @staticmethod
+    def generate():
+        return PrivateKey25519(os.urandom(32))
+
+    @staticmethod
+    def from_secret_hex(secret_hex):
+        """
+        Key from the wallet/exportSecret format.
+        """
+        return PrivateKey25519(bytes.fromhex(secret_hex)[1:33])
+
+    @property
+    def public_key_hex(self):
+        return self.public_key.hex()
+
+    def secret_hex(self):
+        """
+        Secret in the wallet/importSecret format.
+        """
+        return (bytes([PRIVATE_KEY_25519_SECRET_TYPE_ID]) + self.private_key + self.public_key).hex()
+
+    def sign(self, message):
+        r = _sha512_mod_l(self.prefix + message)
+        encoded_r = _point_compress(_base_mul(r))
+        h = _sha512_mod_l(encoded_r + self.public_key + message)
+        s = (r + h * self.scalar) % _L
+        return encoded_r + s.to_bytes(32, "little")
+
+
+class ZenBoxData(object):
+    type_id = ZEN_BOX_DATA_TYPE_ID
+    is_coins_box = True
+
+    def __init__(self, public_key_hex, value):
+        self.proposition = bytes.fromhex(public_key_hex)
+        self.value = value
+
+    def bytes(self):
+        return self.proposition + vlq(self.value)
+
+
+class WithdrawalRequestBoxData(object):
+    """
+    Parameters:
+     - mc_address: Horizen public key address of the backward transfer receiver
+     - value: amount in satoshi
+    """
+    type_id = WITHDRAWAL_REQUEST_BOX_DATA_TYPE_ID
+    is_coins_box = False
+
+    def __init__(self, mc_address, value):
+        self.proposition = mc_address_to_public_key_hash(mc_address)
+        self.value = value
+
+    def bytes(self):
+        return self.proposition + vlq(self.value)
+
+
+class CoreTransaction(object):
+    """
+    SidechainCoreTransaction with ZenBox and WithdrawalRequestBox outputs.
+
+    Parameters:
+     - input_ids: ids (hex) of the boxes to spend
+     - outputs: list of ZenBoxData and WithdrawalRequestBoxData
+     - fee: fee in satoshi, the difference between the inputs and the outputs value
+     - proofs: signatures of the inputs, usually set by sign
+    """
+
+    def __init__(self, input_ids, outputs, fee=0, proofs=None):
+        self.input_ids = [bytes.fromhex(box_id) for box_id in input_ids]
+        self.outputs = outputs
+        self.fee = fee
+        self.proofs = proofs if proofs is not None else []
+        self._nonces = None
+
+    def _hash_without_nonce(self):
+        return blake2b256(b"".join(self.input_ids) + b"".join(output.proposition for output in self.outputs) +
+                          long_to_bytes(self.fee))
+
+    def nonces(self):
+        """
+        Nonces of the new boxes, see SidechainTransaction.getNewBoxNonce.
+        """
+        if self._nonces is None:
+            hash_without_nonce = self._hash_without_nonce()
+            self._nonces = [int.from_bytes(blake2b256(output.proposition + hash_without_nonce +
+                                                      index.to_bytes(4, "big"))[:8], "big", signed=True)
+                            for (index, output) in enumerate(self.outputs)]
+        return self._nonces
+
+    def message_to_sign(self):
+        new_boxes_bytes = b"".join(vlq(nonce) + output.bytes() for (nonce, output) in zip(self.nonces(), self.outputs))
+        return bytes([SIDECHAIN_CORE_TRANSACTION_VERSION]) + b"".join(self.input_ids) + new_boxes_bytes + \
+            long_to_bytes(self.fee)
+
+    def sign(self, private_keys):
+        """
+        Sign every input with the corresponding key, a single key can be given for all the inputs.
+        """
+        if isinstance(private_keys, PrivateKey25519):
+            private_keys = [private_keys] * len(self.input_ids)
+        message = self.message_to_sign()
+        self.proofs = [private_key.sign(message) for private_key in private_keys]
+        return self
+
+    def bytes(self):
+        writer = bytearray([SIDECHAIN_CORE_TRANSACTION_VERSION])
+        writer += vlq(self.fee)
+        writer += vlq(len(self.input_ids))
+        for input_id in self.input_ids:
+            writer += input_id
+        writer += vlq(len(self.outputs))
+        for output in self.outputs:
+            writer.append(output.type_id)
+            writer += output.bytes()
+        writer += vlq(len(self.proofs))
+        for proof in self.proofs:
+            writer.append(SIGNATURE_25519_TYPE_ID)
+            writer += proof
+        return bytes(writer)
+
+    def to_hex(self):
+        """
+        Transaction bytes as expected by transaction/sendTransaction and transaction/decodeTransactionBytes.
+        """
+        return (bytes([SIDECHAIN_CORE_TRANSACTION_TYPE_ID]) + self.bytes()).hex()
+
+    def id(self):
+        return blake2b256(self.message_to_sign() + b"".join(self.proofs)).hex()
+
+    def new_boxes(self):
+        """
+        Boxes created by the transaction, with their ids computed locally, see AbstractBox.id.
+
+        Output: list of dicts with "id", "nonce", "value" and "proposition" hex
+        """
+        boxes = []
+        for (nonce, output) in zip(self.nonces(), self.outputs):
+            box_id = blake2b256(bytes([1 if output.is_coins_box else 0]) + long_to_bytes(output.value) +
+                                output.proposition + long_to_bytes(nonce) + ZEROS_HASH)
+            boxes.append({"id": box_id.hex(), "nonce": nonce, "value": output.value,
+                          "proposition": output.proposition.hex()})
+        return boxes
@@ -0,0 +1,185 @@
+import json
+import logging
+
+"""
+Consensus epoch and slot math of the SDK (see com.horizen.utils.TimeToEpochUtils) ported to the test framework.
+
+Consensus epochs and slots are numbered starting from 1. The genesis block belongs to the last slot of epoch 1:
+a virtual genesis block timestamp is used as the beginning of the epoch 1.
+
+A ConsensusTipTracker keeps the epoch and slot of the node tip on the test side, so the next block can be forged
+without requesting the forging info before every block.
+"""
+
+
+class ConsensusParams(object):
+    """
+    Consensus parameters of the sidechain.
+
+    Parameters:
+     - seconds_in_slot: consensusSecondsInSlot of the forging info
+     - slots_in_epoch: consensusSlotsInEpoch of the forging info
+     - genesis_timestamp: timestamp in secs of the sidechain genesis block
+    """
+
+    def __init__(self, seconds_in_slot, slots_in_epoch, genesis_timestamp):
+        self.seconds_in_slot = seconds_in_slot
+        self.slots_in_epoch = slots_in_epoch
+        self.genesis_timestamp = genesis_timestamp
+
+
+def epoch_in_seconds(params):
+    return params.slots_in_epoch * params.seconds_in_slot
+
+
+def virtual_genesis_block_timestamp(params):
+    return params.genesis_timestamp - epoch_in_seconds(params) + params.seconds_in_slot
+
+
+def _get_epoch_index(params, timestamp):
+    if timestamp < params.genesis_timestamp:
+        raise ValueError("Try to get index epoch for timestamp {0} which are less than genesis timestamp {1}"
+                         .format(timestamp, params.genesis_timestamp))
+    return (timestamp - virtual_genesis_block_timestamp(params)) // epoch_in_seconds(params)
+
+
+def timestamp_to_epoch_number(params, timestamp):
+    return _get_epoch_index(params, timestamp) + 1
+
+
+def timestamp_to_slot_number(params, timestamp):
+    seconds_from_epoch_start = timestamp - _get_epoch_index(params, timestamp) * epoch_in_seconds(params) - \
+                               virtual_genesis_block_timestamp(params)
+    return seconds_from_epoch_start // params.seconds_in_slot + 1
+
+
+def timestamp_to_epoch_and_slot(params, timestamp):
+    return timestamp_to_epoch_number(params, timestamp), timestamp_to_slot_number(params, timestamp)
+
+
+# Slot number starting from genesis block
+def timestamp_to_absolute_slot_number(params, timestamp):
+    return timestamp_to_epoch_number(params, timestamp) * params.slots_in_epoch + \
+           timestamp_to_slot_number(params, timestamp)
+
+
+def get_timestamp_for_epoch_and_slot(params, epoch, slot):
+    if slot > params.slots_in_epoch:
+        raise ValueError("Slot {0} is out of the epoch with {1} slots".format(slot, params.slots_in_epoch))
+    total_slots = (epoch - 1) * params.slots_in_epoch + (slot - 1)
+    return virtual_genesis_block_timestamp(params) + total_slots * params.seconds_in_slot
+
+
+def seconds_remaining_in_slot(params, timestamp):
+    seconds_elapsed_in_slot = (timestamp - virtual_genesis_block_timestamp(params)) % params.seconds_in_slot
+    return params.seconds_in_slot - seconds_elapsed_in_slot
+
+
+def get_next_epoch_slot(epoch, slot, slots_in_epoch, force_switch_to_next_epoch=False):
+    next_slot = slot + 1
+    next_epoch = epoch
+
+    if next_slot > slots_in_epoch or force_switch_to_next_epoch:
+        next_slot = 1
+        next_epoch += 1
+    return next_epoch, next_slot
+
+
+def get_genesis_block_timestamp(node):
+    genesis_id = node.block_findIdByHeight(json.dumps({"height": 1}))["result"]["blockId"]
+    return node.block_findById(json.dumps({"blockId": genesis_id}))["result"]["block"]["header"]["timestamp"]
+
+
+class ConsensusTipTracker(object):
+    """
+    Keep track of the epoch and slot of the node best block.
+
+    The tracker is seeded once with the node forging info and the genesis block timestamp, then updated with every
+    block forged by the test framework. The tip known by the node may differ from the tracked one if blocks were
+    received from other nodes or the chain was reverted, in such cases the tracker must be resynchronized:
+     - on_best_block updates the tip with a best block retrieved anyway by the test, e.g. while syncing the nodes;
+     - resync retrieves the actual tip from the node, it is used when forging fails;
+     - on_block_forged checks the parent of a forged block: a different one than the tracked tip means that the
+       tracked tip was ahead of the node one, e.g. after a revert, so the block was forged in a later slot than the
+       next one of the node tip and the slots in between were skipped. The tip is then resynchronized from the node
+       best block before the next forge.
+    """
+
+    def __init__(self, node):
+        self.node = node
+        forging_info = node.block_forgingInfo()["result"]
+        self.params = ConsensusParams(forging_info["consensusSecondsInSlot"], forging_info["consensusSlotsInEpoch"],
+                                      get_genesis_block_timestamp(node))
+        self.tip_epoch = forging_info["bestEpochNumber"]
+        self.tip_slot = forging_info["bestSlotNumber"]
+        self.tip_block_id = None
+
+    def resync(self):
+        """
+        Retrieve the actual tip epoch and slot from the node.
+
+        Output: True if the tip differs from the tracked one
+        """
+        forging_info = self.node.block_forgingInfo()["result"]
+        changed = (self.tip_epoch, self.tip_slot) != (forging_info["bestEpochNumber"], forging_info["bestSlotNumber"])
+        if changed:
+            logging.info("Consensus tip resynchronized from epoch {0} slot {1} to epoch {2} slot {3}".format(
+                self.tip_epoch, self.tip_slot, forging_info["bestEpochNumber"], forging_info["bestSlotNumber"]))
+        self.tip_epoch = forging_info["bestEpochNumber"]
+        self.tip_slot = forging_info["bestSlotNumber"]
+        self.tip_block_id = None
+        return changed
+
+    def resync_from_best_block(self):
+        """
+        Retrieve the actual tip from the node best block, also updating the tracked block id.
+        """
+        self.on_best_block(self.node.block_best()["result"]["block"])
+
+    def next_epoch_and_slot(self, force_switch_to_next_epoch=False):
+        return get_next_epoch_slot(self.tip_epoch, self.tip_slot, self.params.slots_in_epoch,
+                                   force_switch_to_next_epoch)
+
+    def on_block_forged(self, epoch, slot, block_id, parent_id=None):
+        """
+        Update the tip with a block forged by the node, resynchronizing it from the node best block if the block
+        parent differs from the tracked tip.
+
+        Output: False if the block parent differs from the tracked tip
+        """
+        expected_parent = parent_id is None or self.tip_block_id is None or parent_id == self.tip_block_id
+        self.tip_epoch = epoch
+        self.tip_slot = slot
+        self.tip_block_id = block_id
+        if not expected_parent:
+            logging.warning("Block {0} forged in epoch {1} slot {2} on parent {3} instead of the tracked tip, "
+                            "slots may have been skipped".format(block_id, epoch, slot, parent_id))
+            self.resync_from_best_block()
+        return expected_parent
+
+    def on_best_block(self, block):
+        """
+        Update the tip with the best block of the node, as returned by block/best.
+        """
+        if block["id"] != self.tip_block_id:
+            if self.tip_block_id is not None and block["header"]["parentId"] != self.tip_block_id:
+                logging.info("Consensus tip {0} replaced by the best block {1} of the node".format(
+                    self.tip_block_id, block["id"]))
+            self.tip_epoch, self.tip_slot = timestamp_to_epoch_and_slot(self.params, block["header"]["timestamp"])
+            self.tip_block_id = block["id"]
+
+
+def get_consensus_tip_tracker(node):
+    """
+    Return the tip tracker of the node API connection, creating it on first use.
+    A restarted node gets a new API connection, so a new tracker.
+    """
+    tracker = vars(node).get("consensusTipTracker")
+    if tracker is None:
+        tracker = ConsensusTipTracker(node)
+        node.consensusTipTracker = tracker
+    return tracker
+
+
+def get_consensus_tip_tracker_if_any(node):
+    return vars(node).get("consensusTipTracker")
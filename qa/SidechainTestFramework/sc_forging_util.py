@@ -1,6 +1,8 @@
 import logging
 
 from SidechainTestFramework.sc_boostrap_info import Account
+from SidechainTestFramework.scutil import generate_next_blocks, sync_sc_blocks
+from SidechainTestFramework.sc_wait_util import wait_for_certificate
 from test_framework.util import assert_equal, fail
 import json
 
@@ -172,3 +174,118 @@ def sc_make_withdrawal_request_mempool(mc_node, sc_node, bt_zen_amount):
         fail("Withdraw coins failed: " + json.dumps(res))
     else:
         logging.info("Coins withdrawn: " + json.dumps(res))
+
+
+def get_withdrawal_epoch_params(mc_node, sc_node):
+    """
+    Output: (MC height of the sidechain creation, withdrawal epoch length) as known by the MC node
+    """
+    sc_id = sc_node.node_sidechainId()["result"]["sidechainId"]
+    sc_info = mc_node.getscinfo(sc_id)["items"][0]
+    return sc_info["createdAtBlockHeight"], sc_info["withdrawalEpochLength"]
+
+
+# The MC block that creates the sidechain is the first block of the withdrawal epoch 0
+def get_withdrawal_epoch_by_mc_height(mc_height, sc_creation_height, withdrawal_epoch_length):
+    return (mc_height - sc_creation_height) // withdrawal_epoch_length
+
+
+def get_withdrawal_epoch_end_height(epoch, sc_creation_height, withdrawal_epoch_length):
+    return sc_creation_height - 1 + (epoch + 1) * withdrawal_epoch_length
+
+
+def get_best_mc_reference_height(sc_node):
+    return sc_node.mainchain_bestBlockReferenceInfo()["result"]["blockReferenceInfo"]["height"]
+
+
+def forge_until_mc_height(sc_node, mc_height, sc_creation_height, withdrawal_epoch_length):
+    """
+    Forge SC blocks until the MC blocks up to mc_height are referenced.
+    A SC block can't reference MC blocks of different withdrawal epochs, so one block per crossed epoch is forged
+    with a single block/generateMany request. More blocks are forged only if the references didn't fit the blocks.
+
+    Output: ids of the forged SC blocks
+    """
+    sc_block_ids = []
+    referenced_height = get_best_mc_reference_height(sc_node)
+    while referenced_height < mc_height:
+        first_epoch = get_withdrawal_epoch_by_mc_height(referenced_height + 1, sc_creation_height,
+                                                        withdrawal_epoch_length)
+        last_epoch = get_withdrawal_epoch_by_mc_height(mc_height, sc_creation_height, withdrawal_epoch_length)
+        sc_block_ids.extend(generate_next_blocks(sc_node, "", last_epoch - first_epoch + 1, verbose=False))
+
+        new_referenced_height = get_best_mc_reference_height(sc_node)
+        if new_referenced_height == referenced_height:
+            fail("SC node doesn't reference MC blocks after height {0}.".format(referenced_height))
+        referenced_height = new_referenced_height
+    return sc_block_ids
+
+
+def advance_to_epoch_end(mc_node, sc_nodes, epoch):
+    """
+    Reach the last MC block of the given withdrawal epoch and reference it in the sidechain.
+    All the missing MC blocks are mined with a single generate call, the SC blocks referencing them are forged
+    in bulk by the first SC node, then the SC nodes are synchronized once.
+
+    Parameters:
+     - mc_node: MC node the SC nodes are connected to
+     - sc_nodes: list of connected SC nodes, the first one is the forger
+     - epoch: withdrawal epoch number, it must not be over in the MC yet
+
+    Output: hashes of the mined MC blocks
+    """
+    sc_creation_height, withdrawal_epoch_length = get_withdrawal_epoch_params(mc_node, sc_nodes[0])
+    epoch_end_height = get_withdrawal_epoch_end_height(epoch, sc_creation_height, withdrawal_epoch_length)
+    mc_height = mc_node.getblockcount()
+    if mc_height > epoch_end_height:
+        fail("Withdrawal epoch {0} is already over: MC height {1}, epoch end height {2}.".format(
+            epoch, mc_height, epoch_end_height))
+
+    mc_block_hashes = mc_node.generate(epoch_end_height - mc_height) if mc_height < epoch_end_height else []
+    sc_block_ids = forge_until_mc_height(sc_nodes[0], epoch_end_height, sc_creation_height, withdrawal_epoch_length)
+    sync_sc_blocks(sc_nodes)
+    logging.info("Reached the end of withdrawal epoch {0}: {1} MC blocks mined, {2} SC blocks forged.".format(
+        epoch, len(mc_block_hashes), len(sc_block_ids)))
+    return mc_block_hashes
+
+
+def advance_withdrawal_epochs(mc_node, sc_nodes, epochs_count, wait_for_certificates=True):
+    """
+    Complete epochs_count withdrawal epochs, starting from the one of the next MC block.
+
+    Parameters:
+     - mc_node: MC node the SC nodes are connected to
+     - sc_nodes: list of connected SC nodes, the first one is the forger
+     - epochs_count: number of withdrawal epochs to complete
+     - wait_for_certificates: if True, after every epoch the certificate submission is triggered, the certificate
+       is waited for and included in a MC block, so the sidechain stays alive. Otherwise the end of the last epoch
+       is reached at once and no certificates are expected, e.g. to make the sidechain cease.
+
+    Output: the certificate submission timelines (see wait_for_certificate), one per epoch
+    """
+    sc_creation_height, withdrawal_epoch_length = get_withdrawal_epoch_params(mc_node, sc_nodes[0])
+    first_epoch = get_withdrawal_epoch_by_mc_height(mc_node.getblockcount() + 1, sc_creation_height,
+                                                    withdrawal_epoch_length)
+    if not wait_for_certificates:
+        advance_to_epoch_end(mc_node, sc_nodes, first_epoch + epochs_count - 1)
+        return []
+
+    lifecycles = []
+    for epoch in range(first_epoch, first_epoch + epochs_count):
+        advance_to_epoch_end(mc_node, sc_nodes, epoch)
+
+        # Reference the first MC block of the next epoch to trigger the certificate submission
+        mc_node.generate(1)
+        generate_next_blocks(sc_nodes[0], "", 1, verbose=False)
+        sync_sc_blocks(sc_nodes)
+
+        lifecycle = wait_for_certificate(sc_nodes, epoch)
+        if lifecycle.get("certificateId") is None:
+            fail("Certificate submission for epoch {0} failed: {1}".format(epoch, lifecycle.get("failureReason")))
+        lifecycles.append(lifecycle)
+
+        # Include the certificate in the MC and reference it in the sidechain
+        mc_node.generate(1)
+        generate_next_blocks(sc_nodes[0], "", 1, verbose=False)
+        sync_sc_blocks(sc_nodes)
+    return lifecycles
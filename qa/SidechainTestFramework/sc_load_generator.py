@@ -0,0 +1,409 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from SidechainTestFramework.scutil import generate_next_blocks
+from SidechainTestFramework.sc_benchmark_util import percentile
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData
+from SidechainTestFramework.sidechainauthproxy import SidechainAuthServiceProxy, SCAPIException
+from httpCalls.transaction.allTransactions import allTransactionsDigest
+
+"""
+SC transaction load generator.
+
+The load is generated in three separate phases, so each of them can be measured on its own:
+ 1) prepare: split a box into the boxes to be spent by the load transactions (see fan_out),
+    or fund the SC with many forward transfers (see send_forward_transfers),
+    or grow a long chain with some transactions (see forge_chain);
+ 2) build: build and sign the transactions concurrently, the transactions bytes are kept in memory
+    (see TransactionLoadGenerator.build_transactions);
+ 3) submit: send the transactions bytes through a pool of API connections to several SC nodes at a target rate,
+    the acceptance latency and the rejection reason of every transaction are collected
+    (see TransactionLoadGenerator.submit).
+
+Example:
+    boxes = fan_out(sc_node1, ft_box, 10000, utxo_value)
+    load_generator = TransactionLoadGenerator([sc_node1, sc_node2])
+    transactions_bytes = load_generator.build_transactions(sc_node1, boxes, to_address)
+    report = load_generator.submit(transactions_bytes, target_tps=200)
+    report.log()
+"""
+
+# see BoxTransaction.MAX_TRANSACTION_NEW_BOXES
+MAX_TRANSACTION_NEW_BOXES = 1000
+
+# see SidechainBlock.MAX_SIDECHAIN_TXS_NUMBER
+MAX_BLOCK_TRANSACTIONS = 1000
+
+
+class ApiConnectionPool(object):
+    """
+    Pool of API connections to several SC nodes.
+
+    An API connection keeps a single HTTP connection, so it can't be shared between threads: every thread takes
+    a connection from the pool for each request and gives it back when done.
+    The nodes are chosen in round-robin order.
+
+    Parameters:
+     - sc_nodes: API connections of the SC nodes, as returned by start_sc_nodes
+     - connections_per_node: number of API connections opened to each node
+    """
+
+    def __init__(self, sc_nodes, connections_per_node=4):
+        self.nodes_count = len(sc_nodes)
+        self.connections = []
+        for sc_node in sc_nodes:
+            node_connections = queue.Queue()
+            for _ in range(connections_per_node):
+                node_connections.put(SidechainAuthServiceProxy(sc_node.url, auth_api_key=sc_node.auth_api_key))
+            self.connections.append(node_connections)
+        self.next_node = 0
+        self.lock = threading.Lock()
+
+    def next_node_index(self):
+        with self.lock:
+            node_index = self.next_node
+            self.next_node = (self.next_node + 1) % self.nodes_count
+        return node_index
+
+    @contextmanager
+    def connection(self, node_index=None):
+        if node_index is None:
+            node_index = self.next_node_index()
+        api_connection = self.connections[node_index].get()
+        try:
+            yield api_connection
+        finally:
+            self.connections[node_index].put(api_connection)
+
+
+class LoadReport(object):
+    """
+    Result of a transactions submission.
+
+    Parameters:
+     - latencies: secs between the submission of each accepted transaction and the node response
+     - rejections: rejection reason of each rejected transaction
+     - duration: secs from the first submission to the last response
+     - target_tps: requested submission rate, None if the transactions were sent as fast as possible
+    """
+
+    def __init__(self, latencies, rejections, duration, target_tps=None):
+        self.latencies = sorted(latencies)
+        self.rejections = rejections
+        self.duration = duration
+        self.target_tps = target_tps
+
+    @property
+    def accepted(self):
+        return len(self.latencies)
+
+    @property
+    def rejected(self):
+        return len(self.rejections)
+
+    @property
+    def submitted(self):
+        return self.accepted + self.rejected
+
+    @property
+    def achieved_tps(self):
+        return self.accepted / self.duration if self.duration > 0 else 0
+
+    def latency_percentiles(self, percentiles=(50, 90, 99, 100)):
+        return {p: percentile(self.latencies, p) for p in percentiles}
+
+    def rejection_reasons(self):
+        return Counter(self.rejections)
+
+    def to_json(self):
+        return {
+            "submitted": self.submitted,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "durationSecs": self.duration,
+            "targetTps": self.target_tps,
+            "achievedTps": self.achieved_tps,
+            "latencyPercentilesSecs": {"p" + str(p): v for (p, v) in self.latency_percentiles().items()},
+            "rejectionReasons": dict(self.rejection_reasons())
+        }
+
+    def log(self):
+        logging.info("Submitted {0} transactions in {1:.2f} secs: {2} accepted, {3} rejected, {4:.2f} TPS "
+                     "(target {5})".format(self.submitted, self.duration, self.accepted, self.rejected,
+                                           self.achieved_tps, self.target_tps))
+        if self.accepted > 0:
+            logging.info("Acceptance latency: " + ", ".join(
+                "p{0} {1:.1f} ms".format(p, v * 1000) for (p, v) in self.latency_percentiles().items()))
+        for (reason, count) in self.rejection_reasons().most_common():
+            logging.info("  {0} rejected: {1}".format(count, reason))
+
+
+def get_error_reason(response):
+    error = response.get("error", {})
+    reason = "{0} {1}".format(error.get("code", ""), error.get("description", "unknown error")).strip()
+    return reason.splitlines()[0] if len(reason) > 0 else reason
+
+
+class TransactionLoadGenerator(object):
+    """
+    Build and submit transactions concurrently.
+
+    Parameters:
+     - sc_nodes: SC nodes the transactions are submitted to
+     - connections_per_node: number of API connections opened to each node
+     - workers: number of threads building or submitting the transactions
+    """
+
+    def __init__(self, sc_nodes, connections_per_node=4, workers=8):
+        self.sc_nodes = sc_nodes
+        self.pool = ApiConnectionPool(sc_nodes, connections_per_node)
+        self.workers = workers
+
+    def build_transactions(self, builder_node, boxes, to_address, inputs_per_transaction=1,
+                           outputs_per_transaction=1, fee=0):
+        """
+        Build the transactions spending the given boxes, signed by the wallet of the builder node.
+        Every transaction spends inputs_per_transaction boxes and splits their value minus fee between
+        outputs_per_transaction ZenBoxes of to_address.
+
+        Parameters:
+         - builder_node: one of the SC nodes, its wallet must own the boxes
+         - boxes: list of the boxes to spend, as returned by wallet/allBoxes
+
+        Output: list of the transactions bytes in hex
+        """
+        builder_index = self.sc_nodes.index(builder_node)
+        inputs_groups = [boxes[i:i + inputs_per_transaction] for i in range(0, len(boxes), inputs_per_transaction)]
+
+        def build(inputs):
+            total_value = sum(box["value"] for box in inputs) - fee
+            output_value = total_value // outputs_per_transaction
+            outputs = [{"publicKey": to_address, "value": output_value} for _ in range(outputs_per_transaction)]
+            outputs[0]["value"] += total_value - output_value * outputs_per_transaction
+            request = {
+                "transactionInputs": [{"boxId": box["id"]} for box in inputs],
+                "regularOutputs": outputs,
+                "withdrawalRequests": [],
+                "forgerOutputs": []
+            }
+            with self.pool.connection(builder_index) as api_connection:
+                response = api_connection.transaction_createCoreTransaction(json.dumps(request))
+            if "result" not in response:
+                raise AssertionError("Transaction building failed: " + json.dumps(response))
+            return response["result"]["transactionBytes"]
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            transactions_bytes = list(executor.map(build, inputs_groups))
+        logging.info("Built {0} transactions in {1:.2f} secs".format(len(transactions_bytes), time.time() - start))
+        return transactions_bytes
+
+    def submit(self, transactions_bytes, target_tps=None):
+        """
+        Submit the transactions to the SC nodes in round-robin order.
+        If target_tps is specified the submissions are scheduled at a constant rate, regardless of the responses
+        time, otherwise the transactions are sent as fast as the workers can.
+
+        Output: LoadReport
+        """
+        latencies = []
+        rejections = []
+        next_transaction = iter(enumerate(transactions_bytes))
+        lock = threading.Lock()
+        start = time.time()
+
+        def worker():
+            while True:
+                with lock:
+                    item = next(next_transaction, None)
+                if item is None:
+                    return
+                (index, transaction_bytes) = item
+                if target_tps is not None:
+                    delay = start + index / float(target_tps) - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                sent_at = time.time()
+                try:
+                    with self.pool.connection() as api_connection:
+                        response = api_connection.transaction_sendTransaction(
+                            json.dumps({"transactionBytes": transaction_bytes}))
+                    latency = time.time() - sent_at
+                    reason = None if "result" in response else get_error_reason(response)
+                except SCAPIException as e:
+                    reason = "HTTP error: " + str(e.error).splitlines()[0] if e.error else "HTTP error"
+                except Exception as e:
+                    # e.g. socket timeout or invalid JSON response, the worker goes on with the next transactions
+                    reason = "{0}: {1}".format(type(e).__name__, e)
+                with lock:
+                    if reason is None:
+                        latencies.append(latency)
+                    else:
+                        rejections.append(reason)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return LoadReport(latencies, rejections, time.time() - start, target_tps)
+
+
+def get_private_key(sc_node, public_key):
+    secret = sc_node.wallet_exportSecret(json.dumps({"publickey": public_key}))["result"]["privKey"]
+    return PrivateKey25519.from_secret_hex(secret)
+
+
+def forge_until_mempool_is_empty(sc_node, max_blocks=100):
+    """
+    Forge blocks until all the memory pool transactions are included, they may not fit a single block.
+    Fail if the memory pool is not empty after max_blocks blocks, e.g. a transaction that can never be included.
+
+    Output: ids of the forged blocks
+    """
+    block_ids = []
+    while True:
+        mempool_size = allTransactionsDigest(sc_node)["size"]
+        if mempool_size == 0:
+            return block_ids
+        if len(block_ids) >= max_blocks:
+            raise AssertionError("{0} transactions still in the memory pool after forging {1} blocks".format(
+                mempool_size, max_blocks))
+        block_ids.extend(generate_next_blocks(sc_node, "", 1, verbose=False))
+
+
+def _fan_out_transactions_count(leaves, height):
+    if height == 1:
+        return 1
+    subtree_leaves = MAX_TRANSACTION_NEW_BOXES ** (height - 1)
+    return 1 + sum(_fan_out_transactions_count(min(subtree_leaves, leaves - i), height - 1)
+                   for i in range(0, leaves, subtree_leaves))
+
+
+def fan_out(sc_node, source_box, utxos_count, value, to_public_key=None, private_key=None, fee=0):
+    """
+    Split the source box into utxos_count ZenBoxes of the given value.
+
+    The boxes are created by a tree of transactions built offline, each one with the max number of new boxes.
+    The state doesn't allow to spend boxes of the memory pool, so every level of the tree is forged before
+    building the next one: a block per level, so log1000(utxos_count) blocks, unless a level doesn't fit a block.
+    The remaining value of the source box goes back to its owner with the first transaction.
+
+    Parameters:
+     - sc_node: SC node the transactions are sent to and forged by
+     - source_box: box to split, as returned by wallet/allBoxes
+     - utxos_count: number of boxes to create
+     - value: value of every created box in satoshi
+     - to_public_key: owner of the created boxes, the source box owner if not specified
+     - private_key: PrivateKey25519 of the source box owner, exported from the node wallet if not specified
+     - fee: fee of every transaction in satoshi
+
+    Output: list of the created boxes, as dicts with "id", "nonce", "value" and "proposition" computed locally
+    """
+    if private_key is None:
+        private_key = get_private_key(sc_node, source_box["proposition"]["publicKey"])
+    if to_public_key is None:
+        to_public_key = private_key.public_key_hex
+
+    # One new box of the first transaction is kept for the change
+    tree_height = 1
+    while (MAX_TRANSACTION_NEW_BOXES - 1) * MAX_TRANSACTION_NEW_BOXES ** (tree_height - 1) < utxos_count:
+        tree_height += 1
+    required_value = utxos_count * value + fee * _fan_out_transactions_count(utxos_count, tree_height)
+    if source_box["value"] < required_value:
+        raise AssertionError("Source box value {0} is less than the required {1}".format(source_box["value"],
+                                                                                        required_value))
+
+    start = time.time()
+    blocks_count = 0
+    created_boxes = []
+    # (box id, box value, number of boxes to create from it) for every box to split at the current level
+    level = [(source_box["id"], source_box["value"], utxos_count)]
+    for height in range(tree_height, 0, -1):
+        subtree_leaves = MAX_TRANSACTION_NEW_BOXES ** (height - 1)
+        next_level = []
+        for (box_id, box_value, leaves) in level:
+            children_leaves = [min(subtree_leaves, leaves - i) for i in range(0, leaves, subtree_leaves)]
+            if height == 1:
+                outputs = [ZenBoxData(to_public_key, value) for _ in children_leaves]
+            else:
+                outputs = [ZenBoxData(private_key.public_key_hex,
+                                      child_leaves * value + fee * _fan_out_transactions_count(child_leaves, height - 1))
+                           for child_leaves in children_leaves]
+            change = box_value - sum(output.value for output in outputs) - fee
+            if change > 0:
+                outputs.append(ZenBoxData(private_key.public_key_hex, change))
+
+            tx = CoreTransaction([box_id], outputs, fee).sign(private_key)
+            response = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+            if "result" not in response:
+                raise AssertionError("Fan out transaction was rejected: " + json.dumps(response))
+            new_boxes = tx.new_boxes()[:len(children_leaves)]
+            if height == 1:
+                created_boxes.extend(new_boxes)
+            else:
+                next_level.extend((box["id"], box["value"], child_leaves)
+                                  for (box, child_leaves) in zip(new_boxes, children_leaves))
+        blocks_count += len(forge_until_mempool_is_empty(sc_node))
+        level = next_level
+
+    logging.info("Fan out of {0} boxes done in {1:.2f} secs, {2} blocks forged".format(
+        utxos_count, time.time() - start, blocks_count))
+    return created_boxes
+
+
+def send_forward_transfers(mc_node, sidechain_id, public_keys, amount, mc_return_address, transactions_count=1,
+                           outputs_per_transaction=1):
+    """
+    Send transactions_count MC transactions, each one with outputs_per_transaction forward transfers of the given
+    amount, without mining them. The receivers are taken in turn from public_keys.
+
+    Parameters:
+     - amount: amount of every forward transfer in Zen
+
+    Output: ids of the MC transactions
+    """
+    transaction_ids = []
+    for tx_index in range(transactions_count):
+        ft_args = [{
+            "toaddress": public_keys[(tx_index * outputs_per_transaction + i) % len(public_keys)],
+            "amount": amount,
+            "scid": sidechain_id,
+            "mcReturnAddress": mc_return_address
+        } for i in range(outputs_per_transaction)]
+        transaction_ids.append(mc_node.sc_send(ft_args))
+    return transaction_ids
+
+
+def forge_chain(sc_node, mc_node, private_key, boxes, height, batch_blocks=100):
+    """
+    Forge blocks until the SC chain reaches the given height, e.g. to get a long chain with some content for the
+    sync or restart benchmarks. Every batch of batch_blocks blocks references a new MC block and includes one
+    transaction for each of the boxes, built offline and spending the box back to its owner.
+
+    Parameters:
+     - private_key: PrivateKey25519 of the boxes owner
+     - boxes: boxes spent by the first batch, as returned by fan_out
+
+    Output: the boxes created by the last batch, to be passed to the next call
+    """
+    current_height = sc_node.block_best()["result"]["height"]
+    while current_height < height:
+        mc_node.generate(1)
+        transactions = [CoreTransaction([box["id"]], [ZenBoxData(private_key.public_key_hex, box["value"])])
+                        .sign(private_key) for box in boxes]
+        for tx in transactions:
+            response = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+            if "result" not in response:
+                raise AssertionError("Transaction was rejected: " + json.dumps(response))
+        boxes = [tx.new_boxes()[0] for tx in transactions]
+        generate_next_blocks(sc_node, "", min(batch_blocks, height - current_height), verbose=False)
+        current_height = sc_node.block_best()["result"]["height"]
+    return boxes
@@ -21,6 +21,7 @@ import shutil
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration
 from SidechainTestFramework.scutil import LEVEL_ERROR, LEVEL_DEBUG
+from SidechainTestFramework.sc_wait_util import log_wait_timings
 
 '''
 The workflow is the following:
@@ -188,6 +189,8 @@ class SidechainTestFramework(BitcoinTestFramework):
             logging.error("Unexpected exception caught during testing: "+str(e))
             traceback.print_tb(sys.exc_info()[2])
 
+        log_wait_timings()
+
         if not self.options.noshutdown: #Support for tests with MC only, SC only, MC/SC
             if hasattr(self,"sc_nodes"):
                 logging.info("Stopping SC nodes")
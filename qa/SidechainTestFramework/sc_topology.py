@@ -0,0 +1,143 @@
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from SidechainTestFramework.scutil import sc_p2p_port, sc_connected_peers
+from SidechainTestFramework.sc_wait_util import wait_until
+
+"""
+SC network topologies, to run tests and benchmarks with many SC nodes on a single machine.
+
+A topology is the list of the (a, b) edges between the SC nodes indexes, node a connects to node b:
+ - line: every node to the next one
+ - ring: a line closed on the first node
+ - star: every node to the first one
+ - mesh: every node to all the other ones
+ - random-regular: random graph where every node has --degree peers, connected and without duplicated edges
+
+Dozens of nodes fit in the memory of a single machine when:
+ - they are started with a small heap, see small_heap_jvm_options;
+ - only one node is a certificate submitter and signer, so the others never load the proving keys.
+   The keys are generated once in the shared qa/ps_keys directory (see bootstrap_sidechain_nodes) and reused
+   by all the nodes and all the runs.
+
+Example:
+    edges = topology_edges("random-regular", len(sc_nodes), degree=4)
+    connect_sc_topology(sc_nodes, edges)
+    hops = topology_hops(edges, len(sc_nodes))
+"""
+
+TOPOLOGIES = ("line", "ring", "star", "mesh", "random-regular")
+
+# max number of shuffles to build a random regular graph before giving up
+RANDOM_REGULAR_MAX_ATTEMPTS = 1000
+
+
+def small_heap_jvm_options(max_heap_mb=512):
+    """
+    JVM options of a SC node sized for running dozens of nodes on a single machine: small initial heap, so idle
+    nodes don't reserve memory, and the serial GC, without the per-core threads of the parallel collectors.
+    """
+    return ["-Xms64m", "-Xmx{0}m".format(max_heap_mb), "-XX:+UseSerialGC", "-Xss512k"]
+
+
+def topology_hops(edges, nodes_count, source=0):
+    """
+    Output: list with the number of hops from the source node of every node, None for the unreachable ones
+    """
+    peers = {node: [] for node in range(nodes_count)}
+    for (a, b) in edges:
+        peers[a].append(b)
+        peers[b].append(a)
+    hops = {source: 0}
+    level = [source]
+    while len(level) > 0:
+        next_level = []
+        for node in level:
+            for peer in peers[node]:
+                if peer not in hops:
+                    hops[peer] = hops[node] + 1
+                    next_level.append(peer)
+        level = next_level
+    return [hops.get(node) for node in range(nodes_count)]
+
+
+def random_regular_edges(nodes_count, degree, rnd):
+    if degree >= nodes_count or (nodes_count * degree) % 2 != 0:
+        raise AssertionError("No random regular graph of {0} nodes with degree {1}".format(nodes_count, degree))
+    for _ in range(RANDOM_REGULAR_MAX_ATTEMPTS):
+        # Pair the node "stubs" at random, restarting when only self loops or duplicated edges are left
+        stubs = [node for node in range(nodes_count) for _ in range(degree)]
+        rnd.shuffle(stubs)
+        edges = set()
+        while len(stubs) > 0:
+            a = stubs.pop()
+            candidates = [index for (index, b) in enumerate(stubs) if b != a and (min(a, b), max(a, b)) not in edges]
+            if len(candidates) == 0:
+                break
+            b = stubs.pop(rnd.choice(candidates))
+            edges.add((min(a, b), max(a, b)))
+        edges = sorted(edges)
+        if len(edges) * 2 == nodes_count * degree and None not in topology_hops(edges, nodes_count):
+            return edges
+    raise AssertionError("Random regular graph of {0} nodes with degree {1} not found".format(nodes_count, degree))
+
+
+def topology_edges(topology, nodes_count, degree=4, seed=0):
+    """
+    Parameters:
+     - topology: one of TOPOLOGIES
+     - nodes_count: number of SC nodes
+     - degree: number of peers of every node, only for random-regular
+     - seed: seed of the random graph, only for random-regular
+
+    Output: list of the (a, b) edges
+    """
+    if topology == "line":
+        return [(i, i + 1) for i in range(nodes_count - 1)]
+    if topology == "ring":
+        return [(i, (i + 1) % nodes_count) for i in range(nodes_count if nodes_count > 2 else nodes_count - 1)]
+    if topology == "star":
+        return [(0, i) for i in range(1, nodes_count)]
+    if topology == "mesh":
+        return [(i, j) for i in range(nodes_count) for j in range(i + 1, nodes_count)]
+    if topology == "random-regular":
+        return random_regular_edges(nodes_count, degree, random.Random(seed))
+    raise AssertionError("Unknown topology " + topology)
+
+
+def connect_sc_topology(sc_nodes, edges, workers=16, deadline=120):
+    """
+    Connect the SC nodes according to the edges of a topology.
+    Unlike calling connect_sc_nodes for every edge, the connection requests are sent concurrently and the peers of
+    all the nodes are then checked together, with the adaptive polling of wait_until.
+    An API connection can't be shared between threads (see ApiConnectionPool), so every worker sends the requests
+    of a single node.
+
+    Output: time in secs to connect all the nodes
+    """
+    start = time.time()
+    peers_to_connect = {}
+    for (a, b) in edges:
+        peers_to_connect.setdefault(a, []).append(b)
+
+    def connect(node_index):
+        for peer in peers_to_connect[node_index]:
+            sc_nodes[node_index].node_connect(json.dumps({"host": "127.0.0.1", "port": str(sc_p2p_port(peer))}))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(connect, sorted(peers_to_connect)))
+
+        def connected():
+            peers = list(executor.map(lambda node: [peer.get("remoteAddress") for peer in sc_connected_peers(node)],
+                                      sc_nodes))
+            return all("/127.0.0.1:" + str(sc_p2p_port(b)) in peers[a] for (a, b) in edges)
+
+        wait_until(connected, deadline=deadline, description="{0} SC nodes connections".format(len(edges)))
+
+    elapsed = time.time() - start
+    logging.info("{0} SC nodes connected with {1} connections in {2:.1f} secs".format(len(sc_nodes), len(edges),
+                                                                                   elapsed))
+    return elapsed
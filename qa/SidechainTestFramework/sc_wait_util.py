@@ -0,0 +1,303 @@
+import json
+import logging
+import random
+import time
+
+from SidechainTestFramework.scutil import TimeoutException, WAIT_CONST, get_sc_ws_urls, get_csw_proofs_status
+from SidechainTestFramework.websocket_client import WebsocketClient, WebsocketEventListener
+
+"""
+Adaptive waiting helpers to be used instead of fixed time.sleep calls.
+
+A wait polls a condition with a jittered exponential backoff: the first checks are very frequent, so the wait ends
+shortly after the condition is satisfied, while long waits don't flood the nodes with requests.
+Every wait is timed and logged, the collected timings can be printed with log_wait_timings.
+
+Example:
+    wait_until(any_of(mc_mempool_size_at_least(mc_node, 1), became_false(cert_generation_active(sc_node))),
+               deadline=CERTIFICATE_WAIT_DEADLINE, description="certificate in MC mempool")
+"""
+
+# default max time in secs to wait for a condition
+DEFAULT_WAIT_DEADLINE = 60
+
+# max time in secs to wait for a certificate: submission delay is up to 20 secs plus proof generation time
+CERTIFICATE_WAIT_DEADLINE = 300
+
+# max time in secs for the certificate generation to start: submission delay is up to 20 secs
+CERTIFICATE_GENERATION_START_DEADLINE = 60
+
+# max time in secs to wait for the generation of the requested CSW proofs, they are generated one by one
+CSW_PROOFS_WAIT_DEADLINE = 1000
+
+# collected (description, elapsed secs, checks count, satisfied) of every wait done by the test
+wait_timings = []
+
+
+class Backoff(object):
+    """
+    Jittered exponential backoff.
+
+    Parameters:
+     - initial_delay: delay in secs after the first check
+     - factor: multiplier applied to the delay after each check
+     - max_delay: upper bound of the delay in secs
+     - jitter: relative random deviation applied to each delay, e.g. 0.25 means +-25%
+    """
+
+    def __init__(self, initial_delay=0.05, factor=2, max_delay=2, jitter=0.25):
+        self.initial_delay = initial_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delays(self):
+        delay = self.initial_delay
+        while True:
+            yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = min(delay * self.factor, self.max_delay)
+
+
+class Condition(object):
+    """
+    Named predicate without arguments. Conditions can be combined with &, | and ~ operators.
+    """
+
+    def __init__(self, predicate, description):
+        self.predicate = predicate
+        self.description = description
+
+    def __call__(self):
+        return bool(self.predicate())
+
+    def __and__(self, other):
+        return all_of(self, other)
+
+    def __or__(self, other):
+        return any_of(self, other)
+
+    def __invert__(self):
+        return negate(self)
+
+    def __str__(self):
+        return self.description
+
+
+def to_condition(predicate, description=None):
+    if isinstance(predicate, Condition):
+        return predicate
+    return Condition(predicate, description if description is not None else getattr(predicate, "__name__", "condition"))
+
+
+# Note: all the sub-conditions are evaluated every time, without short circuit,
+# so stateful conditions (like became_false) never miss a check.
+def all_of(*predicates):
+    conditions = [to_condition(p) for p in predicates]
+    return Condition(lambda: all([c() for c in conditions]),
+                     "(" + " and ".join(str(c) for c in conditions) + ")")
+
+
+def any_of(*predicates):
+    conditions = [to_condition(p) for p in predicates]
+    return Condition(lambda: any([c() for c in conditions]),
+                     "(" + " or ".join(str(c) for c in conditions) + ")")
+
+
+def negate(predicate):
+    condition = to_condition(predicate)
+    return Condition(lambda: not condition(), "not " + str(condition))
+
+
+def became_false(predicate, start_deadline=None):
+    """
+    Condition satisfied once the predicate was seen true and then false, for example a process that started and
+    then finished.
+    If start_deadline is set, an AssertionError is raised when the predicate is not seen true within start_deadline
+    secs from the first check, so a process that never starts fails fast instead of waiting the whole deadline.
+    """
+    condition = to_condition(predicate)
+    state = {"seen_true": False, "first_check": None}
+
+    def check():
+        value = condition()
+        now = time.time()
+        state["first_check"] = state["first_check"] or now
+        state["seen_true"] = state["seen_true"] or value
+        if not state["seen_true"] and start_deadline is not None and now - state["first_check"] > start_deadline:
+            raise AssertionError("{0} not seen within {1} secs".format(condition, start_deadline))
+        return state["seen_true"] and not value
+
+    return Condition(check, str(condition) + " became false")
+
+
+def wait_until(predicate, deadline=DEFAULT_WAIT_DEADLINE, backoff=None, description=None, raise_on_timeout=True):
+    """
+    Wait for maximum deadline seconds for the predicate to be satisfied.
+
+    Parameters:
+     - predicate: a Condition or any callable without arguments
+     - deadline: max time to wait in secs
+     - backoff: an instance of Backoff, default one is used if not specified
+     - description: text used in the timing log, the condition description is used if not specified
+     - raise_on_timeout: if True raise TimeoutException when deadline is reached, otherwise return False
+
+    Output: True if the predicate was satisfied, False in case of timeout and raise_on_timeout=False
+    """
+    condition = to_condition(predicate, description)
+    description = description if description is not None else str(condition)
+    backoff = backoff if backoff is not None else Backoff()
+
+    start = time.time()
+    checks = 0
+    satisfied = False
+    for delay in backoff.delays():
+        checks += 1
+        if condition():
+            satisfied = True
+            break
+        remaining = deadline - (time.time() - start)
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+
+    elapsed = time.time() - start
+    wait_timings.append((description, elapsed, checks, satisfied))
+    logging.info("Waited {0:.2f} secs for {1}: {2} after {3} checks".format(
+        elapsed, description, "satisfied" if satisfied else "timed out", checks))
+
+    if not satisfied and raise_on_timeout:
+        raise TimeoutException("Waiting for " + description)
+    return satisfied
+
+
+def log_wait_timings():
+    if len(wait_timings) == 0:
+        return
+    total = sum(timing[1] for timing in wait_timings)
+    logging.info("Waits summary: {0} waits, {1:.2f} secs in total".format(len(wait_timings), total))
+    for (description, elapsed, checks, satisfied) in wait_timings:
+        logging.info("  {0:8.2f} secs, {1:4d} checks, {2}: {3}".format(
+            elapsed, checks, "satisfied" if satisfied else "timed out", description))
+
+
+# Common conditions
+
+def mc_mempool_size_at_least(mc_node, size):
+    return Condition(lambda: mc_node.getmempoolinfo()["size"] >= size, "MC mempool size >= {0}".format(size))
+
+
+def cert_generation_active(sc_node):
+    return Condition(lambda: sc_node.submitter_isCertGenerationActive()["result"]["state"],
+                     "certificate generation active on {0}".format(vars(sc_node).get("url", "SC node")))
+
+
+def certificates_submitted(mc_node, sc_nodes, expected_mempool_size=1,
+                           start_deadline=CERTIFICATE_GENERATION_START_DEADLINE):
+    """
+    Condition satisfied when the MC mempool contains the expected number of transactions, or when the certificate
+    generation on every given SC node was started and then finished, so no more certificates are expected.
+    An AssertionError is raised if the generation didn't start on a node within start_deadline secs while the
+    mempool has less transactions than expected.
+    """
+    mempool_filled = mc_mempool_size_at_least(mc_node, expected_mempool_size)
+    generation_finished = all_of(*[became_false(cert_generation_active(sc_node), start_deadline)
+                                   for sc_node in sc_nodes])
+    # The generation is checked only while the mempool isn't filled, so the start deadline doesn't apply to the
+    # certificates generated between two checks
+    return Condition(lambda: mempool_filled() or generation_finished(),
+                     "({0} or {1})".format(mempool_filled, generation_finished))
+
+
+def wait_for_csw_proofs(sc_node, csw_box_ids, deadline=CSW_PROOFS_WAIT_DEADLINE):
+    """
+    Wait until no CSW proof of the given boxes is in queue or in process, so every proof is either Generated or Absent.
+    The status of all the boxes is retrieved with a single request per check.
+
+    Output: the number of boxes per proof status
+    """
+    proofs_status = {}
+
+    def completed():
+        proofs_status.update(get_csw_proofs_status(sc_node, csw_box_ids))
+        return proofs_status["completed"]
+
+    wait_until(completed, deadline=deadline, backoff=Backoff(initial_delay=0.5, max_delay=10),
+               description="{0} CSW proofs generation".format(len(csw_box_ids)))
+    return proofs_status["statusCounts"]
+
+
+def get_certificate_lifecycle(sc_node, epoch):
+    lifecycles = sc_node.submitter_getCertificateLifecycles(json.dumps({"epoch": epoch}))["result"]["certificateLifecycles"]
+    return lifecycles[-1] if len(lifecycles) > 0 else None
+
+
+def is_certificate_lifecycle_completed(lifecycle):
+    return lifecycle is not None and \
+        (lifecycle.get("sentToMainchainAt") is not None or lifecycle.get("failedAt") is not None)
+
+
+def wait_for_certificate(sc_nodes, epoch, deadline=CERTIFICATE_WAIT_DEADLINE):
+    """
+    Wait until the certificate submission for the given withdrawal epoch is completed: the certificate was sent
+    to the MC by one of the SC nodes, or its generation failed on every node that started it.
+    The nodes push every stage of the submission over the websocket, so the wait ends right after the last stage
+    is reached. The submission timelines are polled anyway every WAIT_CONST secs in case an event is missed.
+
+    Parameters:
+     - sc_nodes: SC node or list of SC nodes with the certificate submitter
+     - epoch: withdrawal epoch number referenced by the certificate
+     - deadline: max time to wait in secs
+
+    Output: the submission timeline (see submitter/getCertificateLifecycles), a sent certificate is preferred
+    over a failed one. Timestamps are in milliseconds.
+    """
+    if not isinstance(sc_nodes, list):
+        sc_nodes = [sc_nodes]
+    description = "certificate for epoch {0}".format(epoch)
+    start = time.time()
+    checks = 0
+    lifecycle = None
+    with WebsocketEventListener(get_sc_ws_urls(sc_nodes),
+                                event_types=(WebsocketClient.CERTIFICATE_LIFECYCLE_EVENT,)) as listener:
+        while True:
+            events_count = listener.events_count()
+            checks += 1
+            lifecycles = [lc for lc in [get_certificate_lifecycle(sc_node, epoch) for sc_node in sc_nodes] if lc is not None]
+            sent = [lc for lc in lifecycles if lc.get("sentToMainchainAt") is not None]
+            if len(sent) > 0:
+                lifecycle = sent[0]
+                break
+            # Another node may still be generating the certificate after a failure
+            if len(lifecycles) > 0 and all(is_certificate_lifecycle_completed(lc) for lc in lifecycles):
+                lifecycle = lifecycles[0]
+                break
+            remaining = deadline - (time.time() - start)
+            if remaining <= 0:
+                break
+            listener.wait_for_event(events_count, min(WAIT_CONST, remaining))
+
+    elapsed = time.time() - start
+    wait_timings.append((description, elapsed, checks, lifecycle is not None))
+    if lifecycle is None:
+        raise TimeoutException("Waiting for " + description)
+
+    logging.info("Waited {0:.2f} secs for {1}: {2}".format(elapsed, description, format_certificate_lifecycle(lifecycle)))
+    return lifecycle
+
+
+def format_certificate_lifecycle(lifecycle):
+    """
+    Describe the submission timeline as the duration of each stage, relative to the scheduling of the generation.
+    """
+    stages = [("proof data requested", "proofDataRequestedAt"), ("proof started", "proofGenerationStartedAt"),
+              ("proof finished", "proofGenerationFinishedAt"), ("sent to MC", "sentToMainchainAt"), ("failed", "failedAt")]
+    start = lifecycle["signaturesCollectedAt"]
+    parts = ["{0} signatures".format(lifecycle["knownSignatures"])]
+    if lifecycle.get("backwardTransfers") is not None:
+        parts.append("{0} backward transfers".format(lifecycle["backwardTransfers"]))
+    for (name, key) in stages:
+        if lifecycle.get(key) is not None:
+            parts.append("{0} after {1:.2f} secs".format(name, (lifecycle[key] - start) / 1000.0))
+    if lifecycle.get("failureReason") is not None:
+        parts.append(lifecycle["failureReason"])
+    return ", ".join(parts)
@@ -7,8 +7,12 @@ from decimal import Decimal
 
 from SidechainTestFramework.sc_boostrap_info import MCConnectionInfo, SCBootstrapInfo, SCNetworkConfiguration, Account, \
     VrfAccount, SchnorrAccount, CertificateProofInfo, SCNodeConfiguration, ProofKeysPaths, LARGE_WITHDRAWAL_EPOCH_LENGTH, \
-    SCCreationInfo, DEFAULT_API_KEY
+    SCCreationInfo, DEFAULT_API_KEY, DEFAULT_MAX_PACKET_SIZE
+from SidechainTestFramework.sc_epoch_util import get_next_epoch_slot, get_consensus_tip_tracker, \
+    get_consensus_tip_tracker_if_any
 from SidechainTestFramework.sidechainauthproxy import SidechainAuthServiceProxy
+from SidechainTestFramework.websocket_client import WebsocketClient, WebsocketEventListener
+from httpCalls.transaction.allTransactions import allTransactionsDigest
 import subprocess
 import time
 import socket
@@ -32,9 +36,6 @@ LEVEL_ALL = "all"
 # timeout in secs for rest api
 DEFAULT_REST_API_TIMEOUT = 5
 
-# max P2P message size for a Modifier
-DEFAULT_MAX_PACKET_SIZE = 5242980
-
 class TimeoutException(Exception):
     def __init__(self, operation):
         Exception.__init__(self)
@@ -55,6 +56,17 @@ def sc_rpc_port(n):
     return 8200 + n + os.getpid() % 999
 
 
+def sc_ws_port(n):
+    return 8400 + n + os.getpid() % 999
+
+
+def get_sc_ws_urls(api_connections):
+    """
+    Return the websocket server url of each SC node API connection, None if unknown
+    """
+    return [vars(x).get("wsUrl") for x in api_connections]
+
+
 # To be removed
 def wait_for_next_sc_blocks(node, expected_height, wait_for=25):
     """
@@ -83,37 +95,48 @@ def wait_for_sc_node_initialization(nodes):
 
 def sync_sc_blocks(api_connections, wait_for=25, p=False):
     """
-    Wait for maximum wait_for seconds for everybody to have the same block count
+    Wait for maximum wait_for seconds for everybody to have the same block count.
+    Nodes are checked again as soon as any of them emits an UPDATE_TIP_EVENT on its websocket server,
+    if no events are available we fall back to checking every WAIT_CONST seconds.
     """
     start = time.time()
-    while True:
-        if time.time() - start >= wait_for:
-            raise TimeoutException("Syncing blocks")
-        counts = [int(x.block_best()["result"]["height"]) for x in api_connections]
-        if p:
-            logging.info(counts)
-        if counts == [counts[0]] * len(counts):
-            break
-        time.sleep(WAIT_CONST)
+    with WebsocketEventListener(get_sc_ws_urls(api_connections), [WebsocketClient.UPDATE_TIP_EVENT]) as listener:
+        while True:
+            events_count = listener.events_count()
+            if time.time() - start >= wait_for:
+                raise TimeoutException("Syncing blocks")
+            bests = [x.block_best()["result"] for x in api_connections]
+            counts = [int(best["height"]) for best in bests]
+            if p:
+                logging.info(counts)
+            if counts == [counts[0]] * len(counts):
+                break
+            listener.wait_for_event(events_count, min(WAIT_CONST, max(0, wait_for - (time.time() - start))))
+
+    # Blocks may come from other nodes, so update the tracked tips with the known best blocks
+    for (api_connection, best) in zip(api_connections, bests):
+        tip_tracker = get_consensus_tip_tracker_if_any(api_connection)
+        if tip_tracker is not None:
+            tip_tracker.on_best_block(best["block"])
 
 
 def sync_sc_mempools(api_connections, wait_for=25):
     """
-    Wait for maximum wait_for seconds for everybody to have the same transactions in their memory pools
+    Wait for maximum wait_for seconds for everybody to have the same transactions in their memory pools.
+    Only the memory pool digests are compared, so the transactions order doesn't matter.
+    Nodes are checked again as soon as any of them emits a MEMPOOL_CHANGED_EVENT on its websocket server,
+    if no events are available we fall back to checking every WAIT_CONST seconds.
     """
     start = time.time()
-    while True:
-        refpool = api_connections[0].transaction_allTransactions()["result"]["transactions"]
-        if time.time() - start >= wait_for:
-            raise TimeoutException("Syncing mempools")
-        num_match = 1
-        for i in range(1, len(api_connections)):
-            nodepool = api_connections[i].transaction_allTransactions()["result"]["transactions"]
-            if nodepool == refpool:
-                num_match = num_match + 1
-        if num_match == len(api_connections):
-            break
-        time.sleep(WAIT_CONST)
+    with WebsocketEventListener(get_sc_ws_urls(api_connections), [WebsocketClient.MEMPOOL_CHANGED_EVENT]) as listener:
+        while True:
+            events_count = listener.events_count()
+            if time.time() - start >= wait_for:
+                raise TimeoutException("Syncing mempools")
+            digests = [allTransactionsDigest(x) for x in api_connections]
+            if digests == [digests[0]] * len(digests):
+                break
+            listener.wait_for_event(events_count, min(WAIT_CONST, max(0, wait_for - (time.time() - start))))
 
 
 sidechainclient_processes = {}
@@ -422,7 +445,8 @@ def initialize_sc_datadir(dirname, n, bootstrap_info=SCBootstrapInfo, sc_node_co
         "CSW_VERIFICATION_KEY_PATH": bootstrap_info.csw_keys_paths.verification_key_path if bootstrap_info.csw_keys_paths is not None else "",
         "RESTRICT_FORGERS": ("true" if sc_node_config.forger_options.restrict_forgers else "false"),
         "ALLOWED_FORGERS_LIST": sc_node_config.forger_options.allowed_forgers,
-        "MAX_PACKET_SIZE": DEFAULT_MAX_PACKET_SIZE
+        "MAX_PACKET_SIZE": sc_node_config.max_packet_size,
+        "WEBSOCKET_SERVER_PORT": sc_ws_port(n)
     }
     config = config.replace("'", "")
     config = config.replace("NEW_LINE", "\n")
@@ -518,9 +542,11 @@ def get_websocket_configuration(index, array_of_MCConnectionInfo):
 
 
 def start_sc_node(i, dirname, extra_args=None, rpchost=None, timewait=None, binary=None, print_output_to_file=False,
-                  auth_api_key=None):
+                  auth_api_key=None, jvm_options=None):
     """
     Start a SC node and returns API connection to it
+
+    jvm_options: optional list of JVM options, e.g. ["-Xmx512m"] to run many nodes on a single machine
     """
     # Will we have  extra args for SC too ?
     datadir = os.path.join(dirname, "sc_node" + str(i))
@@ -547,7 +573,10 @@ def start_sc_node(i, dirname, extra_args=None, rpchost=None, timewait=None, bina
     Currently, it is permitted by default and a warning is issued.
     The --add-opens VM option remove this warning.
     '''
-    bashcmd = 'java --add-opens java.base/java.lang=ALL-UNNAMED ' + dbg_agent_opt + ' -cp ' + binary + " " + cfgFileName
+    jvm_opt = ''
+    if jvm_options is not None:
+        jvm_opt = ' ' + ' '.join(jvm_options)
+    bashcmd = 'java --add-opens java.base/java.lang=ALL-UNNAMED ' + jvm_opt + dbg_agent_opt + ' -cp ' + binary + " " + cfgFileName
     if print_output_to_file:
         with open(datadir + "/log_out.txt", "wb") as out, open(datadir + "/log_err.txt", "wb") as err:
             sidechainclient_processes[i] = subprocess.Popen(bashcmd.split(), stdout=out, stderr=err)
@@ -558,11 +587,12 @@ def start_sc_node(i, dirname, extra_args=None, rpchost=None, timewait=None, bina
     proxy = SidechainAuthServiceProxy(url, auth_api_key=auth_api_key)
     proxy.url = url  # store URL on proxy for info
     proxy.dataDir = datadir  # store the name of the datadir
+    proxy.wsUrl = "ws://localhost:%d/" % sc_ws_port(i)  # store the websocket server url, used to wait for node events
     return proxy
 
 
 def start_sc_nodes(num_nodes, dirname, extra_args=None, rpchost=None, binary=None, print_output_to_file=False,
-                   auth_api_key=DEFAULT_API_KEY):
+                   auth_api_key=DEFAULT_API_KEY, jvm_options=None):
     """
     Start multiple SC clients, return connections to them
     """
@@ -570,7 +600,7 @@ def start_sc_nodes(num_nodes, dirname, extra_args=None, rpchost=None, binary=Non
     if binary is None: binary = [None for i in range(num_nodes)]
     nodes = [
         start_sc_node(i, dirname, extra_args[i], rpchost, binary=binary[i], print_output_to_file=print_output_to_file,
-                      auth_api_key=auth_api_key)
+                      auth_api_key=auth_api_key, jvm_options=jvm_options)
         for i in range(num_nodes)]
     wait_for_sc_node_initialization(nodes)
     return nodes
@@ -975,30 +1005,27 @@ def generate_forging_request(epoch, slot, forced_tx):
     return json.dumps({"epochNumber": epoch, "slotNumber": slot, "transactionsBytes": forced_tx})
 
 
-def get_next_epoch_slot(epoch, slot, slots_in_epoch, force_switch_to_next_epoch=False):
-    next_slot = slot + 1
-    next_epoch = epoch
-
-    if next_slot > slots_in_epoch or force_switch_to_next_epoch:
-        next_slot = 1
-        next_epoch += 1
-    return next_epoch, next_slot
-
-
 def generate_next_block(node, node_name, force_switch_to_next_epoch=False, verbose=True, forced_tx=None):
-    forging_info = node.block_forgingInfo()["result"]
-    slots_in_epoch = forging_info["consensusSlotsInEpoch"]
-    best_slot = forging_info["bestSlotNumber"]
-    best_epoch = forging_info["bestEpochNumber"]
-
-    next_epoch, next_slot = get_next_epoch_slot(best_epoch, best_slot, slots_in_epoch, force_switch_to_next_epoch)
+    # The tip epoch and slot are tracked by the test framework, they are retrieved from the node only on the first
+    # call or when forging fails, for example because blocks were received from other nodes. The parent of the forged
+    # block tells if the node tip was behind the tracked one, see ConsensusTipTracker.
+    tip_tracker = get_consensus_tip_tracker(node)
+    slots_in_epoch = tip_tracker.params.slots_in_epoch
+    next_epoch, next_slot = tip_tracker.next_epoch_and_slot(force_switch_to_next_epoch)
 
     forge_result = node.block_generate(generate_forging_request(next_epoch, next_slot, forced_tx))
+    resynced = False
 
     # "while" will break if whole epoch no generated block, due changed error code
     while "error" in forge_result and forge_result["error"]["code"] == "0105":
         if ("no forging stake" in forge_result["error"]["description"]):
             raise AssertionError("No forging stake for the epoch")
+        if not resynced:
+            resynced = True
+            if tip_tracker.resync():
+                next_epoch, next_slot = tip_tracker.next_epoch_and_slot(force_switch_to_next_epoch)
+                forge_result = node.block_generate(generate_forging_request(next_epoch, next_slot, forced_tx))
+                continue
         logging.info("Skip block generation for epoch {epochNumber} slot {slotNumber}".format(epochNumber=next_epoch,
                                                                                        slotNumber=next_slot))
         next_epoch, next_slot = get_next_epoch_slot(next_epoch, next_slot, slots_in_epoch)
@@ -1006,28 +1033,54 @@ def generate_next_block(node, node_name, force_switch_to_next_epoch=False, verbo
 
     assert_true("result" in forge_result, "Error during block generation for SC {0}".format(node_name))
     block_id = forge_result["result"]["blockId"]
+    tip_tracker.on_block_forged(next_epoch, next_slot, block_id, forge_result["result"].get("parentId"))
     if verbose == True:
         logging.info("Successfully forged block with id {blockId}".format(blockId=block_id))
     return forge_result["result"]["blockId"]
 
 
 def generate_next_blocks(node, node_name, blocks_count, verbose=True):
+    """
+    Forge blocks_count consecutive blocks with block/generateMany requests, skipping the slots where the node
+    is not able to forge. A single request may forge less blocks than requested because of the API timeout,
+    so the requests are repeated until all the blocks are forged.
+    """
     blocks_ids = []
-    for i in range(blocks_count):
-        blocks_ids.append(generate_next_block(node, node_name, force_switch_to_next_epoch=False, verbose=verbose))
+    while len(blocks_ids) < blocks_count:
+        forge_result = node.block_generateMany(json.dumps({"number": blocks_count - len(blocks_ids)}))
+        if "error" in forge_result and "no forging stake" in forge_result["error"]["description"]:
+            raise AssertionError("No forging stake for the epoch")
+        assert_true("result" in forge_result, "Error during block generation for SC {0}".format(node_name))
+
+        for block in forge_result["result"]["blocks"]:
+            if verbose == True:
+                logging.info("Successfully forged block with id {blockId} for epoch {epochNumber} slot {slotNumber} "
+                             "in {forgingTime} ms, {skippedSlots} slots skipped".format(**block))
+        assert_true(len(forge_result["result"]["blockIds"]) > 0, "No block was generated for SC {0}".format(node_name))
+        blocks_ids.extend(forge_result["result"]["blockIds"])
+
+        tip_tracker = get_consensus_tip_tracker_if_any(node)
+        if tip_tracker is not None:
+            last_block = forge_result["result"]["blocks"][-1]
+            tip_tracker.on_block_forged(last_block["epochNumber"], last_block["slotNumber"], last_block["blockId"])
     return blocks_ids
 
 
 # Check if the CSW proofs for the required boxes were finished (or absent if was not able to create a proof)
+def get_csw_proofs_status(sc_node, csw_box_ids):
+    """
+    Retrieve the CSW proofs status of all the given boxes with a single request.
+
+    Output: dict with "completed" flag (no proof in queue or in process), "statusCounts" with the number of boxes
+    per status and "proofsStatus" list with the status of each box.
+    """
+    return sc_node.csw_cswProofsStatus(json.dumps({"boxIds": csw_box_ids}))["result"]
+
+
 def if_csws_were_generated(sc_node, csw_box_ids, allow_absent=False):
-    for box_id in csw_box_ids:
-        req = json.dumps({"boxId": box_id})
-        status = sc_node.csw_cswInfo(req)["result"]["cswInfo"]["proofInfo"]["status"]
-        if status == "Absent" and allow_absent:
-            continue
-        elif status != "Generated":
-            return False
-    return True
+    accepted_statuses = ["Generated", "Absent"] if allow_absent else ["Generated"]
+    status_counts = get_csw_proofs_status(sc_node, csw_box_ids)["statusCounts"]
+    return all(status in accepted_statuses for status in status_counts)
 
 
 def get_scinfo_data(scid, mc_node):
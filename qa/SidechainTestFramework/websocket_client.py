@@ -1,3 +1,8 @@
+import json
+import logging
+import socket
+import threading
+
 import websocket
 from websocket import create_connection
 from test_framework.util import assert_equal, assert_true
@@ -19,6 +24,7 @@ class WebsocketClient():
     # Websocket events codes
     MEMPOOL_CHANGED_EVENT = 2
     UPDATE_TIP_EVENT = 0
+    CERTIFICATE_LIFECYCLE_EVENT = 3
 
     def create_connection(self, url):
         return create_connection(url)
@@ -41,3 +47,105 @@ class WebsocketClient():
             assert_true('requestId' not in response)
         else:
             assert_equal(response['requestId'], requestId)
+
+
+class WebsocketEventListener():
+    """
+    Listen for the events pushed by the websocket servers of one or more SC nodes.
+    Every received event of the requested types increases a counter, so the caller can block until something
+    happened on any node instead of sleeping for a fixed amount of time.
+    Nodes without a reachable websocket server are skipped: in that case waiting for an event simply times out
+    and the caller falls back to plain polling.
+
+    Parameters:
+     - urls: websocket server urls of the nodes, None entries are ignored
+     - event_types: list of websocket events codes to count (see WebsocketClient)
+     - connection_timeout: timeout in seconds for opening each connection
+     - on_event: optional callable invoked by the listening thread of a node for every counted event,
+       with the node url and the event payload
+    """
+
+    def __init__(self, urls, event_types=(WebsocketClient.UPDATE_TIP_EVENT,), connection_timeout=1, on_event=None):
+        self.urls = urls
+        self.event_types = event_types
+        self.connection_timeout = connection_timeout
+        self.on_event = on_event
+        self.last_payloads = {}
+        self._connections = []
+        self._threads = []
+        self._events_count = 0
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        for url in self.urls:
+            if url is None:
+                continue
+            try:
+                ws_connection = create_connection(url, timeout=self.connection_timeout)
+            except Exception as e:
+                logging.debug("Websocket events are not available for {0}: {1}".format(url, e))
+                continue
+            # events may be rare, so once connected wait for them without any timeout
+            ws_connection.settimeout(None)
+            self._connections.append(ws_connection)
+            thread = threading.Thread(target=self._listen, args=(url, ws_connection), daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        for ws_connection in self._connections:
+            # shutdown the socket first to wake up the listening thread blocked on recv
+            try:
+                ws_connection.sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+            ws_connection.shutdown()
+        for thread in self._threads:
+            thread.join(self.connection_timeout)
+        self._connections = []
+        self._threads = []
+
+    def is_connected(self):
+        return len(self._connections) > 0
+
+    def events_count(self):
+        with self._condition:
+            return self._events_count
+
+    def wait_for_event(self, seen_events_count, timeout):
+        """
+        Wait for maximum timeout seconds for an event received after seen_events_count events.
+        Return the current events count.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._events_count > seen_events_count, timeout)
+            return self._events_count
+
+    def _listen(self, url, ws_connection):
+        while not self._stopped.is_set():
+            try:
+                message = ws_connection.recv()
+            except Exception:
+                break
+            if not message:
+                continue
+            try:
+                event = json.loads(message)
+            except ValueError:
+                continue
+            if event.get("msgType") == WebsocketClient.EVENT_MSG_TYPE and event.get("answerType") in self.event_types:
+                if self.on_event is not None:
+                    self.on_event(url, event.get("eventPayload"))
+                with self._condition:
+                    self.last_payloads[url] = event.get("eventPayload")
+                    self._events_count += 1
+                    self._condition.notify_all()
@@ -5,4 +5,11 @@ def allTransactions(sidechainNode, format = True):
     j = {"format": format }
     request = json.dumps(j)
     response = sidechainNode.transaction_allTransactions(request)
-    return response["result"]
\ No newline at end of file
+    return response["result"]
+
+# execute a transaction/allTransactions call returning only the mempool size and the digest of its transaction ids
+def allTransactionsDigest(sidechainNode):
+    j = {"digest": True}
+    request = json.dumps(j)
+    response = sidechainNode.transaction_allTransactions(request)
+    return response["result"]
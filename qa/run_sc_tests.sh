@@ -94,6 +94,24 @@ testScripts=(
     'sc_ft_limit_fork.py'
     'sc_fork_one_forced_tx.py'
     'sc_big_block.py'
+    'sc_offline_core_transaction.py'
+);
+
+# extended tests: long running benchmarks, run only with EXTENDED=true
+testScriptsExt=(
+    'sc_benchmark_mempool.py'
+    'sc_benchmark_forward_transfers.py'
+    'sc_benchmark_backward_transfers.py'
+    'sc_benchmark_cert_proof.py'
+    'sc_benchmark_csw_proofs.py'
+    'sc_benchmark_sync.py'
+    'sc_benchmark_block_propagation.py'
+    'sc_benchmark_rest_api.py'
+    'sc_benchmark_websocket.py'
+    'sc_benchmark_storage_growth.py'
+    'sc_benchmark_cold_start.py'
+    'sc_benchmark_rollback.py'
+    'sc_benchmark_topology.py'
 );
 
 # include extended tests
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+import json
+import logging
+import math
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData, \
+    WithdrawalRequestBoxData
+from SidechainTestFramework.sc_forging_util import get_withdrawal_epoch_params, get_withdrawal_epoch_by_mc_height, \
+    get_withdrawal_epoch_end_height, advance_to_epoch_end, advance_withdrawal_epochs
+from SidechainTestFramework.sc_wait_util import wait_for_certificate
+from httpCalls.transaction.allTransactions import allTransactionsDigest
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import fail, assert_equal, assert_true, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks, \
+    connect_sc_nodes, sync_sc_blocks
+
+"""
+Benchmark of the certificate submission as a function of the number of backward transfers.
+
+Configuration:
+    Start 1 MC node and 2 SC nodes connected to each other.
+    First SC node is the submitter and owns the signer keys (0,1,2,3), second SC node owns the keys (4,5,6):
+    the certificate signatures (threshold 5 of 7) must be collected from both nodes.
+
+Benchmark, for every backward transfers count of --btcounts, one withdrawal epoch:
+    - Spread the withdrawal requests over the MC blocks of the epoch: after every MC block reference, a transaction
+      built offline with the next withdrawal requests is forged, at most the slots opened by a MC block reference
+      (3999 / (withdrawal epoch length - 1), see sc_bt_limit.py).
+    - Reach the end of the epoch and trigger the certificate submission
+    - Wait for the certificate and include it in a MC block
+
+Results (JSON): "certificates" series with the duration of every certificate submission stage, taken from the
+submitter certificate lifecycle: signatures collection (from the SC block that opens the submission window),
+backward transfers retrieval, proof generation, MC submission; and the certificate size. The proof generation time
+and the certificate size of every backward transfers count also as metrics.
+"""
+class SCBenchmarkBackwardTransfers(SidechainTestFramework):
+    max_backward_transfers_per_epoch = 3999
+    ft_amount = 100  # Zen
+    bt_value = 10000  # satoshi
+    fee = 1000  # satoshi
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--btcounts", dest="btcounts", default="100,1000,3000",
+                          help="Comma separated numbers of backward transfers, one withdrawal epoch for each")
+        parser.add_option("--epochlength", dest="epochlength", type="int", default=11,
+                          help="Withdrawal epoch length")
+
+    def setup_nodes(self):
+        # Set MC scproofqueuesize to 0 to avoid BatchVerifier processing delays
+        return start_nodes(1, self.options.tmpdir, extra_args=[['-scproofqueuesize=0']])
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_1_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0))),
+            True,  # Certificate submission is enabled
+            True,  # Certificate signing is enabled
+            [0, 1, 2, 3]  # owns 4 schnorr PKs for certificate signing
+        )
+        sc_node_2_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0))),
+            False,  # Certificate submission is disabled
+            True,  # Certificate signing is enabled
+            [4, 5, 6]  # owns 3 schnorr PKs for certificate signing
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, self.options.epochlength),
+                                         sc_node_1_configuration, sc_node_2_configuration)
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(2, self.options.tmpdir)
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        bt_counts = [int(count) for count in options.btcounts.split(",")]
+        slots_per_mc_block = self.max_backward_transfers_per_epoch // (options.epochlength - 1)
+        results = BenchmarkResults("backward_transfers", options, {
+            "btCounts": bt_counts, "withdrawalEpochLength": options.epochlength})
+
+        connect_sc_nodes(sc_node, 1)
+        self.sc_sync_all()
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+               if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        bt_output = WithdrawalRequestBoxData(mc_node.getnewaddress(), self.bt_value)
+
+        # Every benchmark epoch starts right after the inclusion of the previous certificate
+        advance_withdrawal_epochs(mc_node, self.sc_nodes, 1)
+        sc_creation_height, withdrawal_epoch_length = get_withdrawal_epoch_params(mc_node, sc_node)
+
+        for bt_count in bt_counts:
+            epoch = get_withdrawal_epoch_by_mc_height(mc_node.getblockcount() + 1, sc_creation_height,
+                                                      withdrawal_epoch_length)
+            epoch_end_height = get_withdrawal_epoch_end_height(epoch, sc_creation_height, withdrawal_epoch_length)
+            # The last MC block of the epoch is referenced by advance_to_epoch_end
+            bt_mc_blocks = epoch_end_height - mc_node.getblockcount() - 1
+            bts_per_mc_block = int(math.ceil(bt_count / float(bt_mc_blocks)))
+            if bts_per_mc_block > slots_per_mc_block:
+                fail("{0} backward transfers don't fit {1} MC blocks of {2} slots, use a longer epoch.".format(
+                    bt_count, bt_mc_blocks, slots_per_mc_block))
+
+            start = time.time()
+            remaining = bt_count
+            while remaining > 0:
+                mc_node.generate(1)
+                generate_next_blocks(sc_node, "first node", 1, verbose=False)
+
+                outputs = [bt_output] * min(bts_per_mc_block, remaining)
+                change = box["value"] - len(outputs) * self.bt_value - self.fee
+                tx = CoreTransaction([box["id"]], outputs + [ZenBoxData(key.public_key_hex, change)],
+                                     self.fee).sign(key)
+                response = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+                assert_true("result" in response, "Withdrawal transaction was rejected: " + json.dumps(response))
+                generate_next_blocks(sc_node, "first node", 1, verbose=False)
+                assert_equal(0, allTransactionsDigest(sc_node)["size"], "Withdrawal transaction was not forged.")
+
+                box = tx.new_boxes()[-1]
+                remaining -= len(outputs)
+            requests_secs = time.time() - start
+
+            advance_to_epoch_end(mc_node, self.sc_nodes, epoch)
+
+            # Reference the first MC block of the next epoch to trigger the certificate submission
+            mc_node.generate(1)
+            generate_next_blocks(sc_node, "first node", 1, verbose=False)
+            window_opened_at = time.time() * 1000
+            sync_sc_blocks(self.sc_nodes)
+
+            lifecycle = wait_for_certificate(self.sc_nodes, epoch)
+            if lifecycle.get("certificateId") is None:
+                fail("Certificate submission for epoch {0} failed: {1}".format(epoch, lifecycle.get("failureReason")))
+            certificate_size = len(mc_node.getrawtransaction(lifecycle["certificateId"])) // 2
+
+            mc_block_hash = mc_node.generate(1)[0]
+            assert_equal([lifecycle["certificateId"]], mc_node.getblock(mc_block_hash)["cert"],
+                         "Certificate was not included in the MC block.")
+            generate_next_blocks(sc_node, "first node", 1, verbose=False)
+            sync_sc_blocks(self.sc_nodes)
+
+            results.add("certificates", epoch=epoch, requestedBackwardTransfers=bt_count,
+                        backwardTransfers=lifecycle["backwardTransfers"], withdrawalRequestsSecs=requests_secs,
+                        knownSignatures=lifecycle["knownSignatures"], quality=lifecycle["quality"],
+                        signaturesCollectionMs=lifecycle["signaturesCollectedAt"] - window_opened_at,
+                        scheduleDelayMs=lifecycle["proofDataRequestedAt"] - lifecycle["signaturesCollectedAt"],
+                        proofDataMs=lifecycle["proofGenerationStartedAt"] - lifecycle["proofDataRequestedAt"],
+                        proofMs=lifecycle["proofGenerationFinishedAt"] - lifecycle["proofGenerationStartedAt"],
+                        mcSubmissionMs=lifecycle["sentToMainchainAt"] - lifecycle["proofGenerationFinishedAt"],
+                        certificateSize=certificate_size)
+            results.set_for("proofMs", bt_count,
+                            lifecycle["proofGenerationFinishedAt"] - lifecycle["proofGenerationStartedAt"])
+            results.set_for("certificateBytes", bt_count, certificate_size)
+            logging.info("Certificate for epoch {0} with {1} backward transfers: {2} bytes".format(
+                epoch, lifecycle["backwardTransfers"], certificate_size))
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkBackwardTransfers().main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import json
+import logging
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH, DEFAULT_MAX_PACKET_SIZE
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary, \
+    start_new_sidechain
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData
+from SidechainTestFramework.sc_load_generator import fan_out, MAX_BLOCK_TRANSACTIONS
+from SidechainTestFramework.sc_topology import topology_edges, topology_hops
+from SidechainTestFramework.sc_wait_util import wait_until
+from SidechainTestFramework.websocket_client import WebsocketClient, WebsocketEventListener
+from httpCalls.block.findBlockByID import http_block_findById
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_true, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import generate_next_blocks, connect_sc_nodes, sync_sc_blocks, \
+    sync_sc_mempools, get_sc_ws_urls
+
+"""
+Benchmark of the SC block propagation latency as a function of the block size, the P2P max packet size and the
+network topology.
+
+Configuration:
+    Start 1 MC node. For every combination of --topologies and --maxpacketsizes, a new sidechain is created with
+    --nodes SC nodes connected as:
+     - line: every node to the next one, the forger is at one end
+     - star: every node to the forger
+     - mesh: every node to all the other ones
+
+Benchmark, for every combination, for every transactions count of --blocktransactions (increasing, at most
+MAX_BLOCK_TRANSACTIONS) and every MC references count of --mcreferences, --repeats times:
+    - Send the transactions to the forger and wait for them to be in all the memory pools, so only the block
+      is propagated during the measurement. The transactions not included in the block stay in the memory pools
+      and are part of the next block.
+    - Mine the MC blocks to be referenced
+    - Forge a block on the first SC node and listen for the UPDATE_TIP_EVENT of every node on its websocket server:
+      the propagation latency of a peer is the time between the tip event of the forger and its own one,
+      so it includes the block validation and application on the peer
+    - A block not received in --propagationdeadline secs (e.g. larger than the max packet size) stops the
+      larger blocks of the combination
+
+Results (JSON): "blocks" series with the latency of every peer for every block, with the block bytes and the
+number of hops from the forger, "propagation" series with the latency summary for every block size, also as
+metric.
+"""
+class SCBenchmarkBlockPropagation(SidechainTestFramework):
+    ft_amount = 1000  # Zen
+    box_value = 100000  # satoshi
+    # Forging big blocks takes longer than the default API timeout
+    min_rest_api_timeout = 20
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--nodes", dest="nodes", type="int", default=4, help="Number of SC nodes")
+        parser.add_option("--topologies", dest="topologies", default="line,star,mesh",
+                          help="Comma separated SC network topologies: line, star or mesh, see sc_topology")
+        parser.add_option("--maxpacketsizes", dest="maxpacketsizes", default=str(DEFAULT_MAX_PACKET_SIZE),
+                          help="Comma separated P2P max packet sizes in bytes")
+        parser.add_option("--blocktransactions", dest="blocktransactions", default="0,500,1000",
+                          help="Comma separated increasing numbers of transactions in a block, "
+                               "at most {0}".format(MAX_BLOCK_TRANSACTIONS))
+        parser.add_option("--mcreferences", dest="mcreferences", default="0,3",
+                          help="Comma separated numbers of MC block references in a block")
+        parser.add_option("--repeats", dest="repeats", type="int", default=3,
+                          help="Number of blocks forged for every block size")
+        parser.add_option("--propagationdeadline", dest="propagationdeadline", type="int", default=60,
+                          help="Max time for a block to reach all the nodes in secs")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        # Every sidechain is created by run_test
+        pass
+
+    def sc_setup_network(self, split=False):
+        self.sc_nodes = []
+
+    def create_network(self, topology, max_packet_size):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0))),
+            max_packet_size=max_packet_size
+        )
+        start_new_sidechain(self, SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH),
+                                                         *([sc_node_configuration] * self.options.nodes)))
+        edges = topology_edges(topology, self.options.nodes)
+        for (a, b) in edges:
+            connect_sc_nodes(self.sc_nodes[a], b)
+        sync_sc_blocks(self.sc_nodes)
+        return edges
+
+    def forge_and_propagate(self, mc_references):
+        """
+        Forge a block on the first SC node and wait for its tip event on every node.
+
+        Output: the block id and the time of the tip event of every node, None if not received
+        """
+        sc_node = self.sc_nodes[0]
+        urls = get_sc_ws_urls(self.sc_nodes)
+        tips_received_at = {}
+
+        def on_tip(url, payload):
+            tips_received_at.setdefault((payload["hash"], url), time.time())
+
+        with WebsocketEventListener(urls, [WebsocketClient.UPDATE_TIP_EVENT], on_event=on_tip) as listener:
+            assert_true(listener.is_connected(), "Websocket servers of the nodes are required.")
+            if mc_references > 0:
+                self.nodes[0].generate(mc_references)
+            block_id = generate_next_blocks(sc_node, "first node", 1, verbose=False)[0]
+            wait_until(lambda: all((block_id, url) in tips_received_at for url in urls),
+                       deadline=self.options.propagationdeadline, description="block tip events",
+                       raise_on_timeout=False)
+        return block_id, [tips_received_at.get((block_id, url)) for url in urls]
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        options = self.options
+        options.restapitimeout = max(int(options.restapitimeout), self.min_rest_api_timeout)
+        topologies = options.topologies.split(",")
+        max_packet_sizes = [int(size) for size in options.maxpacketsizes.split(",")]
+        transactions_counts = [int(count) for count in options.blocktransactions.split(",")]
+        if max(transactions_counts) > MAX_BLOCK_TRANSACTIONS:
+            logging.info("A block contains at most {0} transactions, larger counts are capped".format(
+                MAX_BLOCK_TRANSACTIONS))
+            transactions_counts = sorted(set(min(count, MAX_BLOCK_TRANSACTIONS) for count in transactions_counts))
+        mc_references_counts = [int(count) for count in options.mcreferences.split(",")]
+        results = BenchmarkResults("block_propagation", options, {
+            "nodes": options.nodes, "topologies": topologies, "maxPacketSizes": max_packet_sizes,
+            "blockTransactions": transactions_counts, "mcReferences": mc_references_counts,
+            "repeats": options.repeats})
+
+        for topology in topologies:
+            for max_packet_size in max_packet_sizes:
+                edges = self.create_network(topology, max_packet_size)
+                hops = topology_hops(edges, options.nodes)
+                sc_node = self.sc_nodes[0]
+
+                key = PrivateKey25519.generate()
+                http_wallet_importSecret(sc_node, key.secret_hex())
+                forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                              key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+                generate_next_blocks(sc_node, "first node", 1)
+                ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                          if box["proposition"]["publicKey"] == key.public_key_hex][0]
+                # Every block spends the boxes created by the previous one
+                boxes = fan_out(sc_node, ft_box, max(transactions_counts), self.box_value, private_key=key) \
+                    if max(transactions_counts) > 0 else []
+                sync_sc_blocks(self.sc_nodes, 120)
+
+                propagated = True
+                # Transactions left in the memory pools by the previous block, by spent box id
+                pending = {}
+                for transactions_count in transactions_counts:
+                    for mc_references in mc_references_counts:
+                        latencies = []
+                        for _ in range(options.repeats if propagated else 0):
+                            transactions = []
+                            for box in boxes[:transactions_count]:
+                                tx = pending.pop(box["id"], None)
+                                if tx is None:
+                                    tx = CoreTransaction([box["id"]], [ZenBoxData(key.public_key_hex,
+                                                                                  box["value"])]).sign(key)
+                                    response = sc_node.transaction_sendTransaction(
+                                        json.dumps({"transactionBytes": tx.to_hex()}))
+                                    assert_true("result" in response,
+                                                "Transaction was rejected: " + json.dumps(response))
+                                transactions.append(tx)
+                            sync_sc_mempools(self.sc_nodes, 120)
+
+                            block_id, received_at = self.forge_and_propagate(mc_references)
+                            block = http_block_findById(sc_node, block_id)
+                            # Only the boxes of the transactions in the block are in the state
+                            included = set(tx["id"] for tx in block["block"]["sidechainTransactions"])
+                            for (index, tx) in enumerate(transactions):
+                                if tx.id() in included:
+                                    boxes[index] = tx.new_boxes()[0]
+                                else:
+                                    pending[boxes[index]["id"]] = tx
+                            if len(pending) > 0:
+                                logging.info("{0} transactions not included in the block, left for the next one"
+                                             .format(len(pending)))
+                            block_bytes = len(block["blockHex"]) // 2
+                            for peer in range(1, options.nodes):
+                                latency_ms = (received_at[peer] - received_at[0]) * 1000 \
+                                    if received_at[0] is not None and received_at[peer] is not None else None
+                                if latency_ms is not None:
+                                    latencies.append(latency_ms)
+                                results.add("blocks", topology=topology, maxPacketSize=max_packet_size,
+                                            blockBytes=block_bytes,
+                                            transactions=len(block["block"]["sidechainTransactions"]),
+                                            mcReferences=len(block["block"]["mainchainBlockReferencesData"]),
+                                            peer=peer, hops=hops[peer], latencyMs=latency_ms)
+
+                            if None in received_at:
+                                # The peers without the block are out of sync: no more transactions can be
+                                # propagated to them, so the remaining blocks of the combination are skipped
+                                propagated = False
+                                logging.info("Block of {0} bytes not propagated to all the nodes with max packet size "
+                                             "{1}, larger blocks are skipped".format(block_bytes, max_packet_size))
+                                break
+                            sync_sc_blocks(self.sc_nodes)
+
+                        if len(latencies) > 0:
+                            results.add("propagation", topology=topology, maxPacketSize=max_packet_size,
+                                        transactions=transactions_count, mcReferences=mc_references,
+                                        blockBytes=block_bytes, latencyMs=latency_summary(latencies))
+                            results.set_for("propagationMs", "{0}-{1}-{2}tx-{3}mc".format(
+                                topology, max_packet_size, transactions_count, mc_references),
+                                latency_summary(latencies))
+                            logging.info("{0} topology, block of {1} bytes: propagation p50 {2:.0f} ms, max {3:.0f} ms"
+                                         .format(topology, block_bytes, latency_summary(latencies)["p50"],
+                                                 latency_summary(latencies)["max"]))
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkBlockPropagation().main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import logging
+import os
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary, \
+    ProcessMemorySampler, start_new_sidechain
+from SidechainTestFramework.sc_forging_util import get_withdrawal_epoch_params, get_withdrawal_epoch_by_mc_height, \
+    advance_to_epoch_end
+from SidechainTestFramework.sc_wait_util import wait_for_certificate
+from test_framework.util import fail, assert_equal, start_nodes, websocket_port_by_mc_node_index
+from SidechainTestFramework.scutil import generate_next_blocks, get_sc_node_pids, cert_proof_keys_paths, \
+    generate_certificate_proof_info
+
+"""
+Benchmark of the certificate proof generation for several sidechain configurations.
+
+Configuration:
+    Start 1 MC node. For every combination of --certkeys and --cswenabled, a new sidechain is created with 1 SC node
+    that owns all the certificate signer keys.
+
+Benchmark, for every combination:
+    - Generate the certificate proving keys, or load them from the cache if they were generated by a previous run
+      (qa/ps_keys), and measure the time
+    - Bootstrap and start the SC node of the new sidechain
+    - For --epochs withdrawal epochs: reach the end of the epoch, trigger the certificate submission and wait for
+      the certificate, sampling the SC node resident memory meanwhile
+    - Measure the proof generation time from the submitter certificate lifecycle and the proof size from the
+      certificate in the MC
+
+Results (JSON): "proofs" series with a point per certificate, "table" metric with the summary of every combination,
+"proofMs" and "peakRssMb" metrics of every combination.
+"""
+class SCBenchmarkCertProof(SidechainTestFramework):
+    sc_withdrawal_epoch_length = 10
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--certkeys", dest="certkeys", default="4:3,7:5,10:6",
+                          help="Comma separated certificate signer keys configurations as max_keys:threshold")
+        parser.add_option("--cswenabled", dest="cswenabled", default="false,true",
+                          help="Comma separated values of the sidechain CSW enabled flag")
+        parser.add_option("--epochs", dest="epochs", type="int", default=2,
+                          help="Number of certificates generated for every configuration")
+
+    def setup_nodes(self):
+        # Set MC scproofqueuesize to 0 to avoid BatchVerifier processing delays
+        return start_nodes(1, self.options.tmpdir, extra_args=[['-scproofqueuesize=0']])
+
+    def sc_setup_chain(self):
+        # Every sidechain is created by run_test
+        pass
+
+    def sc_setup_network(self, split=False):
+        self.sc_nodes = []
+
+    def create_sidechain(self, cert_max_keys, cert_sig_threshold, csw_enabled):
+        """
+        Replace the running SC node with the node of a new sidechain.
+
+        Output: time in secs to generate or load the certificate proving keys, True if they were cached
+        """
+        mc_node = self.nodes[0]
+        ps_keys_dir = os.getenv("SIDECHAIN_SDK", "..") + "/qa/ps_keys"
+        if not os.path.isdir(ps_keys_dir):
+            os.makedirs(ps_keys_dir)
+        keys_paths = cert_proof_keys_paths(ps_keys_dir, cert_max_keys, csw_enabled)
+        keys_cached = os.path.isfile(keys_paths.verification_key_path)
+        start = time.time()
+        generate_certificate_proof_info("seed", cert_max_keys, cert_sig_threshold, keys_paths, csw_enabled)
+        keygen_secs = time.time() - start
+
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0))),
+            submitter_private_keys_indexes=list(range(cert_max_keys))  # SC node owns all schnorr private keys.
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, self.sc_withdrawal_epoch_length,
+                                                        cert_max_keys=cert_max_keys,
+                                                        cert_sig_threshold=cert_sig_threshold,
+                                                        csw_enabled=csw_enabled), sc_node_configuration)
+        start_new_sidechain(self, network)
+        return keygen_secs, keys_cached
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        options = self.options
+        cert_keys = [tuple(int(value) for value in config.split(":")) for config in options.certkeys.split(",")]
+        csw_flags = [flag.strip().lower() == "true" for flag in options.cswenabled.split(",")]
+        results = BenchmarkResults("cert_proof", options, {
+            "certKeys": options.certkeys, "cswEnabled": csw_flags, "epochs": options.epochs,
+            "withdrawalEpochLength": self.sc_withdrawal_epoch_length})
+
+        table = []
+        for (cert_max_keys, cert_sig_threshold) in cert_keys:
+            for csw_enabled in csw_flags:
+                keygen_secs, keys_cached = self.create_sidechain(cert_max_keys, cert_sig_threshold, csw_enabled)
+                sc_node = self.sc_nodes[0]
+                sc_creation_height, withdrawal_epoch_length = get_withdrawal_epoch_params(mc_node, sc_node)
+
+                proof_times = []
+                peak_rss = []
+                for _ in range(options.epochs):
+                    epoch = get_withdrawal_epoch_by_mc_height(mc_node.getblockcount() + 1, sc_creation_height,
+                                                              withdrawal_epoch_length)
+                    advance_to_epoch_end(mc_node, self.sc_nodes, epoch)
+
+                    with ProcessMemorySampler(get_sc_node_pids()[0]) as sampler:
+                        # Reference the first MC block of the next epoch to trigger the certificate submission
+                        mc_node.generate(1)
+                        generate_next_blocks(sc_node, "first node", 1, verbose=False)
+                        lifecycle = wait_for_certificate(sc_node, epoch)
+                    if lifecycle.get("certificateId") is None:
+                        fail("Certificate submission for epoch {0} failed: {1}".format(
+                            epoch, lifecycle.get("failureReason")))
+
+                    certificate = mc_node.getrawtransaction(lifecycle["certificateId"], 1)
+                    proof_size = len(certificate["cert"]["scProof"]) // 2
+                    mc_block_hash = mc_node.generate(1)[0]
+                    assert_equal([lifecycle["certificateId"]], mc_node.getblock(mc_block_hash)["cert"],
+                                 "Certificate was not included in the MC block.")
+                    generate_next_blocks(sc_node, "first node", 1, verbose=False)
+
+                    proof_times.append(lifecycle["proofGenerationFinishedAt"] - lifecycle["proofGenerationStartedAt"])
+                    peak_rss.append(sampler.peak_rss_mb())
+                    results.add("proofs", certMaxKeys=cert_max_keys, certSigThreshold=cert_sig_threshold,
+                                cswEnabled=csw_enabled, epoch=epoch, proofMs=proof_times[-1],
+                                peakRssMb=peak_rss[-1], proofSize=proof_size,
+                                certificateSize=len(certificate["hex"]) // 2)
+
+                configuration = "{0}-{1}-{2}".format(cert_max_keys, cert_sig_threshold,
+                                                     "csw" if csw_enabled else "nocsw")
+                results.set_for("proofMs", configuration, latency_summary(proof_times))
+                results.set_for("peakRssMb", configuration, max(peak_rss))
+                table.append({"certMaxKeys": cert_max_keys, "certSigThreshold": cert_sig_threshold,
+                              "cswEnabled": csw_enabled, "keysCached": keys_cached, "keygenSecs": keygen_secs,
+                              "proofMs": latency_summary(proof_times)["p50"], "peakRssMb": max(peak_rss),
+                              "proofSize": proof_size})
+
+        logging.info("max keys | threshold | CSW   | keygen secs | proof ms | peak RSS MB | proof size")
+        for row in table:
+            logging.info("{certMaxKeys:8} | {certSigThreshold:9} | {cswEnabled!s:5} | {keygenSecs:11.1f} | "
+                         "{proofMs:8} | {peakRssMb:11.0f} | {proofSize}".format(**row))
+        results.set("table", table)
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkCertProof().main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+import logging
+import os
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary, \
+    StorageSampler, SC_NODE_STARTUP_LOG_MARKERS, get_sc_node_log_path, read_log_markers, wait_for_sc_node_answer
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519
+from SidechainTestFramework.sc_load_generator import fan_out, forge_chain
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_equal, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, start_sc_node, stop_sc_node, \
+    generate_next_blocks
+
+"""
+Benchmark of the SC node restart time as a function of its chain length.
+
+Configuration:
+    Start 1 MC node and 1 SC node.
+
+Benchmark, for every chain length of --chainlengths (in blocks, increasing):
+    - Extend the chain up to the chain length, by batches of --batchblocks SC blocks: every batch references a new
+      MC block and includes --batchtransactions transactions
+    - Restart the SC node --restarts times, measuring the time from the process start to the first successful
+      block/best request. The time is split in stages by the timestamps of the node log lines:
+       - jvm: from the process start to the application start
+       - initialization: settings, proving system keys and storages opening, up to the state restore
+       - restore: history, state and wallet restore and storages consistency check
+       - api: actors, network and API start, up to the first block/best answer
+
+Results (JSON): "restarts" series with the duration of every stage of every restart and the size of the node
+storages, "coldStart" series with the summary of the restarts of every chain length, also as metric.
+"""
+class SCBenchmarkColdStart(SidechainTestFramework):
+    ft_amount = 100  # Zen
+    box_value = 1000000  # satoshi
+    # Like sc_node_response_along_sync: 8 consensus epochs of timestamp rewind to forge 2000 blocks
+    blocks_per_consensus_epoch = 250
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--chainlengths", dest="chainlengths", default="1000,5000,10000",
+                          help="Comma separated increasing chain lengths in SC blocks")
+        parser.add_option("--batchblocks", dest="batchblocks", type="int", default=100,
+                          help="Number of SC blocks forged for every referenced MC block")
+        parser.add_option("--batchtransactions", dest="batchtransactions", type="int", default=10,
+                          help="Number of transactions forged with every batch of SC blocks")
+        parser.add_option("--restarts", dest="restarts", type="int", default=3,
+                          help="Number of restarts for every chain length")
+        parser.add_option("--startdeadline", dest="startdeadline", type="int", default=600,
+                          help="Max time for the node to answer after a restart in secs")
+
+    def chain_lengths(self):
+        return [int(length) for length in self.options.chainlengths.split(",")]
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH), sc_node_configuration)
+        consensus_epochs = max(self.chain_lengths()) // self.blocks_per_consensus_epoch + 1
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network, 720 * 120 * consensus_epochs)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def restart(self):
+        """
+        Restart the SC node and wait for its first answer.
+
+        Output: time of the process start, time of the first block/best answer, times of the startup log markers
+        """
+        stop_sc_node(self.sc_nodes[0], 0)
+        log_path = get_sc_node_log_path(self.sc_nodes[0])
+        log_offset = os.path.getsize(log_path) if os.path.isfile(log_path) else 0
+
+        started_at = time.time()
+        self.sc_nodes[0] = start_sc_node(0, self.options.tmpdir)
+        answered_at = wait_for_sc_node_answer(self.sc_nodes[0], self.options.startdeadline)
+        return started_at, answered_at, read_log_markers(log_path, SC_NODE_STARTUP_LOG_MARKERS, log_offset)
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        chain_lengths = self.chain_lengths()
+        results = BenchmarkResults("cold_start", options, {
+            "chainLengths": chain_lengths, "batchBlocks": options.batchblocks,
+            "batchTransactions": options.batchtransactions, "restarts": options.restarts})
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        # Every batch spends the boxes created by the previous one
+        boxes = fan_out(sc_node, ft_box, options.batchtransactions, self.box_value, private_key=key) \
+            if options.batchtransactions > 0 else []
+
+        for chain_length in chain_lengths:
+            boxes = forge_chain(self.sc_nodes[0], mc_node, key, boxes, chain_length, options.batchblocks)
+            best = self.sc_nodes[0].block_best()["result"]
+            storages = StorageSampler(self.sc_nodes[0]).sample()
+
+            total_secs = []
+            for restart_index in range(options.restarts):
+                started_at, answered_at, markers = self.restart()
+                assert_equal(best["block"]["id"], self.sc_nodes[0].block_best()["result"]["block"]["id"],
+                             "Different best block after the restart.")
+                stages = [("jvmSecs", started_at, markers["applicationStarted"]),
+                          ("initializationSecs", markers["applicationStarted"], markers["restoreStarted"]),
+                          ("restoreSecs", markers["restoreStarted"], markers["restoreFinished"]),
+                          ("apiSecs", markers["restoreFinished"], answered_at)]
+                total_secs.append(answered_at - started_at)
+                results.add("restarts", chainLength=best["height"], restart=restart_index,
+                            totalSecs=total_secs[-1], storagesBytes=storages["totalBytes"],
+                            storages={name: storage["bytes"] for (name, storage) in storages["storages"].items()},
+                            **{name: end - start if start is not None and end is not None else None
+                               for (name, start, end) in stages})
+
+            results.add("coldStart", chainLength=best["height"], storagesBytes=storages["totalBytes"],
+                        totalSecs=latency_summary(total_secs))
+            results.set_for("startSecs", chain_length, latency_summary(total_secs))
+            logging.info("Chain of {0} blocks, {1} bytes of storages: restarted in {2:.1f} secs (median)".format(
+                best["height"], storages["totalBytes"], latency_summary(total_secs)["p50"]))
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkColdStart().main()
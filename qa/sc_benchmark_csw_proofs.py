@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import json
+import logging
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary, \
+    ProcessMemorySampler, start_new_sidechain
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519
+from SidechainTestFramework.sc_forging_util import advance_withdrawal_epochs
+from SidechainTestFramework.sc_load_generator import fan_out, send_forward_transfers
+from SidechainTestFramework.sc_wait_util import CSW_PROOFS_WAIT_DEADLINE
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import fail, assert_equal, assert_true, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import generate_next_blocks, get_sc_node_pids, get_csw_proofs_status
+
+"""
+Benchmark of the ceased sidechain withdrawal (CSW) proofs generation.
+
+Configuration:
+    Start 1 MC node. For every withdrawal epoch length of --epochlengths, a new sidechain with CSW enabled is created
+    with 1 SC node.
+
+Benchmark, for every withdrawal epoch length:
+    - Create --utxos ZenBoxes in the withdrawal epoch e, they are in the UTXO merkle tree of the certificate for e
+    - Submit the certificates for e and e+1, then send --fts forward transfers
+    - Disable the certificate submitter and mine MC blocks until the sidechain has ceased: the certificate for e is
+      the last active one, so the boxes of e are UTXO CSWs and the forward transfers after e are FT CSWs
+    - Request the CSW proofs of all the boxes, then sample the proofs status every --samplinginterval secs
+      with a single csw/cswProofsStatus request, timestamping the status changes of every box, together with the
+      SC node resident memory
+
+Results (JSON): "queue" series with the number of proofs per status over time, metrics with the proofs per second and
+the observed generation time per CSW type for every withdrawal epoch length.
+"""
+class SCBenchmarkCswProofs(SidechainTestFramework):
+    ft_amount = 100  # Zen
+    utxo_value = 10000000  # satoshi
+    csw_ft_amount = 1  # Zen
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--epochlengths", dest="epochlengths", default="10,20",
+                          help="Comma separated withdrawal epoch lengths, one sidechain for each")
+        parser.add_option("--utxos", dest="utxos", type="int", default=20,
+                          help="Number of ZenBoxes created for UTXO CSWs")
+        parser.add_option("--fts", dest="fts", type="int", default=20,
+                          help="Number of forward transfers for FT CSWs")
+        parser.add_option("--samplinginterval", dest="samplinginterval", type="float", default=0.5,
+                          help="Time between two proofs status samples in secs")
+
+    def setup_nodes(self):
+        # Set MC scproofqueuesize to 0 to avoid BatchVerifier processing delays
+        return start_nodes(1, self.options.tmpdir, extra_args=[['-scproofqueuesize=0']])
+
+    def sc_setup_chain(self):
+        # Every sidechain is created by run_test
+        pass
+
+    def sc_setup_network(self, split=False):
+        self.sc_nodes = []
+
+    def cease_sidechain_with_csw_boxes(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        sidechain_id = self.sc_nodes_bootstrap_info.sidechain_id
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(sidechain_id, mc_node, key.public_key_hex, self.ft_amount,
+                                      mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        utxo_boxes = fan_out(sc_node, ft_box, self.options.utxos, self.utxo_value, private_key=key) \
+            if self.options.utxos > 0 else []
+
+        advance_withdrawal_epochs(mc_node, self.sc_nodes, 2)
+
+        if self.options.fts > 0:
+            send_forward_transfers(mc_node, sidechain_id, [key.public_key_hex], self.csw_ft_amount,
+                                   mc_node.getnewaddress(), 1, self.options.fts)
+        sc_node.submitter_disableCertificateSubmitter()
+        while mc_node.getscinfo(sidechain_id)["items"][0]["state"] != "CEASED":
+            mc_node.generate(1)
+            generate_next_blocks(sc_node, "first node", 1, verbose=False)
+        assert_true(sc_node.csw_hasCeased()["result"]["state"], "Sidechain expected to be ceased.")
+        return utxo_boxes
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        options = self.options
+        epoch_lengths = [int(length) for length in options.epochlengths.split(",")]
+        results = BenchmarkResults("csw_proofs", options, {
+            "epochLengths": epoch_lengths, "utxos": options.utxos, "fts": options.fts})
+
+        for epoch_length in epoch_lengths:
+            sc_node_configuration = SCNodeConfiguration(
+                MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+            )
+            start_new_sidechain(self, SCNetworkConfiguration(
+                SCCreationInfo(mc_node, 100, epoch_length, csw_enabled=True), sc_node_configuration))
+            sc_node = self.sc_nodes[0]
+            utxo_boxes = self.cease_sidechain_with_csw_boxes()
+
+            box_ids = sc_node.csw_cswBoxIds()["result"]["cswBoxIds"]
+            csw_types = {box_id: sc_node.csw_cswInfo(json.dumps({"boxId": box_id}))["result"]["cswInfo"]["cswType"]
+                         for box_id in box_ids}
+            # The UTXO CSWs also include the other boxes of the wallet, e.g. the fan out change
+            for box in utxo_boxes:
+                assert_equal("UtxoCswData", csw_types.get(box["id"]), "CSW box not found: " + box["id"])
+            assert_equal(options.fts, list(csw_types.values()).count("ForwardTransferCswData"),
+                         "Different number of FT CSW boxes found.")
+            assert_true(len(box_ids) > 0, "No CSW boxes found.")
+            receiver_address = mc_node.getnewaddress()
+
+            started_at = {}
+            finished_at = {}
+            with ProcessMemorySampler(get_sc_node_pids()[0]) as sampler:
+                requested_at = time.time()
+                for box_id in box_ids:
+                    state = sc_node.csw_generateCswProof(json.dumps({"boxId": box_id,
+                                                                     "receiverAddress": receiver_address}))
+                    assert_equal("ProofGenerationStarted", state["result"]["state"],
+                                 "Different proof generation state found")
+                requests_secs = time.time() - requested_at
+
+                while True:
+                    proofs_status = get_csw_proofs_status(sc_node, box_ids)
+                    now = time.time()
+                    for box_status in proofs_status["proofsStatus"]:
+                        if box_status["status"] == "InProcess":
+                            started_at.setdefault(box_status["boxId"], now)
+                        elif box_status["status"] in ("Generated", "Absent"):
+                            finished_at.setdefault(box_status["boxId"], now)
+                    counts = proofs_status["statusCounts"]
+                    results.add("queue", epochLength=epoch_length, secs=now - requested_at,
+                                inQueue=counts.get("InQueue", 0), inProcess=counts.get("InProcess", 0),
+                                generated=counts.get("Generated", 0), absent=counts.get("Absent", 0),
+                                rssMb=sampler.samples[-1][1] / 1024 ** 2 if len(sampler.samples) > 0 else None)
+                    if proofs_status["completed"]:
+                        break
+                    if now - requested_at > CSW_PROOFS_WAIT_DEADLINE:
+                        fail("CSW proofs were not generated in {0} secs.".format(CSW_PROOFS_WAIT_DEADLINE))
+                    time.sleep(options.samplinginterval)
+
+            generated = proofs_status["statusCounts"].get("Generated", 0)
+            total_secs = max(finished_at.values(), default=requested_at) - requested_at
+            # Proofs are generated one at a time, so a box moving from InQueue to Generated between two samples
+            # has no observed generation time
+            generation_ms = {}
+            for (box_id, start) in started_at.items():
+                if box_id in finished_at:
+                    generation_ms.setdefault(csw_types[box_id], []).append((finished_at[box_id] - start) * 1000)
+
+            results.set_for("cswBoxes", epoch_length, len(box_ids))
+            results.set_for("cswTypes", epoch_length, {csw_type: list(csw_types.values()).count(csw_type)
+                                                       for csw_type in set(csw_types.values())})
+            results.set_for("generated", epoch_length, generated)
+            results.set_for("requestsSecs", epoch_length, requests_secs)
+            results.set_for("totalSecs", epoch_length, total_secs)
+            results.set_for("proofsPerSec", epoch_length, generated / total_secs if total_secs > 0 else None)
+            results.set_for("generationMs", epoch_length, {csw_type: latency_summary(values)
+                                                           for (csw_type, values) in generation_ms.items()})
+            results.set_for("peakRssMb", epoch_length, sampler.peak_rss_mb())
+            logging.info("Withdrawal epoch length {0}: {1} of {2} CSW proofs generated in {3:.1f} secs".format(
+                epoch_length, generated, len(box_ids), total_secs))
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkCswProofs().main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import logging
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary
+from SidechainTestFramework.sc_forging_util import get_best_mc_reference_height
+from SidechainTestFramework.sc_load_generator import send_forward_transfers
+from SidechainTestFramework.sc_wait_util import wait_until
+from httpCalls.wallet.balance import http_wallet_balance
+from httpCalls.wallet.createPrivateKey25519 import http_wallet_createPrivateKey25519
+from test_framework.util import assert_equal, start_nodes, websocket_port_by_mc_node_index
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks
+
+"""
+Benchmark of the SC ingestion of MC blocks full of forward transfers.
+
+Configuration:
+    Start 1 MC node and 1 SC node.
+
+Benchmark, for every one of --mcblocks MC blocks:
+    - Send --fttransactions MC transactions, each one with --ftoutputs forward transfers to the SC node wallet keys
+    - Mine the MC block
+    - Forge SC blocks until the MC block is referenced, measure the time from the MC block mined
+    - Wait for the SC wallet balance to include all the forward transfers, measure the time from the MC block mined
+
+Results (JSON): "blocks" series with the latencies of every MC block, latency summaries and the forward transfers
+per second ingested by the SC node.
+"""
+class SCBenchmarkForwardTransfers(SidechainTestFramework):
+    wallet_keys_count = 10
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--ftoutputs", dest="ftoutputs", type="int", default=100,
+                          help="Number of forward transfers of every MC transaction")
+        parser.add_option("--fttransactions", dest="fttransactions", type="int", default=10,
+                          help="Number of MC transactions with forward transfers of every MC block")
+        parser.add_option("--mcblocks", dest="mcblocks", type="int", default=5,
+                          help="Number of MC blocks with forward transfers")
+        parser.add_option("--ftamount", dest="ftamount", type="float", default=0.01,
+                          help="Amount of every forward transfer in Zen")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH), sc_node_configuration)
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        fts_per_block = options.ftoutputs * options.fttransactions
+        results = BenchmarkResults("forward_transfers", options, {
+            "ftOutputs": options.ftoutputs, "ftTransactions": options.fttransactions,
+            "mcBlocks": options.mcblocks, "ftAmount": options.ftamount})
+
+        public_keys = [http_wallet_createPrivateKey25519(sc_node) for _ in range(self.wallet_keys_count)]
+        mc_return_address = mc_node.getnewaddress()
+        ft_value = int(round(options.ftamount * 100000000))
+
+        reference_latencies = []
+        wallet_latencies = []
+        total_ingestion_secs = 0
+        for block_index in range(options.mcblocks):
+            balance = http_wallet_balance(sc_node)
+
+            start = time.time()
+            send_forward_transfers(mc_node, self.sc_nodes_bootstrap_info.sidechain_id, public_keys,
+                                   options.ftamount, mc_return_address, options.fttransactions, options.ftoutputs)
+            send_secs = time.time() - start
+            assert_equal(options.fttransactions, mc_node.getmempoolinfo()["size"],
+                         "Forward transfers expected to be added to MC mempool.")
+
+            mc_block_hash = mc_node.generate(1)[0]
+            mined_at = time.time()
+            mc_height = mc_node.getblockcount()
+            mc_block_size = mc_node.getblock(mc_block_hash)["size"]
+
+            sc_blocks_count = 0
+            while get_best_mc_reference_height(sc_node) < mc_height:
+                generate_next_blocks(sc_node, "first node", 1, verbose=False)
+                sc_blocks_count += 1
+            referenced_at = time.time()
+
+            wait_until(lambda: http_wallet_balance(sc_node) >= balance + fts_per_block * ft_value,
+                       deadline=120, description="wallet balance with the forward transfers")
+            wallet_updated_at = time.time()
+
+            reference_latencies.append((referenced_at - mined_at) * 1000)
+            wallet_latencies.append((wallet_updated_at - mined_at) * 1000)
+            total_ingestion_secs += wallet_updated_at - mined_at
+            results.add("blocks", mcHeight=mc_height, mcBlockSize=mc_block_size, forwardTransfers=fts_per_block,
+                        sendSecs=send_secs, scBlocks=sc_blocks_count,
+                        referenceLatencyMs=reference_latencies[-1], walletLatencyMs=wallet_latencies[-1])
+            logging.info("MC block {0} with {1} forward transfers referenced in {2:.0f} ms, "
+                         "wallet updated in {3:.0f} ms".format(mc_block_hash, fts_per_block,
+                                                               reference_latencies[-1], wallet_latencies[-1]))
+
+        results.set("referenceLatencyMs", latency_summary(reference_latencies))
+        results.set("walletLatencyMs", latency_summary(wallet_latencies))
+        results.set("forwardTransfersPerSec", fts_per_block * options.mcblocks / total_ingestion_secs)
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkForwardTransfers().main()
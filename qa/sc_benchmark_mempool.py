@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+import json
+import logging
+import math
+import random
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData
+from SidechainTestFramework.sc_load_generator import fan_out, get_error_reason
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.transaction.allTransactions import allTransactionsDigest
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_equal, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks
+
+"""
+Benchmark of the SC memory pool admission, eviction and forger transactions selection.
+
+Configuration:
+    Start 1 MC node and 1 SC node with a small memory pool (--mempoolmaxsize).
+
+Benchmark:
+    - Create enough boxes to overfill the memory pool (--overfill times its size)
+    - Build offline one transaction per box, with the fee taken from the chosen distribution (--feedistribution):
+      constant, uniform, increasing (every transaction evicts the cheapest ones once the pool is full)
+      or decreasing (every transaction is rejected once the pool is full)
+    - Send the transactions one by one and measure each sendTransaction latency as the pool grows,
+      the pool content is sampled every --samplinginterval transactions
+    - Forge --forgedblocks blocks from the full pool and measure the forging time
+
+Results (JSON): "admission" series with the latency of every transaction, "mempool" series with the pool size,
+"forging" series with the forging time of every block, latency summaries of the fill and full pool phases.
+"""
+class SCBenchmarkMempool(SidechainTestFramework):
+    ft_amount = 1000  # Zen
+    box_value = 1000000  # satoshi
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--mempoolmaxsize", dest="mempoolmaxsize", type="int", default=2,
+                          help="SC memory pool max size in MB")
+        parser.add_option("--overfill", dest="overfill", type="float", default=1.5,
+                          help="Size of the sent transactions relatively to the memory pool max size")
+        parser.add_option("--feedistribution", dest="feedistribution", default="uniform",
+                          help="Fee distribution: constant, uniform, increasing or decreasing")
+        parser.add_option("--minfee", dest="minfee", type="int", default=100, help="Min fee in satoshi")
+        parser.add_option("--maxfee", dest="maxfee", type="int", default=10000, help="Max fee in satoshi")
+        parser.add_option("--samplinginterval", dest="samplinginterval", type="int", default=100,
+                          help="Number of transactions between memory pool samples")
+        parser.add_option("--forgedblocks", dest="forgedblocks", type="int", default=3,
+                          help="Number of blocks forged from the full memory pool")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0))),
+            automatic_fee_computation=False,
+            mempool_max_size=self.options.mempoolmaxsize,
+            max_fee=self.options.maxfee
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH), sc_node_configuration)
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def get_fees(self, count):
+        min_fee, max_fee = self.options.minfee, self.options.maxfee
+        distribution = self.options.feedistribution
+        if distribution == "constant":
+            return [min_fee] * count
+        if distribution == "uniform":
+            rnd = random.Random(count)
+            return [rnd.randint(min_fee, max_fee) for _ in range(count)]
+        step = (max_fee - min_fee) / max(count - 1, 1)
+        fees = [int(min_fee + i * step) for i in range(count)]
+        if distribution == "increasing":
+            return fees
+        if distribution == "decreasing":
+            return fees[::-1]
+        raise AssertionError("Unknown fee distribution " + distribution)
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        max_size_bytes = options.mempoolmaxsize * 1024 * 1024
+        results = BenchmarkResults("mempool", options, {
+            "mempoolMaxSizeMb": options.mempoolmaxsize, "overfill": options.overfill,
+            "feeDistribution": options.feedistribution, "minFee": options.minfee, "maxFee": options.maxfee})
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+
+        # All the transactions have 1 input and 1 output, so the same size
+        sample_tx = CoreTransaction([ft_box["id"]], [ZenBoxData(key.public_key_hex, self.box_value)]).sign(key)
+        tx_size = len(sample_tx.bytes())
+        transactions_count = int(math.ceil(max_size_bytes * options.overfill / tx_size))
+        logging.info("Memory pool of {0} bytes, {1} transactions of {2} bytes to send".format(
+            max_size_bytes, transactions_count, tx_size))
+
+        boxes = fan_out(sc_node, ft_box, transactions_count, self.box_value, private_key=key)
+
+        start = time.time()
+        fees = self.get_fees(transactions_count)
+        transactions = [CoreTransaction([box["id"]], [ZenBoxData(key.public_key_hex, self.box_value - fee)],
+                                        fee).sign(key).to_hex()
+                        for (box, fee) in zip(boxes, fees)]
+        results.set("buildSecs", time.time() - start)
+
+        fill_latencies = []
+        full_latencies = []
+        rejections = {}
+        accepted_bytes = 0
+        for (index, (transaction, fee)) in enumerate(zip(transactions, fees)):
+            pool_full = accepted_bytes + tx_size > max_size_bytes
+            sent_at = time.time()
+            response = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": transaction}))
+            latency_ms = (time.time() - sent_at) * 1000
+            accepted = "result" in response
+            if accepted:
+                accepted_bytes += tx_size
+                (full_latencies if pool_full else fill_latencies).append(latency_ms)
+            else:
+                reason = get_error_reason(response)
+                rejections[reason] = rejections.get(reason, 0) + 1
+            results.add("admission", index=index, fee=fee, feeRate=fee * 1000 // tx_size, latencyMs=latency_ms,
+                        accepted=accepted, poolFull=pool_full)
+
+            if index % options.samplinginterval == 0 or index == transactions_count - 1:
+                mempool_size = allTransactionsDigest(sc_node)["size"]
+                results.add("mempool", submitted=index + 1, transactions=mempool_size,
+                            bytes=mempool_size * tx_size)
+
+        results.set("fillLatencyMs", latency_summary(fill_latencies))
+        results.set("fullPoolLatencyMs", latency_summary(full_latencies))
+        results.set("rejections", rejections)
+        results.set("acceptedTransactions", len(fill_latencies) + len(full_latencies))
+
+        mempool_size = allTransactionsDigest(sc_node)["size"]
+        assert_equal(True, mempool_size * tx_size <= max_size_bytes, "Memory pool exceeds its max size")
+        results.set("finalMempoolTransactions", mempool_size)
+
+        for block_index in range(options.forgedblocks):
+            forge_result = sc_node.block_generateMany(json.dumps({"number": 1}))["result"]
+            mempool_size_after = allTransactionsDigest(sc_node)["size"]
+            results.add("forging", block=block_index, forgingTimeMs=forge_result["blocks"][0]["forgingTime"],
+                        transactions=mempool_size - mempool_size_after, mempoolTransactions=mempool_size)
+            mempool_size = mempool_size_after
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkMempool().main()
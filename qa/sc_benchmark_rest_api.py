@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import json
+import logging
+import threading
+import time
+from collections import Counter
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData
+from SidechainTestFramework.sc_load_generator import ApiConnectionPool, fan_out, forge_until_mempool_is_empty, \
+    get_error_reason
+from SidechainTestFramework.sidechainauthproxy import SCAPIException
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_true, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks
+
+"""
+Benchmark of the SC REST API latency with an increasing number of concurrent clients.
+
+Configuration:
+    Start 1 MC node and 1 SC node. The SC node wallet owns --walletboxes boxes and the memory pool contains
+    --mempooltransactions transactions, so the wallet and memory pool endpoints return non trivial responses.
+
+Benchmark, for every endpoint of --endpoints and every concurrency level of --concurrency:
+    - Start as many clients as the concurrency level, each one with its own API connection from a pool,
+      every client sends --requests requests back to back
+    - Measure the latency of every request and count the errors by reason. A request taking at least the configured
+      REST API timeout (--restapitimeout) is counted as a timeout: the node waits for the node view actor answer
+      at most that long
+    - After a level of transaction/sendCoinsToAddress requests the memory pool is forged, so the next level can spend
+      the change boxes: the initial memory pool transactions are forged too, so that endpoint should be the last one
+
+    The throughput stops growing with the concurrency when the requests are serialized by the node view actor:
+    the first level with less than --saturationgain more requests per second than the previous one is reported
+    as the saturation level of the endpoint.
+
+Results (JSON): "requests" series with the latency percentiles, error and timeout rates and the throughput of every
+endpoint and concurrency level, also as "latencyMs" and "requestsPerSec" metrics, "saturation" metric with the
+saturation level of every endpoint.
+"""
+class SCBenchmarkRestApi(SidechainTestFramework):
+    ft_amount = 1000  # Zen
+    box_value = 1000000  # satoshi
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--endpoints", dest="endpoints",
+                          default="block/best,wallet/allBoxes,transaction/allTransactions,"
+                                  "transaction/sendCoinsToAddress",
+                          help="Comma separated endpoints: block/best, wallet/allBoxes, transaction/allTransactions, "
+                               "transaction/sendCoinsToAddress")
+        parser.add_option("--concurrency", dest="concurrency", default="1,4,16,64",
+                          help="Comma separated increasing numbers of concurrent clients")
+        parser.add_option("--requests", dest="requests", type="int", default=20,
+                          help="Number of requests sent by every client for every concurrency level")
+        parser.add_option("--walletboxes", dest="walletboxes", type="int", default=2000,
+                          help="Number of boxes in the SC node wallet")
+        parser.add_option("--mempooltransactions", dest="mempooltransactions", type="int", default=500,
+                          help="Number of transactions in the SC node memory pool")
+        parser.add_option("--saturationgain", dest="saturationgain", type="float", default=0.1,
+                          help="Min relative throughput gain of a concurrency level over the previous one")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH), sc_node_configuration)
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def get_request(self, endpoint, public_key):
+        """
+        Output: callable sending a request to the endpoint with the given API connection
+        """
+        if endpoint == "block/best":
+            return lambda api_connection: api_connection.block_best()
+        if endpoint == "wallet/allBoxes":
+            return lambda api_connection: api_connection.wallet_allBoxes(json.dumps({}))
+        if endpoint == "transaction/allTransactions":
+            return lambda api_connection: api_connection.transaction_allTransactions(json.dumps({"format": True}))
+        if endpoint == "transaction/sendCoinsToAddress":
+            request = json.dumps({"outputs": [{"publicKey": public_key, "value": self.box_value // 2}], "fee": 0})
+            return lambda api_connection: api_connection.transaction_sendCoinsToAddress(request)
+        raise AssertionError("Unknown endpoint " + endpoint)
+
+    def run_level(self, pool, request, concurrency):
+        """
+        Send the requests of concurrency clients.
+
+        Output: latencies in ms of all the requests, error reason of the failed ones, duration in secs
+        """
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def client(client_index):
+            with pool.connection(client_index) as api_connection:
+                for _ in range(self.options.requests):
+                    sent_at = time.time()
+                    try:
+                        response = request(api_connection)
+                        reason = None if "result" in response else get_error_reason(response)
+                    except SCAPIException as e:
+                        reason = "HTTP error: " + str(e.error).splitlines()[0] if e.error else "HTTP error"
+                    except Exception as e:
+                        reason = "{0}: {1}".format(type(e).__name__, e)
+                    latency_ms = (time.time() - sent_at) * 1000
+                    with lock:
+                        latencies.append(latency_ms)
+                        if reason is not None:
+                            errors.append(reason)
+
+        start = time.time()
+        threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors, time.time() - start
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        endpoints = options.endpoints.split(",")
+        concurrency_levels = [int(level) for level in options.concurrency.split(",")]
+        timeout_ms = int(options.restapitimeout) * 1000
+        results = BenchmarkResults("rest_api", options, {
+            "endpoints": endpoints, "concurrency": concurrency_levels, "requests": options.requests,
+            "walletBoxes": options.walletboxes, "mempoolTransactions": options.mempooltransactions,
+            "restApiTimeoutSecs": int(options.restapitimeout)})
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        boxes = fan_out(sc_node, ft_box, options.walletboxes + options.mempooltransactions, self.box_value,
+                        private_key=key)
+        for box in boxes[options.walletboxes:]:
+            tx = CoreTransaction([box["id"]], [ZenBoxData(key.public_key_hex, box["value"])]).sign(key)
+            response = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+            assert_true("result" in response, "Transaction was rejected: " + json.dumps(response))
+
+        # Every client keeps its own connection for all the requests of a level
+        pool = ApiConnectionPool([sc_node] * max(concurrency_levels), connections_per_node=1)
+        saturation = {}
+        for endpoint in endpoints:
+            request = self.get_request(endpoint, key.public_key_hex)
+            previous_throughput = None
+            for concurrency in concurrency_levels:
+                latencies, errors, duration = self.run_level(pool, request, concurrency)
+                throughput = len(latencies) / duration
+                timeouts = len([latency for latency in latencies if latency >= timeout_ms])
+                summary = latency_summary(latencies)
+                results.add("requests", endpoint=endpoint, concurrency=concurrency, requests=len(latencies),
+                            durationSecs=duration, requestsPerSec=throughput, latencyMs=summary,
+                            errorRate=len(errors) / float(len(latencies)),
+                            timeoutRate=timeouts / float(len(latencies)), errors=dict(Counter(errors)))
+                level = "{0}-{1}".format(endpoint, concurrency)
+                results.set_for("latencyMs", level, summary)
+                results.set_for("requestsPerSec", level, throughput)
+                logging.info("{0} with {1} clients: {2:.1f} req/sec, p50 {3:.0f} ms, p95 {4:.0f} ms, p99 {5:.0f} ms, "
+                             "{6} errors, {7} timeouts".format(endpoint, concurrency, throughput, summary["p50"],
+                                                               summary["p95"], summary["p99"], len(errors), timeouts))
+
+                if endpoint not in saturation and previous_throughput is not None and \
+                        throughput < previous_throughput * (1 + options.saturationgain):
+                    saturation[endpoint] = concurrency
+                previous_throughput = throughput
+
+                if endpoint == "transaction/sendCoinsToAddress":
+                    forge_until_mempool_is_empty(sc_node)
+
+        results.set("saturation", saturation)
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkRestApi().main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+import logging
+import os
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, StorageSampler, \
+    SC_NODE_STARTUP_LOG_MARKERS, get_sc_node_log_path, read_log_markers, wait_for_sc_node_answer
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519
+from SidechainTestFramework.sc_load_generator import fan_out, forge_chain
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_equal, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, start_sc_node, stop_sc_node, \
+    generate_next_blocks, connect_sc_nodes, sync_sc_blocks, launch_db_tool
+
+"""
+Benchmark of the SC node recovery after a rollback of its storages, e.g. the cost of a crash in the middle of the
+storages update, see sc_storage_recovery_without_csw.py.
+
+Configuration:
+    Start 1 MC node and 2 SC nodes connected to each other.
+    First SC node forges a chain of --chainlength blocks, second SC node is rolled back.
+
+Benchmark, for every number of versions K of --rollbackversions:
+    - Stop the second SC node and roll back every storage of --storages by K versions with the db tool: the time of
+      the versionsList and rollback commands is measured per storage, together with the lastVersionID command
+      as the baseline cost of starting the db tool and opening the storage
+    - Restart the node and measure the recovery time: from the process start to the first block/best answer,
+      split in stages by the node log lines as in sc_benchmark_cold_start.py
+    - Connect the node to the first one and measure the time to resync the lost blocks
+
+Results (JSON): "storages" series with the db tool commands time of every storage, "recoveries" series with the
+restart stages, the recovered height and the resync time for every K, the restart and resync times also as metrics.
+"""
+class SCBenchmarkRollback(SidechainTestFramework):
+    ft_amount = 100  # Zen
+    box_value = 1000000  # satoshi
+    # Like sc_node_response_along_sync: 8 consensus epochs of timestamp rewind to forge 2000 blocks
+    blocks_per_consensus_epoch = 250
+    # Storages of the SimpleApp, see SimpleAppModule
+    custom_storage_names = "appState1,appState2,appWallet1,appWallet2"
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--chainlength", dest="chainlength", type="int", default=2000,
+                          help="Chain length in SC blocks")
+        parser.add_option("--batchblocks", dest="batchblocks", type="int", default=100,
+                          help="Number of SC blocks forged for every referenced MC block")
+        parser.add_option("--batchtransactions", dest="batchtransactions", type="int", default=10,
+                          help="Number of transactions forged with every batch of SC blocks")
+        parser.add_option("--rollbackversions", dest="rollbackversions", default="1,10,100",
+                          help="Comma separated numbers of versions to roll back")
+        parser.add_option("--storages", dest="storages",
+                          default="history,state,stateForgerBox,wallet,walletTransaction,walletForgingStake,"
+                                  "appState1,appState2,appWallet1,appWallet2",
+                          help="Comma separated names of the storages to roll back")
+        parser.add_option("--startdeadline", dest="startdeadline", type="int", default=600,
+                          help="Max time for the node to answer after a restart in secs")
+        parser.add_option("--syncdeadline", dest="syncdeadline", type="int", default=600,
+                          help="Max time for the node to resync after a restart in secs")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH),
+                                         sc_node_configuration, sc_node_configuration)
+        consensus_epochs = self.options.chainlength // self.blocks_per_consensus_epoch + 1
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network, 720 * 120 * consensus_epochs)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(2, self.options.tmpdir)
+
+    def timed_db_tool(self, storage, command_name, json_parameters):
+        start = time.time()
+        output = launch_db_tool(self.sc_nodes[1].dataDir, self.custom_storage_names, command_name,
+                                dict(json_parameters, storage=storage))
+        return output, time.time() - start
+
+    def rollback_storage(self, storage, versions):
+        """
+        Roll back the storage of the stopped second SC node by the given number of versions.
+
+        Output: dict with the time in secs of the db tool commands
+        """
+        _, baseline_secs = self.timed_db_tool(storage, "lastVersionID", {})
+        output, versions_list_secs = self.timed_db_tool(storage, "versionsList",
+                                                        {"numberOfVersionToRetrieve": versions})
+        rollback_version = output["versionsList"][-1]
+        output, rollback_secs = self.timed_db_tool(storage, "rollback", {"versionToRollback": rollback_version})
+        assert_equal(rollback_version, output["versionCurrent"], "Storage {0} was not rolled back.".format(storage))
+        return {"lastVersionIdSecs": baseline_secs, "versionsListSecs": versions_list_secs,
+                "rollbackSecs": rollback_secs, "rollbackOverBaselineSecs": rollback_secs - baseline_secs}
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        rollback_versions = [int(versions) for versions in options.rollbackversions.split(",")]
+        storages = options.storages.split(",")
+        results = BenchmarkResults("rollback", options, {
+            "chainLength": options.chainlength, "rollbackVersions": rollback_versions, "storages": storages})
+
+        connect_sc_nodes(sc_node, 1)
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        boxes = fan_out(sc_node, ft_box, options.batchtransactions, self.box_value, private_key=key) \
+            if options.batchtransactions > 0 else []
+        forge_chain(sc_node, mc_node, key, boxes, options.chainlength, options.batchblocks)
+        sync_sc_blocks(self.sc_nodes, options.syncdeadline)
+        tip = sc_node.block_best()["result"]
+
+        for versions in rollback_versions:
+            stop_sc_node(self.sc_nodes[1], 1)
+            storages_sample = StorageSampler(self.sc_nodes[1]).sample()
+            rollback_secs = 0
+            for storage in storages:
+                timings = self.rollback_storage(storage, versions)
+                rollback_secs += timings["rollbackSecs"]
+                results.add("storages", versions=versions, storage=storage,
+                            bytes=storages_sample["storages"].get(storage, {}).get("bytes"), **timings)
+
+            log_path = get_sc_node_log_path(self.sc_nodes[1])
+            log_offset = os.path.getsize(log_path) if os.path.isfile(log_path) else 0
+            started_at = time.time()
+            self.sc_nodes[1] = start_sc_node(1, options.tmpdir)
+            answered_at = wait_for_sc_node_answer(self.sc_nodes[1], options.startdeadline)
+            markers = read_log_markers(log_path, SC_NODE_STARTUP_LOG_MARKERS, log_offset)
+            recovered_height = self.sc_nodes[1].block_best()["result"]["height"]
+
+            connect_sc_nodes(self.sc_nodes[1], 0)
+            connected_at = time.time()
+            sync_sc_blocks(self.sc_nodes, options.syncdeadline)
+            resync_secs = time.time() - connected_at
+            assert_equal(tip["block"]["id"], self.sc_nodes[1].block_best()["result"]["block"]["id"],
+                         "Node was not resynchronized.")
+
+            results.add("recoveries", versions=versions, storagesRollbackSecs=rollback_secs,
+                        recoveredHeight=recovered_height, lostBlocks=tip["height"] - recovered_height,
+                        startSecs=answered_at - started_at,
+                        restoreSecs=markers["restoreFinished"] - markers["restoreStarted"]
+                        if None not in (markers["restoreStarted"], markers["restoreFinished"]) else None,
+                        resyncSecs=resync_secs)
+            results.set_for("startSecs", versions, answered_at - started_at)
+            results.set_for("resyncSecs", versions, resync_secs)
+            logging.info("Rollback of {0} versions: storages rolled back in {1:.1f} secs, node restarted at height "
+                         "{2} in {3:.1f} secs and resynchronized in {4:.1f} secs".format(
+                             versions, rollback_secs, recovered_height, answered_at - started_at, resync_secs))
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkRollback().main()
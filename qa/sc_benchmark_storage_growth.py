@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import json
+import logging
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, StorageSampler
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData
+from SidechainTestFramework.sc_load_generator import fan_out
+from httpCalls.block.findBlockByID import http_block_findById
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_true, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks, \
+    get_sc_node_pids
+
+"""
+Benchmark of the SC node storages growth and write amplification.
+
+Configuration:
+    Start 1 MC node and 1 SC node. The sidechain has CSW enabled, so the node also keeps the UTXO merkle tree storage
+    (see SidechainUtxoMerkleTreeProviderCSWEnabled), unless --cswdisabled is given.
+
+Benchmark:
+    - Forge --blocks blocks one at a time, each one with --blocktransactions transactions, a MC block is referenced
+      every --sampleinterval blocks
+    - Every --sampleinterval blocks, sample the on-disk bytes and files count of every storage of the node
+      blockchain directory and the bytes written by the node process (/proc/<pid>/io)
+    - The bytes per block of an interval are the storages growth divided by the forged blocks, the write
+      amplification is the ratio between the bytes written by the process and the bytes of the forged blocks.
+      The growth of the node log directory is subtracted from the bytes written by the process, see StorageSampler
+
+Results (JSON): "samples" series with the size and files count of every storage, "intervals" series with the bytes
+per block of every storage and the write amplification of every interval, overall bytes per block and write
+amplification.
+"""
+class SCBenchmarkStorageGrowth(SidechainTestFramework):
+    ft_amount = 100  # Zen
+    box_value = 1000000  # satoshi
+    # Like sc_node_response_along_sync: 8 consensus epochs of timestamp rewind to forge 2000 blocks
+    blocks_per_consensus_epoch = 250
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--blocks", dest="blocks", type="int", default=2000, help="Number of forged blocks")
+        parser.add_option("--blocktransactions", dest="blocktransactions", type="int", default=10,
+                          help="Number of transactions of every block")
+        parser.add_option("--sampleinterval", dest="sampleinterval", type="int", default=100,
+                          help="Number of blocks between two storage samples")
+        parser.add_option("--cswdisabled", dest="cswdisabled", action="store_true", default=False,
+                          help="Create the sidechain with CSW disabled, without the UTXO merkle tree storage")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH,
+                                                        csw_enabled=not self.options.cswdisabled),
+                                         sc_node_configuration)
+        consensus_epochs = self.options.blocks // self.blocks_per_consensus_epoch + 1
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network, 720 * 120 * consensus_epochs)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        results = BenchmarkResults("storage_growth", options, {
+            "blocks": options.blocks, "blockTransactions": options.blocktransactions,
+            "sampleInterval": options.sampleinterval, "cswEnabled": not options.cswdisabled})
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        # Every block spends the boxes created by the previous one
+        boxes = fan_out(sc_node, ft_box, options.blocktransactions, self.box_value, private_key=key) \
+            if options.blocktransactions > 0 else []
+
+        sampler = StorageSampler(sc_node, get_sc_node_pids()[0])
+        first = previous = sampler.sample()
+        total_blocks_bytes = 0
+        forged_blocks = 0
+        while forged_blocks < options.blocks:
+            mc_node.generate(1)
+            interval_blocks_bytes = 0
+            interval_blocks = min(options.sampleinterval, options.blocks - forged_blocks)
+            for _ in range(interval_blocks):
+                transactions = [CoreTransaction([box["id"]], [ZenBoxData(key.public_key_hex, box["value"])]).sign(key)
+                                for box in boxes]
+                for tx in transactions:
+                    response = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+                    assert_true("result" in response, "Transaction was rejected: " + json.dumps(response))
+                boxes = [tx.new_boxes()[0] for tx in transactions]
+                block_id = generate_next_blocks(sc_node, "first node", 1, verbose=False)[0]
+                interval_blocks_bytes += len(http_block_findById(sc_node, block_id)["blockHex"]) // 2
+            forged_blocks += interval_blocks
+            total_blocks_bytes += interval_blocks_bytes
+
+            current = sampler.sample()
+            growth = sampler.growth(previous, current)
+            results.add("samples", blocks=forged_blocks, totalBytes=current["totalBytes"],
+                        storages=current["storages"], writtenBytes=current["io"]["write_bytes"]
+                        if current["io"] is not None else None)
+            results.add("intervals", blocks=forged_blocks, blocksBytes=interval_blocks_bytes,
+                        bytesPerBlock=growth["totalBytes"] / float(interval_blocks),
+                        storagesBytesPerBlock={name: value / float(interval_blocks)
+                                               for (name, value) in growth["storagesBytes"].items()},
+                        writtenBytes=growth["writtenBytes"], logBytes=growth["logBytes"],
+                        writeAmplification=growth["writtenBytes"] / float(interval_blocks_bytes)
+                        if growth["writtenBytes"] is not None else None)
+            logging.info("{0} blocks: storages {1} bytes, {2:.0f} bytes per block in the last {3} blocks".format(
+                forged_blocks, current["totalBytes"], growth["totalBytes"] / float(interval_blocks), interval_blocks))
+            previous = current
+
+        growth = sampler.growth(first, previous)
+        results.set("blocksBytes", total_blocks_bytes)
+        results.set("bytesPerBlock", growth["totalBytes"] / float(forged_blocks))
+        results.set("storagesBytesPerBlock", {name: value / float(forged_blocks)
+                                              for (name, value) in growth["storagesBytes"].items()})
+        results.set("writeAmplification", growth["writtenBytes"] / float(total_blocks_bytes)
+                    if growth["writtenBytes"] is not None else None)
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkStorageGrowth().main()
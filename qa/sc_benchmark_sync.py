@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+import logging
+import os
+import shutil
+import time
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary, \
+    ProcessMemorySampler
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519
+from SidechainTestFramework.sc_load_generator import fan_out, forge_chain
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import fail, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, start_sc_node, stop_sc_node, \
+    generate_next_blocks, connect_sc_nodes, get_sc_node_pids, wait_for_sc_node_initialization
+
+"""
+Benchmark of the chain synchronization of a new SC node.
+
+Configuration:
+    Start 1 MC node and 2 SC nodes not connected to each other.
+    First SC node forges the chain, second SC node is restarted with an empty blockchain directory for every sync.
+
+Benchmark, for every chain length of --chainlengths (in blocks, increasing):
+    - Extend the chain of the first SC node up to the chain length, by batches of --batchblocks SC blocks:
+      every batch references a new MC block and includes --batchtransactions transactions
+    - Restart the second SC node with an empty blockchain and connect it to the first one
+    - Poll the best block of the second SC node every --samplinginterval secs until it reaches the tip of the first
+      one, measuring the latency of every block/best request and the SC node resident memory meanwhile
+
+Results (JSON): "progress" series with the height of the syncing node over time, "sync" series with the blocks
+per second, time to tip, peak resident memory and API latency summary for every chain length, the first three
+also as metrics.
+"""
+class SCBenchmarkSync(SidechainTestFramework):
+    ft_amount = 100  # Zen
+    box_value = 1000000  # satoshi
+    # Like sc_node_response_along_sync: 8 consensus epochs of timestamp rewind to forge 2000 blocks
+    blocks_per_consensus_epoch = 250
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--chainlengths", dest="chainlengths", default="2000,5000,10000",
+                          help="Comma separated increasing chain lengths in SC blocks, one sync for each")
+        parser.add_option("--batchblocks", dest="batchblocks", type="int", default=100,
+                          help="Number of SC blocks forged for every referenced MC block")
+        parser.add_option("--batchtransactions", dest="batchtransactions", type="int", default=10,
+                          help="Number of transactions forged with every batch of SC blocks")
+        parser.add_option("--samplinginterval", dest="samplinginterval", type="float", default=0.5,
+                          help="Time between two best block requests to the syncing node in secs")
+        parser.add_option("--syncdeadline", dest="syncdeadline", type="int", default=3600,
+                          help="Max time for a sync in secs")
+
+    def chain_lengths(self):
+        return [int(length) for length in self.options.chainlengths.split(",")]
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH),
+                                         sc_node_configuration, sc_node_configuration)
+        consensus_epochs = max(self.chain_lengths()) // self.blocks_per_consensus_epoch + 1
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network, 720 * 120 * consensus_epochs)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(2, self.options.tmpdir)
+
+    def restart_with_empty_blockchain(self):
+        stop_sc_node(self.sc_nodes[1], 1)
+        shutil.rmtree(os.path.join(self.options.tmpdir, "sc_node1", "blockchain"))
+        self.sc_nodes[1] = start_sc_node(1, self.options.tmpdir)
+        wait_for_sc_node_initialization(self.sc_nodes)
+        return self.sc_nodes[1]
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        chain_lengths = self.chain_lengths()
+        results = BenchmarkResults("sync", options, {
+            "chainLengths": chain_lengths, "batchBlocks": options.batchblocks,
+            "batchTransactions": options.batchtransactions})
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        # Every batch spends the boxes created by the previous one
+        boxes = fan_out(sc_node, ft_box, options.batchtransactions, self.box_value, private_key=key) \
+            if options.batchtransactions > 0 else []
+
+        for chain_length in chain_lengths:
+            start = time.time()
+            boxes = forge_chain(sc_node, mc_node, key, boxes, chain_length, options.batchblocks)
+            height = sc_node.block_best()["result"]["height"]
+            tip = sc_node.block_best()["result"]["block"]["id"]
+            logging.info("Chain of {0} blocks built in {1:.0f} secs".format(height, time.time() - start))
+
+            syncing_node = self.restart_with_empty_blockchain()
+            start_height = syncing_node.block_best()["result"]["height"]
+            api_latencies = []
+            with ProcessMemorySampler(get_sc_node_pids()[1]) as sampler:
+                connect_sc_nodes(sc_node, 1)
+                connected_at = time.time()
+                while True:
+                    sent_at = time.time()
+                    best = syncing_node.block_best()["result"]
+                    now = time.time()
+                    api_latencies.append((now - sent_at) * 1000)
+                    results.add("progress", chainLength=height, secs=now - connected_at, height=best["height"],
+                                rssMb=sampler.samples[-1][1] / 1024 ** 2 if len(sampler.samples) > 0 else None)
+                    if best["block"]["id"] == tip:
+                        break
+                    if now - connected_at > options.syncdeadline:
+                        fail("Node was not synchronized in {0} secs.".format(options.syncdeadline))
+                    time.sleep(options.samplinginterval)
+            time_to_tip = now - connected_at
+
+            blocks_per_sec = (height - start_height) / time_to_tip
+            results.add("sync", chainLength=height, timeToTipSecs=time_to_tip, blocksPerSec=blocks_per_sec,
+                        peakRssMb=sampler.peak_rss_mb(), apiLatencyMs=latency_summary(api_latencies))
+            results.set_for("timeToTipSecs", chain_length, time_to_tip)
+            results.set_for("blocksPerSec", chain_length, blocks_per_sec)
+            results.set_for("peakRssMb", chain_length, sampler.peak_rss_mb())
+            logging.info("{0} blocks synchronized in {1:.1f} secs: {2:.1f} blocks/sec, block/best p95 {3:.0f} ms"
+                         .format(height - start_height, time_to_tip, blocks_per_sec,
+                                 latency_summary(api_latencies)["p95"]))
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkSync().main()
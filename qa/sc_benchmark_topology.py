@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+import json
+import logging
+import random
+import time
+
+import psutil
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData
+from SidechainTestFramework.sc_load_generator import fan_out
+from SidechainTestFramework.sc_topology import TOPOLOGIES, topology_edges, topology_hops, connect_sc_topology, \
+    small_heap_jvm_options
+from SidechainTestFramework.sc_wait_util import wait_until
+from SidechainTestFramework.websocket_client import WebsocketClient, WebsocketEventListener
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_true, start_nodes, websocket_port_by_mc_node_index, \
+    forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks, \
+    get_sc_node_pids, get_sc_ws_urls, sync_sc_blocks
+
+"""
+Benchmark of the block and transaction propagation in a large SC network (10 to 50 nodes) on a single machine.
+
+Configuration:
+    Start 1 MC node and --nodes SC nodes with a max heap of --maxheap MB each (see sc_topology).
+    Only the first SC node is a forger, certificate submitter and signer, so the other ones never load the
+    proving keys.
+    The nodes are connected in parallel as a --topology graph: line, ring, star, mesh or random-regular with
+    --degree peers for every node.
+
+Benchmark:
+    - Measure the time to connect all the nodes
+    - Blocks: forge --blocks blocks on the first SC node, one at a time, and listen for the UPDATE_TIP_EVENT of
+      every node on its websocket server: the propagation latency of a node is the time between the tip event of
+      the forger and its own one
+    - Transactions: send --transactions transactions, one at a time, to a random node and listen for the
+      MEMPOOL_CHANGED_EVENT with the transaction on every node: the propagation latency of a node is the time
+      between the event of the receiving node and its own one
+    - Sample the total resident memory of the SC nodes
+
+Results (JSON): "blocks" and "transactions" series with the latency of every node, with the number of hops from the
+origin node, "blockHops" and "transactionHops" series with the latency summary for every number of hops,
+latency summaries and total memory as metrics.
+"""
+class SCBenchmarkTopology(SidechainTestFramework):
+    ft_amount = 100  # Zen
+    box_value = 1000000  # satoshi
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--nodes", dest="nodes", type="int", default=20, help="Number of SC nodes")
+        parser.add_option("--topology", dest="topology", default="random-regular",
+                          help="SC network topology: " + ", ".join(TOPOLOGIES))
+        parser.add_option("--degree", dest="degree", type="int", default=4,
+                          help="Number of peers of every node in the random-regular topology")
+        parser.add_option("--seed", dest="seed", type="int", default=0,
+                          help="Seed of the random-regular topology and of the transactions receivers")
+        parser.add_option("--maxheap", dest="maxheap", type="int", default=512,
+                          help="Max heap of every SC node in MB")
+        parser.add_option("--blocks", dest="blocks", type="int", default=20, help="Number of forged blocks")
+        parser.add_option("--transactions", dest="transactions", type="int", default=50,
+                          help="Number of sent transactions")
+        parser.add_option("--propagationdeadline", dest="propagationdeadline", type="int", default=60,
+                          help="Max time for a block or a transaction to reach all the nodes in secs")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        mc_connection_info = MCConnectionInfo(
+            address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        forger_configuration = SCNodeConfiguration(mc_connection_info)
+        peer_configuration = SCNodeConfiguration(mc_connection_info, cert_submitter_enabled=False,
+                                                 cert_signing_enabled=False, submitter_private_keys_indexes=[])
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH),
+                                         forger_configuration, *([peer_configuration] * (self.options.nodes - 1)))
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(self.options.nodes, self.options.tmpdir,
+                              jvm_options=small_heap_jvm_options(self.options.maxheap))
+
+    def propagate(self, event_type, get_event_ids, origin, send):
+        """
+        Send a block or a transaction and wait for the event with its id on every node.
+
+        Parameters:
+         - event_type: websocket event code of the arrival on a node
+         - get_event_ids: callable returning the block or transaction ids of an event payload
+         - origin: index of the node which receives the block or the transaction first
+         - send: callable sending the block or the transaction, returning its id
+
+        Output: the latency in ms of every node from the event on the origin node, None if not received
+        """
+        urls = get_sc_ws_urls(self.sc_nodes)
+        received_at = {}
+
+        def on_event(url, payload):
+            now = time.time()
+            for event_id in get_event_ids(payload):
+                received_at.setdefault((event_id, url), now)
+
+        with WebsocketEventListener(urls, [event_type], on_event=on_event) as listener:
+            assert_true(listener.is_connected(), "Websocket servers of the nodes are required.")
+            sent_id = send()
+            wait_until(lambda: all((sent_id, url) in received_at for url in urls),
+                       deadline=self.options.propagationdeadline, description="events on all the nodes",
+                       raise_on_timeout=False)
+        origin_at = received_at.get((sent_id, urls[origin]))
+        return [(received_at[(sent_id, url)] - origin_at) * 1000
+                if origin_at is not None and (sent_id, url) in received_at else None for url in urls]
+
+    def add_latencies(self, results, series, hops, all_latencies):
+        """
+        Add the latency summary of every number of hops, output the overall summary.
+        """
+        max_hops = max([max(hops_by_node) for hops_by_node in hops], default=0)
+        for hops_count in range(1, max_hops + 1):
+            latencies = [latency for (hops_by_node, latencies) in zip(hops, all_latencies)
+                         for (node_hops, latency) in zip(hops_by_node, latencies)
+                         if node_hops == hops_count and latency is not None]
+            results.add(series, hops=hops_count, latencyMs=latency_summary(latencies))
+        return latency_summary([latency for (hops_by_node, latencies) in zip(hops, all_latencies)
+                                for (node_hops, latency) in zip(hops_by_node, latencies)
+                                if node_hops > 0 and latency is not None])
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        rnd = random.Random(options.seed)
+        edges = topology_edges(options.topology, options.nodes, options.degree, options.seed)
+        results = BenchmarkResults("topology", options, {
+            "nodes": options.nodes, "topology": options.topology, "degree": options.degree, "seed": options.seed,
+            "maxHeapMb": options.maxheap, "blocks": options.blocks, "transactions": options.transactions,
+            "edges": edges})
+
+        results.set("connectSecs", connect_sc_topology(self.sc_nodes, edges))
+        forger_hops = topology_hops(edges, options.nodes)
+        results.set("maxHops", max(forger_hops))
+
+        key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, key.secret_hex())
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+        ft_box = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                  if box["proposition"]["publicKey"] == key.public_key_hex][0]
+        boxes = fan_out(sc_node, ft_box, options.transactions, self.box_value, private_key=key) \
+            if options.transactions > 0 else []
+        sync_sc_blocks(self.sc_nodes, options.propagationdeadline)
+
+        blocks_latencies = []
+        for block_index in range(options.blocks):
+            latencies = self.propagate(WebsocketClient.UPDATE_TIP_EVENT, lambda payload: [payload["hash"]], 0,
+                                       lambda: generate_next_blocks(sc_node, "first node", 1, verbose=False)[0])
+            blocks_latencies.append(latencies)
+            for (node, latency) in enumerate(latencies[1:], 1):
+                results.add("blocks", block=block_index, node=node, hops=forger_hops[node], latencyMs=latency)
+            if None in latencies:
+                logging.info("Block {0} not received by {1} nodes".format(block_index, latencies.count(None)))
+            sync_sc_blocks(self.sc_nodes, options.propagationdeadline)
+        blocks_summary = self.add_latencies(results, "blockHops", [forger_hops] * len(blocks_latencies),
+                                            blocks_latencies)
+        results.set("blockLatencyMs", blocks_summary)
+
+        transactions_hops = []
+        transactions_latencies = []
+        for (tx_index, box) in enumerate(boxes):
+            tx = CoreTransaction([box["id"]], [ZenBoxData(key.public_key_hex, box["value"])]).sign(key)
+            receiver = rnd.randrange(options.nodes)
+
+            def send():
+                response = self.sc_nodes[receiver].transaction_sendTransaction(
+                    json.dumps({"transactionBytes": tx.to_hex()}))
+                assert_true("result" in response, "Transaction was rejected: " + json.dumps(response))
+                return response["result"]["transactionId"]
+
+            latencies = self.propagate(WebsocketClient.MEMPOOL_CHANGED_EVENT,
+                                       lambda payload: payload["transactions"], receiver, send)
+            hops = topology_hops(edges, options.nodes, receiver)
+            transactions_hops.append(hops)
+            transactions_latencies.append(latencies)
+            for node in range(options.nodes):
+                if node != receiver:
+                    results.add("transactions", transaction=tx_index, receiver=receiver, node=node, hops=hops[node],
+                                latencyMs=latencies[node])
+        transactions_summary = self.add_latencies(results, "transactionHops", transactions_hops,
+                                                  transactions_latencies)
+        results.set("transactionLatencyMs", transactions_summary)
+
+        total_rss = sum(psutil.Process(pid).memory_info().rss for pid in get_sc_node_pids())
+        results.set("totalRssMb", total_rss / 1024 ** 2)
+        results.set("rssPerNodeMb", total_rss / 1024 ** 2 / options.nodes)
+
+        logging.info("{0} nodes, {1} topology: block propagation p50 {2} ms, p99 {3} ms, transaction propagation "
+                     "p50 {4} ms, p99 {5} ms, {6:.0f} MB of memory".format(
+                         options.nodes, options.topology, blocks_summary["p50"], blocks_summary["p99"],
+                         transactions_summary["p50"], transactions_summary["p99"],
+                         total_rss / 1024 ** 2))
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkTopology().main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+import json
+import logging
+import random
+import threading
+import time
+
+from websocket import create_connection, WebSocketTimeoutException
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration, LARGE_WITHDRAWAL_EPOCH_LENGTH
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults, latency_summary, \
+    ProcessMemorySampler
+from SidechainTestFramework.sc_wait_util import wait_until
+from SidechainTestFramework.websocket_client import WebsocketClient
+from test_framework.util import start_nodes, websocket_port_by_mc_node_index
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks, \
+    get_sc_node_pids
+
+"""
+Benchmark of the SC node websocket server with many concurrent clients.
+
+Configuration:
+    Start 1 MC node and 1 SC node with a chain of --blocks blocks.
+
+Benchmark, for every number of clients of --clients:
+    - Open the websocket connections, one thread per client
+    - Requests: every client sends --requests requests back to back, rotating GET_SINGLE_BLOCK_REQUEST of a random
+      height, GET_NEW_BLOCK_HASHES_REQUEST from the genesis block and GET_MEMPOOL_TXS_REQUEST, and measures the latency
+      of every response
+    - Events: forge --events blocks, one at a time, and timestamp the UPDATE_TIP_EVENT of the block on every client.
+      The fan-out latency of a client is measured from the forging request, so it includes the forging time, the
+      spread from the first client receiving the event
+    - The SC node resident memory is sampled during the whole level
+
+Results (JSON): "requests" series with the latency and throughput of every request type, "events" series with the
+fan-out latency and spread of every forged block, "memory" series with the SC node resident memory, for every
+number of clients. Latency of every request type, throughput, fan-out latency and peak memory of every number of
+clients also as metrics.
+"""
+class SCBenchmarkWebsocket(SidechainTestFramework):
+    request_types = [WebsocketClient.GET_SINGLE_BLOCK_REQUEST, WebsocketClient.GET_NEW_BLOCK_HASHES_REQUEST,
+                     WebsocketClient.GET_MEMPOOL_TXS_REQUEST]
+    request_type_names = {WebsocketClient.GET_SINGLE_BLOCK_REQUEST: "getSingleBlock",
+                          WebsocketClient.GET_NEW_BLOCK_HASHES_REQUEST: "getNewBlockHashes",
+                          WebsocketClient.GET_MEMPOOL_TXS_REQUEST: "getMempoolTxs"}
+    connection_timeout = 10  # secs
+
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+        parser.add_option("--clients", dest="clients", default="10,100,300",
+                          help="Comma separated numbers of concurrent websocket clients")
+        parser.add_option("--requests", dest="requests", type="int", default=20,
+                          help="Number of requests sent by every client")
+        parser.add_option("--events", dest="events", type="int", default=5,
+                          help="Number of blocks forged to measure the tip events fan-out")
+        parser.add_option("--blocks", dest="blocks", type="int", default=50,
+                          help="Number of blocks forged before the benchmark")
+        parser.add_option("--eventdeadline", dest="eventdeadline", type="int", default=60,
+                          help="Max time for a tip event to reach all the clients in secs")
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, LARGE_WITHDRAWAL_EPOCH_LENGTH), sc_node_configuration)
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def get_request_payload(self, request_type, rnd, best_height, genesis_hash):
+        if request_type == WebsocketClient.GET_SINGLE_BLOCK_REQUEST:
+            return {"height": rnd.randint(1, best_height)}
+        if request_type == WebsocketClient.GET_NEW_BLOCK_HASHES_REQUEST:
+            return {"locatorHashes": [genesis_hash], "limit": 50}
+        return {"hash": []}
+
+    def send_requests(self, ws_connection, client_index, best_height, genesis_hash):
+        """
+        Send the requests of a client, every one after the response of the previous one.
+
+        Output: list of (request type, latency in ms, True if the response is an error)
+        """
+        rnd = random.Random(client_index)
+        responses = []
+        for request_id in range(self.options.requests):
+            request_type = self.request_types[request_id % len(self.request_types)]
+            payload = self.get_request_payload(request_type, rnd, best_height, genesis_hash)
+            sent_at = time.time()
+            ws_connection.send(json.dumps({"msgType": WebsocketClient.REQUEST_MSG_TYPE, "requestId": request_id,
+                                           "requestType": request_type, "requestPayload": payload}))
+            while True:
+                message = json.loads(ws_connection.recv())
+                # Events pushed meanwhile are skipped
+                if message.get("msgType") != WebsocketClient.EVENT_MSG_TYPE and message.get("requestId") == request_id:
+                    break
+            responses.append((request_type, (time.time() - sent_at) * 1000,
+                              message["msgType"] == WebsocketClient.ERROR_MSG_TYPE))
+        return responses
+
+    def listen_tip_events(self, ws_connection, client_index, tips_received_at, stopped):
+        ws_connection.settimeout(0.5)
+        while not stopped.is_set():
+            try:
+                message = ws_connection.recv()
+            except WebSocketTimeoutException:
+                continue
+            except Exception as e:
+                # e.g. the connection was closed, no more events will be received
+                logging.info("Websocket client {0} stopped listening: {1}".format(client_index, e))
+                return
+            event = json.loads(message)
+            if event.get("msgType") == WebsocketClient.EVENT_MSG_TYPE and \
+                    event.get("answerType") == WebsocketClient.UPDATE_TIP_EVENT:
+                tips_received_at.setdefault((event["eventPayload"]["hash"], client_index), time.time())
+
+    def run_clients(self, clients_count, best_height, genesis_hash):
+        """
+        Output: responses of all the clients, forged block ids with their forging time, tip events times, number of
+        clients failed during the requests
+        """
+        sc_node = self.sc_nodes[0]
+        connections = [create_connection(sc_node.wsUrl, timeout=self.connection_timeout)
+                       for _ in range(clients_count)]
+        responses = []
+        failed_clients = []
+        tips_received_at = {}
+        lock = threading.Lock()
+        requests_done = threading.Barrier(clients_count + 1)
+        stopped = threading.Event()
+
+        def client(client_index):
+            # A failed client still reaches the barrier, otherwise the main thread would wait forever
+            try:
+                client_responses = self.send_requests(connections[client_index], client_index, best_height,
+                                                      genesis_hash)
+                with lock:
+                    responses.extend(client_responses)
+            except Exception as e:
+                logging.info("Websocket client {0} failed: {1}".format(client_index, e))
+                with lock:
+                    failed_clients.append(client_index)
+                return
+            finally:
+                requests_done.wait()
+            self.listen_tip_events(connections[client_index], client_index, tips_received_at, stopped)
+
+        threads = [threading.Thread(target=client, args=(index,), daemon=True) for index in range(clients_count)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        requests_done.wait()
+        requests_secs = time.time() - start
+        listening_clients = [index for index in range(clients_count) if index not in failed_clients]
+
+        forged = []
+        for _ in range(self.options.events):
+            # The tip events may arrive before the forging response
+            forging_started_at = time.time()
+            block_id = generate_next_blocks(sc_node, "first node", 1, verbose=False)[0]
+            forged.append((block_id, forging_started_at))
+            wait_until(lambda: all((block_id, index) in tips_received_at for index in listening_clients),
+                       deadline=self.options.eventdeadline, description="tip event on all the clients",
+                       raise_on_timeout=False)
+
+        stopped.set()
+        for thread in threads:
+            thread.join()
+        for ws_connection in connections:
+            ws_connection.close()
+        return responses, requests_secs, forged, tips_received_at, len(failed_clients)
+
+    def run_test(self):
+        sc_node = self.sc_nodes[0]
+        options = self.options
+        clients_counts = [int(count) for count in options.clients.split(",")]
+        results = BenchmarkResults("websocket", options, {
+            "clients": clients_counts, "requests": options.requests, "events": options.events,
+            "blocks": options.blocks})
+
+        generate_next_blocks(sc_node, "first node", options.blocks, verbose=False)
+        best_height = sc_node.block_best()["result"]["height"]
+        genesis_hash = sc_node.block_findIdByHeight(json.dumps({"height": 1}))["result"]["blockId"]
+
+        for clients_count in clients_counts:
+            with ProcessMemorySampler(get_sc_node_pids()[0], interval=0.5) as sampler:
+                responses, requests_secs, forged, tips_received_at, failed_clients = self.run_clients(
+                    clients_count, best_height, genesis_hash)
+            for (sample_time, rss) in sampler.samples:
+                results.add("memory", clients=clients_count, secs=sample_time - sampler.samples[0][0],
+                            rssMb=rss / 1024 ** 2)
+
+            for request_type in self.request_types:
+                type_responses = [response for response in responses if response[0] == request_type]
+                summary = latency_summary([latency for (_, latency, _) in type_responses])
+                results.add("requests", clients=clients_count, request=self.request_type_names[request_type],
+                            latencyMs=summary, errors=len([error for (_, _, error) in type_responses if error]))
+                results.set_for("latencyMs", "{0}-{1}".format(self.request_type_names[request_type], clients_count),
+                                summary)
+            results.add("requests", clients=clients_count, request="all", requestsPerSec=len(responses) / requests_secs,
+                        latencyMs=latency_summary([latency for (_, latency, _) in responses]),
+                        errors=len([error for (_, _, error) in responses if error]), failedClients=failed_clients)
+            results.set_for("requestsPerSec", clients_count, len(responses) / requests_secs)
+
+            fan_out_ms = []
+            for (block_id, forged_at) in forged:
+                received_at = [tips_received_at[(block_id, index)] for index in range(clients_count)
+                               if (block_id, index) in tips_received_at]
+                fan_out_ms.extend((at - forged_at) * 1000 for at in received_at)
+                results.add("events", clients=clients_count, blockId=block_id, received=len(received_at),
+                            fanOutMs=latency_summary([(at - forged_at) * 1000 for at in received_at]),
+                            spreadMs=(max(received_at) - min(received_at)) * 1000 if len(received_at) > 0 else None)
+
+            results.set_for("fanOutMs", clients_count, latency_summary(fan_out_ms))
+
+            logging.info("{0} clients: {1:.0f} requests/sec, peak RSS {2:.0f} MB".format(
+                clients_count, len(responses) / requests_secs, sampler.peak_rss_mb()))
+            results.set_for("peakRssMb", clients_count, sampler.peak_rss_mb())
+
+        results.write()
+
+
+if __name__ == "__main__":
+    SCBenchmarkWebsocket().main()
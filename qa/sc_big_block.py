@@ -6,16 +6,14 @@ from SidechainTestFramework.sc_test_framework import SidechainTestFramework
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration
 from httpCalls.block.best import http_block_best
-from httpCalls.transaction.sendCoinsToAddress import sendCointsToMultipleAddress
-from httpCalls.transaction.createCoreTransaction import http_create_core_transaction
-from httpCalls.transaction.sendTransaction import sendTransaction
-from httpCalls.transaction.findTransactionByID import http_transaction_findById
+from httpCalls.transaction.allTransactions import allTransactions
 from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
 from httpCalls.wallet.createPrivateKey25519 import http_wallet_createPrivateKey25519
 from test_framework.util import start_nodes, \
     websocket_port_by_mc_node_index, forward_transfer_to_sidechain, assert_equal
 from SidechainTestFramework.scutil import assert_true, bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks, \
     connect_sc_nodes
+from SidechainTestFramework.sc_load_generator import TransactionLoadGenerator, fan_out
 
 """
 Check forger txes sorting algorithm based on feerate.
@@ -25,7 +23,6 @@ Test:
     Try to create a big SC block and verify that we are able to send to other nodes even if it has size > 1MB
 """
 class BigBlockTest(SidechainTestFramework):
-    MAX_TRANSACTION_OUTPUT = 998
     number_of_sc_ndoes = 2
 
     def setup_nodes(self):
@@ -91,60 +88,34 @@ class BigBlockTest(SidechainTestFramework):
 
         #Create 10000 UTXOs
         receiver_address = http_wallet_createPrivateKey25519(sc_node1)
-        utxo_amount = ft_amount * 1e8 / 10000
+        utxo_amount = int(ft_amount * 1e8 / 10000)
         utxo_to_create = 10000
-        tx_to_create = int(utxo_to_create / self.MAX_TRANSACTION_OUTPUT)
-        created_utxos = 0
-        
-        for _ in range(tx_to_create):
-            outputs = [{"publicKey": receiver_address, "value": utxo_amount} for _ in
-            range(self.MAX_TRANSACTION_OUTPUT)]
-            outputs.append(
-                {"publicKey": ft_address, "value": ft_box[0]["value"] - utxo_amount * self.MAX_TRANSACTION_OUTPUT})
-
-            raw_tx = http_create_core_transaction(sc_node1, [{"boxId": ft_box[0]["id"]}], outputs)["transactionBytes"]
-            res = sendTransaction(sc_node1, raw_tx)["result"]
-            assert_true("transactionId" in res)
-
-            self.sc_sync_all()
-            generate_next_blocks(sc_node1, "first node", 1)[0]
-            self.sc_sync_all()
-
-            created_utxos += self.MAX_TRANSACTION_OUTPUT
-
-            zen_boxes = http_wallet_allBoxesOfType(sc_node1, "ZenBox")
-            ft_box = self.find_boxes_of_address(zen_boxes, ft_address)
-            assert_true(len(ft_box), 0)
-
-        remaining_utxos = utxo_to_create - created_utxos
-        if remaining_utxos > 0:
-            raw_tx = http_create_core_transaction(sc_node1, [{"boxId": ft_box[0]["id"]}],
-                                                    [{"publicKey": receiver_address, "value": utxo_amount} for
-                                                    _ in range(remaining_utxos)])["transactionBytes"]
-            res = sendTransaction(sc_node1, raw_tx)["result"]
-            assert_true("transactionId" in res)
-
-            self.sc_sync_all()
-            generate_next_blocks(sc_node1, "first node", 1)[0]
-            self.sc_sync_all()
+        created_boxes = fan_out(sc_node1, ft_box[0], utxo_to_create, utxo_amount, to_public_key=receiver_address)
+        self.sc_sync_all()
 
         zen_boxes = http_wallet_allBoxesOfType(sc_node1, "ZenBox")
         filtered_boxes = self.find_boxes_of_address(zen_boxes, receiver_address)
         assert_equal(len(filtered_boxes), utxo_to_create)
+        assert_equal(set(box["id"] for box in filtered_boxes), set(box["id"] for box in created_boxes))
 
         address_node2 = http_wallet_createPrivateKey25519(sc_node2)
-        transactions_bytes = 0
-
-        for i in range(1000):
-            res = sendCointsToMultipleAddress(sc_node1, [address_node2 for _ in range(10)], [utxo_amount for _ in range(10)], 0)
-            logging.info("Created tx: "+res)
-            tx = http_transaction_findById(sc_node1, res)
-            tx_bytes = http_transaction_findById(sc_node1, res, False)
-            transactions_bytes += len(tx_bytes["transactionBytes"])
-            assert_equal(len(tx["transaction"]["newBoxes"]), 10)
-            assert_equal(len(tx["transaction"]["unlockers"]), 10)
-            self.sc_sync_all()
 
+        # Build 1000 transactions with 10 inputs and 10 outputs each, then submit them to both SC nodes
+        load_generator = TransactionLoadGenerator(self.sc_nodes)
+        transactions = load_generator.build_transactions(sc_node1, filtered_boxes, address_node2,
+                                                         inputs_per_transaction=10, outputs_per_transaction=10)
+        report = load_generator.submit(transactions)
+        report.log()
+        assert_equal(report.accepted, 1000, "Not all the transactions were accepted")
+        self.sc_sync_all()
+
+        mempool_transactions = allTransactions(sc_node1)["transactions"]
+        assert_equal(len(mempool_transactions), 1000)
+        for tx in mempool_transactions:
+            assert_equal(len(tx["newBoxes"]), 10)
+            assert_equal(len(tx["unlockers"]), 10)
+
+        transactions_bytes = sum(len(transaction) for transaction in transactions)
         logging.info("Total created transactions bytes "+str(transactions_bytes))
         #Verify that our transactions exceed 1MB of size
         assert_true(transactions_bytes > 1048576)
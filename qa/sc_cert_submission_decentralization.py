@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import json
 import logging
-import time
 
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration
@@ -12,6 +11,7 @@ from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
     start_sc_nodes, generate_next_blocks, connect_sc_nodes, \
     sc_connected_peers, disconnect_sc_nodes_bi, generate_next_block
 from SidechainTestFramework.sc_forging_util import *
+from SidechainTestFramework.sc_wait_util import wait_until, certificates_submitted, CERTIFICATE_WAIT_DEADLINE
 
 """
 Check Pretty Good Decentralization (PGD), the certificate submission decentralization:
@@ -144,10 +144,8 @@ class SCCertSubmissionDecentralization(SidechainTestFramework):
         check_mcreference_presence(we1_1_mcblock_hash, scblock_id3, sc_node1)
 
         # Wait until Certificate will appear in MC node mempool
-        time.sleep(15)
-        while mc_node.getmempoolinfo()["size"] == 0 and sc_node1.submitter_isCertGenerationActive()["result"]["state"]:
-            logging.info("Wait for certificate in mc mempool...")
-            time.sleep(2)
+        wait_until(certificates_submitted(mc_node, [sc_node1]), deadline=CERTIFICATE_WAIT_DEADLINE,
+                   description="certificate in MC mempool")
         assert_equal(1, mc_node.getmempoolinfo()["size"], "Certificate was not added to Mc node mempool.")
 
         # Get Certificate for Withdrawal epoch 0
@@ -190,10 +188,8 @@ class SCCertSubmissionDecentralization(SidechainTestFramework):
         check_mcreference_presence(we2_1_mcblock_hash, scblock_id6, sc_node1)
 
         # Wait and check that certificate generation has not started at all.
-        time.sleep(15)
-        while mc_node.getmempoolinfo()["size"] == 0 and sc_node1.submitter_isCertGenerationActive()["result"]["state"]:
-            logging.info("Wait for possible certificate in mc mempool...")
-            time.sleep(2)
+        wait_until(certificates_submitted(mc_node, [sc_node1]), deadline=15, raise_on_timeout=False,
+                   description="possible certificate in MC mempool")
 
         assert_equal(0, mc_node.getmempoolinfo()["size"], "Certificate was added to Mc node mempool.")
 
@@ -204,10 +200,8 @@ class SCCertSubmissionDecentralization(SidechainTestFramework):
         # The node 4 expects to create and broadcast the certificate signatures
         # The first node should retrieve them and start Certificate generation.
         # Wait until Certificate will appear in MC node mempool
-        time.sleep(20)
-        while mc_node.getmempoolinfo()["size"] == 0 and sc_node1.submitter_isCertGenerationActive()["result"]["state"]:
-            logging.info("Wait for certificate in mc mempool...")
-            time.sleep(2)
+        wait_until(certificates_submitted(mc_node, [sc_node1]), deadline=CERTIFICATE_WAIT_DEADLINE,
+                   description="certificate in MC mempool")
         assert_equal(1, mc_node.getmempoolinfo()["size"], "Certificate was not added to Mc node mmepool.")
 
         # Get Certificate for Withdrawal epoch 0
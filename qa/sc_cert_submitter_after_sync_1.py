@@ -1,15 +1,15 @@
 #!/usr/bin/env python3
 import logging
-import time
 
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration
 from SidechainTestFramework.sc_test_framework import SidechainTestFramework
-from test_framework.util import start_nodes, \
+from test_framework.util import assert_true, start_nodes, \
     websocket_port_by_mc_node_index
 from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
     start_sc_nodes, generate_next_block, connect_sc_nodes, sync_sc_blocks
 from SidechainTestFramework.sc_forging_util import *
+from SidechainTestFramework.sc_wait_util import wait_for_certificate
 
 """
 Check Certificate submission behaviour for the node after sync from scratch with an existing chain.
@@ -78,33 +78,21 @@ class ScCertSubmitterAfterSync1(SidechainTestFramework):
         sync_sc_blocks(self.sc_nodes, 100, True)
         logging.info("Synchronization finished.")
 
-        mc_blocks_left_for_we = self.sc_withdrawal_epoch_length - 1  # minus genesis block
+        # Reach the end of the withdrawal epoch (WE) in both MC and SC
+        advance_to_epoch_end(mc_node, self.sc_nodes, 0)
 
-        # Generate MC blocks to reach one block before the end of the withdrawal epoch (WE)
-        mc_block_hashes = mc_node.generate(mc_blocks_left_for_we - 1)
-        mc_blocks_left_for_we -= len(mc_block_hashes)
+        # Generate MC block to switch WE epoch
+        mc_node.generate(1)
 
-        # Generate 1 more SC block to sync with MC
-        generate_next_block(sc_node1, "first node")
-        self.sc_sync_all()  # Sync SC nodes
-
-        # Generate MC blocks to switch WE epoch
-        logging.info("mc blocks left = " + str(mc_blocks_left_for_we))
-        mc_node.generate(mc_blocks_left_for_we + 1)
-
-        # Generate 2 SC blocks on SC node and start them automatic cert creation.
-        generate_next_block(sc_node1, "second node")  # 1 MC block to reach the end of WE
-        generate_next_block(sc_node1, "second node")  # 1 MC block to trigger Submitter logic
+        # Generate SC block on SC node and start automatic cert creation.
+        generate_next_block(sc_node1, "first node")  # 1 MC block to trigger Submitter logic
 
         self.sc_sync_all()  # Sync SC nodes
 
         # Wait for Certificates appearance
-        time.sleep(10)
-        while mc_node.getmempoolinfo()["size"] < 1 and sc_node2.submitter_isCertGenerationActive()["result"]["state"]:
-            logging.info("Wait for certificates in the MC mempool...")
-            if sc_node2.submitter_isCertGenerationActive()["result"]["state"]:
-                logging.info("sc_node2 generating certificate now.")
-            time.sleep(2)
+        lifecycle = wait_for_certificate(sc_node2, 0)
+        assert_true(lifecycle.get("certificateId") is not None,
+                    "Certificate submission failed: " + str(lifecycle.get("failureReason")))
 
         assert_equal(1, mc_node.getmempoolinfo()["size"], "Certificates was not added to MC node mempool.")
 
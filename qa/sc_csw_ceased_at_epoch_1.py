@@ -5,6 +5,7 @@ import time
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration
 from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_wait_util import wait_for_csw_proofs
 from test_framework.util import fail, assert_equal, assert_true, assert_false, start_nodes, \
     websocket_port_by_mc_node_index, forward_transfer_to_sidechain, certificate_field_config_csw_enabled
 from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
@@ -273,11 +274,7 @@ class SCCswCeasedAtEpoch1(SidechainTestFramework):
             assert_equal("ProofGenerationStarted", state, "Different proof generation state found")
 
         # Wait for proofs generation completion.
-        attempts = 100
-        while not if_csws_were_generated(sc_node, csw_box_ids, allow_absent=True) and attempts > 0:
-            logging.info("Wait for CSW proofs creation completion...")
-            time.sleep(10)
-            attempts -= 1
+        wait_for_csw_proofs(sc_node, csw_box_ids)
 
         assert_true(if_csws_were_generated(sc_node, csw_box_ids, allow_absent=False), "Some CSW proof was not generated.")
 
@@ -6,6 +6,8 @@ from decimal import Decimal
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration, SC_CREATION_VERSION_1
 from SidechainTestFramework.sc_forging_util import *
+from SidechainTestFramework.sc_wait_util import wait_until, certificates_submitted, wait_for_csw_proofs, \
+    CERTIFICATE_WAIT_DEADLINE
 from SidechainTestFramework.sc_test_framework import SidechainTestFramework
 from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
     start_sc_nodes, generate_next_blocks, generate_next_block, if_csws_were_generated
@@ -176,11 +178,8 @@ class SCCswCeasedAtEpoch3(SidechainTestFramework):
         check_mcreference_presence(we1_1_mcblock_hash, sc_block_id, sc_node)
 
         # Wait until Certificate will appear in MC node mempool
-        time.sleep(10)
-        while mc_node.getmempoolinfo()["size"] == 0 and sc_node.submitter_isCertGenerationActive()["result"]["state"]:
-            logging.info("Wait for certificate in mc mempool...")
-            time.sleep(2)
-            sc_node.block_best()  # just a ping to SC node. For some reason, STF can't request SC node API after a while idle.
+        wait_until(certificates_submitted(mc_node, [sc_node]), deadline=CERTIFICATE_WAIT_DEADLINE,
+                   description="certificate in MC mempool")
         assert_equal(1, mc_node.getmempoolinfo()["size"], "Certificate was not added to Mc node mempool.")
 
         # Generate MC and SC blocks with Cert
@@ -260,11 +259,8 @@ class SCCswCeasedAtEpoch3(SidechainTestFramework):
         check_mcreference_presence(we2_1_mcblock_hash, sc_block_id, sc_node)
 
         # Wait until Certificate will appear in MC node mempool
-        time.sleep(10)
-        while mc_node.getmempoolinfo()["size"] == 0 and sc_node.submitter_isCertGenerationActive()["result"]["state"]:
-            logging.info("Wait for certificate in mc mempool...")
-            time.sleep(2)
-            sc_node.block_best()  # just a ping to SC node. For some reason, STF can't request SC node API after a while idle.
+        wait_until(certificates_submitted(mc_node, [sc_node]), deadline=CERTIFICATE_WAIT_DEADLINE,
+                   description="certificate in MC mempool")
         assert_equal(1, mc_node.getmempoolinfo()["size"], "Certificate was not added to Mc node mempool.")
 
         # Generate MC and SC blocks with Cert
@@ -476,11 +472,7 @@ class SCCswCeasedAtEpoch3(SidechainTestFramework):
             assert_equal("ProofGenerationStarted", state, "Different proof generation state found")
 
         # Wait for proofs generation completion.
-        attempts = 200
-        while not if_csws_were_generated(sc_node, csw_box_ids, allow_absent=True) and attempts > 0:
-            logging.info("Wait for CSW proofs creation completion...")
-            time.sleep(10)
-            attempts -= 1
+        wait_for_csw_proofs(sc_node, csw_box_ids, deadline=2000)
 
         assert_true(if_csws_were_generated(sc_node, csw_box_ids, allow_absent=False),
                     "Some CSW proof was not generated.")
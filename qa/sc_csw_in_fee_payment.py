@@ -9,6 +9,7 @@ from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreat
     SCNetworkConfiguration, SC_CREATION_VERSION_1
 from SidechainTestFramework.sc_forging_util import *
 from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_wait_util import wait_for_csw_proofs
 from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
     start_sc_nodes, generate_next_blocks, generate_next_block, if_csws_were_generated
 from test_framework.util import fail, assert_equal, assert_true, assert_false, start_nodes, \
@@ -267,11 +268,7 @@ class ScCSWInFeePaymentTest(SidechainTestFramework):
         assert_equal("ProofGenerationStarted", state, "Different proof generation state found")
 
         # Wait for proofs generation completion.
-        attempts = 200
-        while not if_csws_were_generated(sc_node, [fee_payment_box_id], allow_absent=True) and attempts > 0:
-            logging.info("Wait for CSW proofs creation completion...")
-            time.sleep(10)
-            attempts -= 1
+        wait_for_csw_proofs(sc_node, [fee_payment_box_id], deadline=2000)
 
         assert_true(if_csws_were_generated(sc_node, [fee_payment_box_id], allow_absent=False),
                     "Some CSW proof was not generated.")
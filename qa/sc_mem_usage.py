@@ -9,6 +9,7 @@ import sys
 from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
     SCNetworkConfiguration, Account
 from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_benchmark_util import add_benchmark_options, BenchmarkResults
 from test_framework.util import fail, assert_equal, assert_true, start_nodes, \
     websocket_port_by_mc_node_index
 from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
@@ -34,6 +35,9 @@ Test:
         -- generate one more MC and SC block accordingly and await for certificate submission to MC node mempool
         -- check epoch 0 certificate with not backward transfers in the MC mempool
         -- mine 1 more MC block and forge 1 more SC block, check Certificate inclusion into SC block
+
+Results (JSON): "memory" series with the SC node resident memory on start, before and after every certificate
+generation, peak resident memory as metric, see sc_benchmark_util.
 """
 
 class SCBackwardTransfer(SidechainTestFramework):
@@ -41,6 +45,9 @@ class SCBackwardTransfer(SidechainTestFramework):
     sc_nodes_bootstrap_info = None
     sc_withdrawal_epoch_length = 10
 
+    def sc_add_options(self, parser):
+        add_benchmark_options(parser)
+
     def setup_nodes(self):
         num_nodes = 1
         return start_nodes(num_nodes, self.options.tmpdir, extra_args=[['-debug=sc', '-logtimemicros=1']] * num_nodes)
@@ -56,10 +63,15 @@ class SCBackwardTransfer(SidechainTestFramework):
     def sc_setup_nodes(self):
         return start_sc_nodes(1, self.options.tmpdir)
 
-    def create_snapshot(self, process):
-        print("MEM_USAGE on start: " + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + " "
-              + str(process.memory_info().rss / 1024 ** 2) + "Mb")
+    def record_mem_usage(self, results, process, certificate, stage):
+        rss_mb = process.memory_info().rss / 1024 ** 2
+        print("MEM_USAGE " + stage + ": " + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + " "
+              + str(rss_mb) + "Mb")
         sys.stdout.flush()
+        results.add("memory", certificate=certificate, stage=stage, rssMb=rss_mb)
+
+    def create_snapshot(self, results, process, certificate):
+        self.record_mem_usage(results, process, certificate, "on start")
         exec_str = "pmap -x " + str(process.pid) + " > " + "java_proc_mem_snapshot_" + time.strftime("%Y.%m.%d_%H.%M.%S", time.localtime())
         os.system(exec_str)
         exec_jcmd = "jcmd " + str(process.pid) + " VM.native_memory > jvm_mem_snapshot_" + time.strftime("%Y.%m.%d_%H.%M.%S", time.localtime())
@@ -91,6 +103,8 @@ class SCBackwardTransfer(SidechainTestFramework):
         mc_node.generate(1)[0]
 
         num_certificates = 10
+        results = BenchmarkResults("mem_usage", self.options, {
+            "certificates": num_certificates, "withdrawalEpochLength": self.sc_withdrawal_epoch_length})
 
         print ("Print processes")
         process_id = get_sc_node_pids()
@@ -102,7 +116,7 @@ class SCBackwardTransfer(SidechainTestFramework):
 
         for iter in range(num_certificates):
             #print("MEM_USAGE on start: " + time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()) + " " + str(process.memory_info().rss/1024**2) + "Mb")
-            self.create_snapshot(process)
+            self.create_snapshot(results, process, iter)
 
             # Generate 8 more MC block to finish the withdrawal epoch, then generate 3 more SC block to sync with MC.
             we0_end_mcblock_hash = mc_node.generate(8)[7]
@@ -117,9 +131,7 @@ class SCBackwardTransfer(SidechainTestFramework):
             scblock_id3 = generate_next_blocks(sc_node, "first node", 1)[0]
             check_mcreference_presence(we1_1_mcblock_hash, scblock_id3, sc_node)
 
-            print("MEM_USAGE before cert generation: " + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()) + " "
-                  + str(process.memory_info().rss/1024**2) + "Mb")
-            sys.stdout.flush()
+            self.record_mem_usage(results, process, iter, "before cert generation")
 
             # Wait until Certificate will appear in MC node mempool
             attempts = 25
@@ -130,9 +142,7 @@ class SCBackwardTransfer(SidechainTestFramework):
                 sc_node.block_best() # just a ping to SC node. For some reason, STF can't request SC node API after a while idle.
             assert_equal(1, mc_node.getmempoolinfo()["size"], "Certificate was not added to Mc node mmepool.")
 
-            print("MEM_USAGE after cert generation: " + time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-                  + " " + str(process.memory_info().rss/1024**2) + "Mb")
-            sys.stdout.flush()
+            self.record_mem_usage(results, process, iter, "after cert generation")
 
             # Get Certificate for Withdrawal epoch 0 and verify it
             we0_certHash = mc_node.getrawmempool()[0]
@@ -153,5 +163,8 @@ class SCBackwardTransfer(SidechainTestFramework):
             scblock_id4 = generate_next_blocks(sc_node, "first node", 1)[0]
             check_mcreference_presence(we1_2_mcblock_hash, scblock_id4, sc_node)
 
+        results.set("peakRssMb", max(point["rssMb"] for point in results.series["memory"]))
+        results.write()
+
 if __name__ == "__main__":
     SCBackwardTransfer().main()
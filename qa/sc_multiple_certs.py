@@ -13,6 +13,7 @@ from test_framework.util import fail, assert_false, assert_true, start_nodes, \
 from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, \
     start_sc_nodes, generate_next_block, connect_sc_nodes, disconnect_sc_nodes_bi, sync_sc_blocks
 from SidechainTestFramework.sc_forging_util import *
+from SidechainTestFramework.sc_wait_util import wait_until, certificates_submitted, CERTIFICATE_WAIT_DEADLINE
 
 """
 Check multiple certificates processing:
@@ -134,7 +135,9 @@ class SCMultipleCerts(SidechainTestFramework):
         # Generate 2 SC blocks on both SC nodes and start them automatic cert creation.
         generate_next_block(sc_node2, "second node")  # 1 MC block to reach the end of WE
         generate_next_block(sc_node2, "second node")  # 1 MC block to trigger Submitter logic
-        time.sleep(16)  # to be sure that SC node 2 will finish cert creation faster considering cert submission delay
+        # to be sure that SC node 2 will finish cert creation faster considering cert submission delay
+        wait_until(certificates_submitted(mc_node, [sc_node2], 1), deadline=CERTIFICATE_WAIT_DEADLINE,
+                   description="SC node 2 certificate in MC mempool")
         # Note: such an order because of the MC wallet behaviour:
         # if lower quality cert will be generated after the higher,
         # wallet will choose another cert change for fee payment.
@@ -143,20 +146,8 @@ class SCMultipleCerts(SidechainTestFramework):
         generate_next_block(sc_node1, "first node")
 
         # Wait for Certificates appearance
-        time.sleep(10)
-        while (mc_node.getmempoolinfo()["size"] < 2 and
-               (sc_node1.submitter_isCertGenerationActive()["result"]["state"]
-                or sc_node2.submitter_isCertGenerationActive()["result"]["state"])):
-
-            logging.info("Wait for certificates in the MC mempool...")
-            if (sc_node1.submitter_isCertGenerationActive()["result"]["state"]):
-                logging.info("sc_node1 generating certificate now.")
-            if (sc_node2.submitter_isCertGenerationActive()["result"]["state"]):
-                logging.info("sc_node2 generating certificate now.")
-
-            time.sleep(2)
-            sc_node1.block_best()  # just a ping to SC node. For some reason, STF can't request SC node API after a while idle.
-            sc_node2.block_best()  # just a ping to SC node. For some reason, STF can't request SC node API after a while idle.
+        wait_until(certificates_submitted(mc_node, [sc_node1], 2), deadline=CERTIFICATE_WAIT_DEADLINE,
+                   description="certificates in MC mempool")
         assert_equal(2, mc_node.getmempoolinfo()["size"], "Certificates was not added to MC node mempool.")
 
         # Try to generate one more certificate with same quality in order to check that submission attempt will be skipped
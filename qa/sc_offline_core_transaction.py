@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import json
+
+from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreationInfo, MCConnectionInfo, \
+    SCNetworkConfiguration
+from SidechainTestFramework.sc_test_framework import SidechainTestFramework
+from SidechainTestFramework.sc_core_transaction import PrivateKey25519, CoreTransaction, ZenBoxData, \
+    WithdrawalRequestBoxData
+from httpCalls.wallet.allBoxesOfType import http_wallet_allBoxesOfType
+from httpCalls.wallet.importSecret import http_wallet_importSecret
+from test_framework.util import assert_equal, assert_true, start_nodes, \
+    websocket_port_by_mc_node_index, forward_transfer_to_sidechain
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, start_sc_nodes, generate_next_blocks
+
+"""
+Check that the SidechainCoreTransaction built and signed by the test framework without the SC node is the same
+the SDK would build.
+
+Configuration:
+    Start 1 MC node and 1 SC node.
+
+Test:
+    - Generate 2 keys on the test side and import them to the SC node wallet
+    - Do FT to the first key
+    - Build and sign offline a transaction spending the FT box, with a ZenBox output to the second key and
+      a WithdrawalRequestBox output
+    - Verify that the decoded transaction has the id, fee and new boxes computed offline
+    - Send the transaction bytes and verify the returned transaction id
+    - Forge the block and verify the new ZenBox id in the wallet
+"""
+class SCOfflineCoreTransaction(SidechainTestFramework):
+    ft_amount = 10  # Zen
+    bt_amount = 2  # Zen
+    fee = 1000  # satoshi
+
+    def setup_nodes(self):
+        return start_nodes(1, self.options.tmpdir)
+
+    def sc_setup_chain(self):
+        mc_node = self.nodes[0]
+        sc_node_configuration = SCNodeConfiguration(
+            MCConnectionInfo(address="ws://{0}:{1}".format(mc_node.hostname, websocket_port_by_mc_node_index(0)))
+        )
+        network = SCNetworkConfiguration(SCCreationInfo(mc_node, 100, 10), sc_node_configuration)
+        self.sc_nodes_bootstrap_info = bootstrap_sidechain_nodes(self.options, network)
+
+    def sc_setup_nodes(self):
+        return start_sc_nodes(1, self.options.tmpdir)
+
+    def run_test(self):
+        mc_node = self.nodes[0]
+        sc_node = self.sc_nodes[0]
+
+        # Keys generated on the test side, imported only to let the wallet track the boxes
+        sender_key = PrivateKey25519.generate()
+        receiver_key = PrivateKey25519.generate()
+        http_wallet_importSecret(sc_node, sender_key.secret_hex())
+        http_wallet_importSecret(sc_node, receiver_key.secret_hex())
+
+        forward_transfer_to_sidechain(self.sc_nodes_bootstrap_info.sidechain_id, mc_node,
+                                      sender_key.public_key_hex, self.ft_amount, mc_node.getnewaddress())
+        generate_next_blocks(sc_node, "first node", 1)
+
+        ft_boxes = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                    if box["proposition"]["publicKey"] == sender_key.public_key_hex]
+        assert_equal(1, len(ft_boxes), "FT box not found")
+        ft_box = ft_boxes[0]
+
+        bt_value = self.bt_amount * 100000000
+        tx = CoreTransaction([ft_box["id"]],
+                             [ZenBoxData(receiver_key.public_key_hex, ft_box["value"] - bt_value - self.fee),
+                              WithdrawalRequestBoxData(mc_node.getnewaddress(), bt_value)],
+                             fee=self.fee).sign([sender_key])
+
+        # Check the offline built transaction against the SDK deserialization
+        decoded = sc_node.transaction_decodeTransactionBytes(json.dumps({"transactionBytes": tx.to_hex()}))
+        assert_true("result" in decoded, "Transaction bytes decoding failed: " + json.dumps(decoded))
+        decoded_tx = decoded["result"]["transaction"]
+        assert_equal(tx.id(), decoded_tx["id"], "Transaction id is different")
+        assert_equal(self.fee, decoded_tx["fee"], "Transaction fee is different")
+        assert_equal([box["id"] for box in tx.new_boxes()], [box["id"] for box in decoded_tx["newBoxes"]],
+                     "New boxes ids are different")
+        assert_equal([box["nonce"] for box in tx.new_boxes()], [box["nonce"] for box in decoded_tx["newBoxes"]],
+                     "New boxes nonces are different")
+
+        res = sc_node.transaction_sendTransaction(json.dumps({"transactionBytes": tx.to_hex()}))
+        assert_true("result" in res, "Transaction was rejected: " + json.dumps(res))
+        assert_equal(tx.id(), res["result"]["transactionId"], "Sent transaction id is different")
+
+        generate_next_blocks(sc_node, "first node", 1)
+        receiver_boxes = [box for box in http_wallet_allBoxesOfType(sc_node, "ZenBox")
+                          if box["proposition"]["publicKey"] == receiver_key.public_key_hex]
+        assert_equal([tx.new_boxes()[0]["id"]], [box["id"] for box in receiver_boxes],
+                     "Receiver box id is different")
+
+
+if __name__ == "__main__":
+    SCOfflineCoreTransaction().main()
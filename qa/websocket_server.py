@@ -7,7 +7,8 @@ from SidechainTestFramework.sc_boostrap_info import SCNodeConfiguration, SCCreat
     SCNetworkConfiguration
 from test_framework.util import assert_equal, assert_true, forward_transfer_to_sidechain, \
     websocket_port_by_mc_node_index, assert_false
-from SidechainTestFramework.scutil import generate_next_blocks, bootstrap_sidechain_nodes, start_sc_nodes
+from SidechainTestFramework.scutil import generate_next_blocks, bootstrap_sidechain_nodes, start_sc_nodes, \
+    sc_ws_port
 from httpCalls.wallet.balance import http_wallet_balance
 from httpCalls.transaction.sendCoinsToAddress import sendCoinsToAddress
 from httpCalls.wallet.createPrivateKey25519 import  http_wallet_createPrivateKey25519
@@ -101,7 +102,7 @@ class SCWsServer(SidechainTestFramework):
 
         #Start websocket client
         ws = WebsocketClient()
-        ws_connection = ws.create_connection("ws://localhost:8025/")
+        ws_connection = ws.create_connection("ws://localhost:{0}/".format(sc_ws_port(0)))
 
         ######## Mempool requests test ########
         logging.info("######## Mempool requests test ########")
@@ -8,7 +8,7 @@ from SidechainTestFramework.sc_test_framework import SidechainTestFramework
 from httpCalls.block.getFeePayments import http_block_getFeePayments
 from test_framework.util import assert_equal, assert_true, websocket_port_by_mc_node_index,\
     forward_transfer_to_sidechain
-from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, generate_next_blocks, start_sc_nodes
+from SidechainTestFramework.scutil import bootstrap_sidechain_nodes, generate_next_blocks, start_sc_nodes, sc_ws_port
 from httpCalls.wallet.balance import http_wallet_balance
 from httpCalls.transaction.sendCoinsToAddress import sendCoinsToAddress
 from SidechainTestFramework.websocket_client import WebsocketClient
@@ -94,7 +94,7 @@ class SCWsServerFeePayments(SidechainTestFramework):
 
         # Start websocket client
         ws = WebsocketClient()
-        ws_connection = ws.create_connection("ws://localhost:8025/")
+        ws_connection = ws.create_connection("ws://localhost:{0}/".format(sc_ws_port(0)))
 
         ###########################################################
         #       Check new tip event for fee payments info         #
@@ -22,8 +22,10 @@ import scorex.util.ModifierId
 
 import java.util.{Optional => JOptional}
 import scala.collection.JavaConverters._
+import scala.collection.mutable.ListBuffer
 import scala.compat.java8.OptionConverters._
 import scala.concurrent.{Await, ExecutionContext, Future}
+import scala.concurrent.duration.Deadline
 import scala.util.{Failure, Success, Try}
 
 case class SidechainBlockApiRoute(override val settings: RESTApiSettings,
@@ -36,7 +38,7 @@ case class SidechainBlockApiRoute(override val settings: RESTApiSettings,
 
   override val route: Route = pathPrefix("block") {
 
-    findById ~ findLastIds ~ findIdByHeight ~ getBestBlockInfo ~ getFeePayments ~ findBlockInfoById ~ startForging ~ stopForging ~ generateBlockForEpochNumberAndSlot ~ getForgingInfo
+    findById ~ findLastIds ~ findIdByHeight ~ getBestBlockInfo ~ getFeePayments ~ findBlockInfoById ~ startForging ~ stopForging ~ generateBlockForEpochNumberAndSlot ~ generateManyBlocks ~ getForgingInfo
   }
 
   /**
@@ -169,17 +171,85 @@ case class SidechainBlockApiRoute(override val settings: RESTApiSettings,
         .map(txBytes => companion.parseBytesTry(BytesUtils.fromHexString(txBytes)))
         .flatten(maybeTx => maybeTx.map(Seq(_)).getOrElse(None))
 
-      val future = sidechainBlockActorRef ? TryForgeNextBlockForEpochAndSlot(intToConsensusEpochNumber(body.epochNumber), intToConsensusSlotNumber(body.slotNumber), forcedTx)
-      val submitResultFuture = Await.result(future, timeout.duration).asInstanceOf[Future[Try[ModifierId]]]
-      Await.result(submitResultFuture, timeout.duration) match {
+      forgeBlock(body.epochNumber, body.slotNumber, forcedTx) match {
         case Success(id) =>
-          ApiResponseUtil.toResponse(RespGenerate(id.asInstanceOf[String]))
+          // The block is forged on top of the best one, the parent lets the caller check the tip it expected
+          withNodeView { sidechainNodeView =>
+            val parentId = sidechainNodeView.getNodeHistory.getBlockInfoById(id).asScala.map(_.parentId.asInstanceOf[String])
+            ApiResponseUtil.toResponse(RespGenerate(id.asInstanceOf[String], parentId.orNull))
+          }
         case Failure(e) =>
           ApiResponseUtil.toResponse(ErrorBlockNotCreated(s"Block was not created: ${e.getMessage}", JOptional.empty()))
       }
     }
   }
 
+  /**
+    * Forge the given number of consecutive blocks starting from the slot next to the best block one.
+    * Slots where the block can't be forged, for example because the node is not a slot leader, are skipped.
+    * Forging stops earlier once half of the API timeout is elapsed, so less blocks than requested may be returned.
+    * Every forging attempt waits at most until then, so the response is sent before the request times out.
+    */
+  def generateManyBlocks: Route = (post & path("generateMany")) {
+    entity(as[ReqGenerateMany]) { body =>
+      Try {
+        Await.result(forgerRef ? GetForgingInfo, timeout.duration).asInstanceOf[Try[ForgingInfo]].get
+      } match {
+        case Success(forgingInfo) =>
+          val slotsInEpoch = forgingInfo.consensusSlotsInEpoch
+          val deadline = (timeout.duration / 2).fromNow
+          val generatedBlocks = ListBuffer[GeneratedBlockInfo]()
+          var epochAndSlot: (Int, Int) = nextEpochAndSlot(forgingInfo.currentBestEpochAndSlot.epochNumber,
+            forgingInfo.currentBestEpochAndSlot.slotNumber, slotsInEpoch)
+          var skippedSlots = 0
+          var forgingStart = System.currentTimeMillis()
+          var error: Option[ErrorResponse] = None
+
+          while (error.isEmpty && generatedBlocks.size < body.number && deadline.hasTimeLeft()) {
+            val (epochNumber, slotNumber) = epochAndSlot
+            Try(forgeBlock(epochNumber, slotNumber, Seq(), deadline)).flatten match {
+              case Success(id) =>
+                val forgingEnd = System.currentTimeMillis()
+                generatedBlocks.append(GeneratedBlockInfo(id.asInstanceOf[String], epochNumber, slotNumber, skippedSlots, forgingEnd - forgingStart))
+                skippedSlots = 0
+                forgingStart = forgingEnd
+              case Failure(_) if deadline.isOverdue() =>
+                // The attempt timed out, the loop stops and the blocks forged so far are returned
+              case Failure(e) if e.getMessage != null && e.getMessage.contains("no forging stake") =>
+                error = Some(ErrorBlockNotCreated(s"Block was not created: ${e.getMessage}", JOptional.empty()))
+              case Failure(e) if skippedSlots >= slotsInEpoch =>
+                // Whole consensus epoch was skipped, no reason to continue
+                error = Some(ErrorBlockNotCreated(s"Block was not created for $skippedSlots consecutive slots: ${e.getMessage}", JOptional.empty()))
+              case Failure(_) =>
+                skippedSlots += 1
+            }
+            epochAndSlot = nextEpochAndSlot(epochNumber, slotNumber, slotsInEpoch)
+          }
+
+          error match {
+            case Some(errorResponse) => ApiResponseUtil.toResponse(errorResponse)
+            case None => ApiResponseUtil.toResponse(RespGenerateMany(generatedBlocks.map(_.blockId), generatedBlocks))
+          }
+        case Failure(ex) =>
+          ApiResponseUtil.toResponse(ErrorGetForgingInfo(s"Failed to get forging info: ${ex.getMessage}", JOptional.empty()))
+      }
+    }
+  }
+
+  private def forgeBlock(epochNumber: Int, slotNumber: Int, forcedTx: Iterable[SidechainTypes#SCBT],
+                         deadline: Deadline = timeout.duration.fromNow): Try[ModifierId] = {
+    val future = sidechainBlockActorRef ? TryForgeNextBlockForEpochAndSlot(intToConsensusEpochNumber(epochNumber), intToConsensusSlotNumber(slotNumber), forcedTx)
+    val submitResultFuture = Await.result(future, deadline.timeLeft).asInstanceOf[Future[Try[ModifierId]]]
+    Await.result(submitResultFuture, deadline.timeLeft)
+  }
+
+  private def nextEpochAndSlot(epochNumber: Int, slotNumber: Int, slotsInEpoch: Int): (Int, Int) = {
+    if (slotNumber >= slotsInEpoch)
+      (epochNumber + 1, 1)
+    else
+      (epochNumber, slotNumber + 1)
+  }
+
   def getForgingInfo: Route = (post & path("forgingInfo")){
     val future = forgerRef ? GetForgingInfo
     val result = Await.result(future, timeout.duration).asInstanceOf[Try[ForgingInfo]]
@@ -275,7 +345,18 @@ object SidechainBlockRestSchema {
   }
 
   @JsonView(Array(classOf[Views.Default]))
-  private[api] case class RespGenerate(blockId: String) extends SuccessResponse
+  private[api] case class RespGenerate(blockId: String, parentId: String) extends SuccessResponse
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class ReqGenerateMany(number: Int) {
+    require(number > 0, s"Invalid number $number. Number must be > 0")
+  }
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class GeneratedBlockInfo(blockId: String, epochNumber: Int, slotNumber: Int, skippedSlots: Int, forgingTime: Long)
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class RespGenerateMany(blockIds: Seq[String], blocks: Seq[GeneratedBlockInfo]) extends SuccessResponse
 
   @JsonView(Array(classOf[Views.Default]))
   private[api] object RespGenerateSkipSlot extends SuccessResponse {
@@ -7,7 +7,7 @@ import com.fasterxml.jackson.annotation.JsonView
 import com.horizen.api.http.JacksonSupport._
 import com.horizen.api.http.SidechainCswErrorResponse._
 import com.horizen.api.http.SidechainCswRestScheme._
-import com.horizen.csw.CswManager.ReceivableMessages.{GenerateCswProof, GetBoxNullifier, GetCswBoxIds, GetCswInfo}
+import com.horizen.csw.CswManager.ReceivableMessages.{GenerateCswProof, GetBoxNullifier, GetCswBoxIds, GetCswInfo, GetCswProofsStatus}
 import com.horizen.csw.CswManager.Responses._
 import com.horizen.params.NetworkParams
 import com.horizen.serialization.Views
@@ -73,7 +73,7 @@ object SidechainCswApiRoute {
                                                                          (implicit override val context: ActorRefFactory, override val ec: ExecutionContext) extends SidechainCswApiRoute(settings, sidechainNodeViewHolderRef, params) {
 
     override val route: Route = pathPrefix("csw") {
-      hasCeased ~ generateCswProof ~ cswInfo ~ cswBoxIds ~ nullifier ~ isCeasedSidechainWithdrawalEnabled
+      hasCeased ~ generateCswProof ~ cswInfo ~ cswProofsStatus ~ cswBoxIds ~ nullifier ~ isCeasedSidechainWithdrawalEnabled
     }
 
     /**
@@ -128,6 +128,35 @@ object SidechainCswApiRoute {
       }
     }
 
+    /**
+     * Return the CSW proof status for each of the given box ids together with the number of boxes per status.
+     * Proofs generation is completed when no proof is in queue or in process.
+     */
+    def cswProofsStatus: Route = (post & path("cswProofsStatus")) {
+      entity(as[ReqCswProofsStatus]) { body =>
+        Try {
+          Await.result(cswManager ? GetCswProofsStatus(body.boxIds.map(BytesUtils.fromHexString)), timeout.duration).asInstanceOf[Try[Seq[ProofStatus]]]
+        } match {
+          case Success(statusesTry: Try[Seq[ProofStatus]]) =>
+            statusesTry match {
+              case Success(statuses: Seq[ProofStatus]) =>
+                val proofsStatus = body.boxIds.zip(statuses).map {
+                  case (boxId, status) => CswBoxProofStatus(boxId, status.toString)
+                }
+                val statusCounts = statuses.groupBy(_.toString).map { case (status, boxes) => status -> boxes.size }
+                val completed = !statuses.exists(status => status == InQueue || status == InProcess)
+                ApiResponseUtil.toResponse(RespCswProofsStatus(completed, statusCounts, proofsStatus))
+              case Failure(e) =>
+                log.error(e.getMessage)
+                ApiResponseUtil.toResponse(ErrorRetrievingCswInfo(e.getMessage, JOptional.of(e)))
+            }
+          case Failure(e) =>
+            log.error("Unexpected error during retrieving CSW proofs status.")
+            ApiResponseUtil.toResponse(ErrorRetrievingCswInfo("Unexpected error during retrieving CSW proofs status.", JOptional.of(e)))
+        }
+      }
+    }
+
     /**
      * Return the list with all box ids.
      */
@@ -182,7 +211,7 @@ object SidechainCswApiRoute {
     /**
      * Default implementation for all methods not supported when CSW is disabled.
      */
-    def notImplemented: Route = (post & path("cswBoxIds" | "generateCswProof" | "cswInfo" | "nullifier")) {
+    def notImplemented: Route = (post & path("cswBoxIds" | "generateCswProof" | "cswInfo" | "cswProofsStatus" | "nullifier")) {
       ApiResponseUtil.toResponse(ErrorCSWNotEnabled())
     }
 
@@ -213,6 +242,17 @@ object SidechainCswApiRoute {
   @JsonView(Array(classOf[Views.Default]))
   private[api] case class RespCswInfo(cswInfo: CswInfo) extends SuccessResponse
 
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class ReqCswProofsStatus(boxIds: Seq[String]) {
+    boxIds.foreach(boxId => require(boxId.length == 64, s"Invalid id $boxId. Id length must be 64"))
+  }
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class CswBoxProofStatus(boxId: String, status: String)
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class RespCswProofsStatus(completed: Boolean, statusCounts: Map[String, Int], proofsStatus: Seq[CswBoxProofStatus]) extends SuccessResponse
+
   @JsonView(Array(classOf[Views.Default]))
   private[api] case class RespCswBoxIds(cswBoxIds: Seq[String]) extends SuccessResponse
 
@@ -1,7 +1,9 @@
 package com.horizen.api.http
 
 import com.fasterxml.jackson.annotation.JsonView
-import com.horizen.certificatesubmitter.CertificateSubmitter.ReceivableMessages.{DisableCertificateSigner, DisableSubmitter, EnableCertificateSigner, EnableSubmitter, GetCertificateGenerationState, IsCertificateSigningEnabled, IsSubmitterEnabled}
+import com.horizen.api.http.JacksonSupport._
+import com.horizen.certificatesubmitter.CertificateSubmitter.CertificateLifecycle
+import com.horizen.certificatesubmitter.CertificateSubmitter.ReceivableMessages.{DisableCertificateSigner, DisableSubmitter, EnableCertificateSigner, EnableSubmitter, GetCertificateGenerationState, GetCertificateLifecycles, IsCertificateSigningEnabled, IsSubmitterEnabled}
 import com.horizen.serialization.Views
 import sparkz.core.settings.RESTApiSettings
 
@@ -11,13 +13,13 @@ import java.util.{Optional => JOptional}
 import akka.actor.{ActorRef, ActorRefFactory}
 import akka.http.scaladsl.server.Route
 import akka.pattern.ask
-import com.horizen.api.http.SidechainDebugErrorResponse.{ErrorRetrievingCertGenerationState, ErrorRetrievingCertSignerState, ErrorRetrievingCertSubmitterState}
-import com.horizen.api.http.SidechainDebugRestScheme.{RespCertGenerationState, RespCertSignerState, RespCertSubmitterState, RespSubmitterOk}
+import com.horizen.api.http.SidechainDebugErrorResponse.{ErrorRetrievingCertGenerationState, ErrorRetrievingCertLifecycles, ErrorRetrievingCertSignerState, ErrorRetrievingCertSubmitterState}
+import com.horizen.api.http.SidechainDebugRestScheme.{ReqCertLifecycles, RespCertGenerationState, RespCertLifecycles, RespCertSignerState, RespCertSubmitterState, RespSubmitterOk}
 
 case class SidechainSubmitterApiRoute(override val settings: RESTApiSettings, certSubmitterRef: ActorRef, sidechainNodeViewHolderRef: ActorRef)
                                      (implicit val context: ActorRefFactory, override val ec: ExecutionContext) extends SidechainApiRoute {
   override val route: Route = pathPrefix("submitter") {
-    isCertGenerationActive ~ isCertificateSubmitterEnabled ~ enableCertificateSubmitter ~ disableCertificateSubmitter ~
+    isCertGenerationActive ~ getCertificateLifecycles ~ isCertificateSubmitterEnabled ~ enableCertificateSubmitter ~ disableCertificateSubmitter ~
       isCertificateSignerEnabled ~ enableCertificateSigner ~ disableCertificateSigner
   }
 
@@ -33,6 +35,23 @@ case class SidechainSubmitterApiRoute(override val settings: RESTApiSettings, ce
     }
   }
 
+  /**
+    * Returns the timelines of the latest certificate submissions of the node, optionally filtered by the referenced epoch.
+    */
+  def getCertificateLifecycles: Route = (post & path("getCertificateLifecycles")) {
+    entity(as[ReqCertLifecycles]) { body =>
+      Try {
+        Await.result(certSubmitterRef ? GetCertificateLifecycles, timeout.duration).asInstanceOf[Seq[CertificateLifecycle]]
+      } match {
+        case Success(lifecycles) =>
+          ApiResponseUtil.toResponse(RespCertLifecycles(lifecycles.filter(lifecycle => body.epoch.forall(_ == lifecycle.referencedEpoch))))
+        case Failure(e) =>
+          log.error("Unable to retrieve certificate lifecycles.")
+          ApiResponseUtil.toResponse(ErrorRetrievingCertLifecycles("Unable to retrieve certificate lifecycles.", JOptional.of(e)))
+      }
+    }
+  }
+
   def isCertificateSubmitterEnabled: Route = (post & path("isCertificateSubmitterEnabled")) {
     Try {
       Await.result(certSubmitterRef ? IsSubmitterEnabled, timeout.duration).asInstanceOf[Boolean]
@@ -90,6 +109,12 @@ object SidechainDebugRestScheme {
 
   @JsonView(Array(classOf[Views.Default]))
   private[api] object RespSubmitterOk extends SuccessResponse
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class ReqCertLifecycles(epoch: Option[Int])
+
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class RespCertLifecycles(certificateLifecycles: Seq[CertificateLifecycle]) extends SuccessResponse
 }
 
 object SidechainDebugErrorResponse {
@@ -104,4 +129,8 @@ object SidechainDebugErrorResponse {
   case class ErrorRetrievingCertSignerState(description: String, exception: JOptional[Throwable]) extends ErrorResponse {
     override val code: String = "0603"
   }
+
+  case class ErrorRetrievingCertLifecycles(description: String, exception: JOptional[Throwable]) extends ErrorResponse {
+    override val code: String = "0604"
+  }
 }
@@ -24,12 +24,14 @@ import com.horizen.serialization.Views
 import com.horizen.transaction._
 import sparkz.core.settings.RESTApiSettings
 import com.horizen.utils.{BytesUtils, ZenCoinsUtils, Pair => JPair}
+import scorex.crypto.hash.Blake2b256
 import scala.collection.JavaConverters._
 import scala.collection.mutable.ArrayBuffer
 import scala.concurrent.{Await, ExecutionContext, Future}
 import scala.util.control.Breaks._
 import scala.util.{Failure, Success, Try}
 import java.util.{Optional => JOptional}
+import java.nio.charset.StandardCharsets
 
 case class SidechainTransactionApiRoute(override val settings: RESTApiSettings,
                                         sidechainNodeViewHolderRef: ActorRef,
@@ -46,12 +48,17 @@ case class SidechainTransactionApiRoute(override val settings: RESTApiSettings,
 
   /**
     * Returns an array of transaction ids if formatMemPool=false, otherwise a JSONObject for each transaction.
+    * If digest=true, returns only the number of transactions and a digest of their ids, which doesn't depend on
+    * the transactions order. It allows to cheaply check if different nodes have the same memory pool content.
     */
   def allTransactions: Route = (post & path("allTransactions")) {
     entity(as[ReqAllTransactions]) { body =>
       withNodeView { sidechainNodeView =>
         val unconfirmedTxs = sidechainNodeView.getNodeMemoryPool.getTransactions()
-        if (body.format.getOrElse(true)) {
+        if (body.digest.getOrElse(false)) {
+          val txIds = unconfirmedTxs.asScala.map(tx => tx.id.toString)
+          ApiResponseUtil.toResponse(RespAllTransactionsDigest(txIds.size, calculateTransactionIdsDigest(txIds)))
+        } else if (body.format.getOrElse(true)) {
           ApiResponseUtil.toResponse(RespAllTransactions(unconfirmedTxs.asScala.toList))
         } else {
           ApiResponseUtil.toResponse(RespAllTransactionIds(unconfirmedTxs.asScala.toList.map(tx => tx.id.toString)))
@@ -60,6 +67,10 @@ case class SidechainTransactionApiRoute(override val settings: RESTApiSettings,
     }
   }
 
+  private def calculateTransactionIdsDigest(txIds: Seq[String]): String = {
+    BytesUtils.toHexString(Blake2b256.hash(txIds.sorted.mkString.getBytes(StandardCharsets.UTF_8)))
+  }
+
   /**
     * Follows the same behaviour as the corresponding RPC call in zend: by default it will look for
     * transaction in memory pool. Additional parameters are:
@@ -677,7 +688,7 @@ case class SidechainTransactionApiRoute(override val settings: RESTApiSettings,
 object SidechainTransactionRestScheme {
 
   @JsonView(Array(classOf[Views.Default]))
-  private[api] case class ReqAllTransactions(format: Option[Boolean]) extends SuccessResponse
+  private[api] case class ReqAllTransactions(format: Option[Boolean], digest: Option[Boolean] = None) extends SuccessResponse
 
   @JsonView(Array(classOf[Views.Default]))
   private[api] case class RespAllTransactions(transactions: List[SidechainTypes#SCBT]) extends SuccessResponse
@@ -685,6 +696,9 @@ object SidechainTransactionRestScheme {
   @JsonView(Array(classOf[Views.Default]))
   private[api] case class RespAllTransactionIds(transactionIds: List[String]) extends SuccessResponse
 
+  @JsonView(Array(classOf[Views.Default]))
+  private[api] case class RespAllTransactionsDigest(size: Int, digest: String) extends SuccessResponse
+
   @JsonView(Array(classOf[Views.Default]))
   private[api] case class ReqFindById(transactionId: String, blockHash: Option[String], transactionIndex: Option[Boolean], format: Option[Boolean])
 
@@ -4,6 +4,7 @@ package com.horizen.certificatesubmitter
 import akka.actor.{Actor, ActorRef, ActorSystem, Props, Timers}
 import akka.pattern.ask
 import akka.util.Timeout
+import com.fasterxml.jackson.annotation.JsonView
 import com.horizen._
 import com.horizen.block.{MainchainBlockReference, SidechainBlock}
 import com.horizen.box.WithdrawalRequestBox
@@ -17,6 +18,7 @@ import com.horizen.params.NetworkParams
 import com.horizen.proof.SchnorrProof
 import com.horizen.proposition.SchnorrProposition
 import com.horizen.secret.SchnorrSecret
+import com.horizen.serialization.Views
 import com.horizen.transaction.mainchain.SidechainCreation
 import com.horizen.utils.{BytesUtils, TimeToEpochUtils, WithdrawalEpochInfo, WithdrawalEpochUtils}
 import com.horizen.websocket.client.{MainchainNodeChannel, WebsocketErrorResponseException, WebsocketInvalidErrorMessageException}
@@ -29,6 +31,7 @@ import java.io.File
 import java.util
 import java.util.Optional
 import scala.collection.JavaConverters._
+import scala.collection.mutable
 import scala.collection.mutable.ArrayBuffer
 import scala.compat.Platform.EOL
 import scala.compat.java8.OptionConverters._
@@ -65,6 +68,9 @@ class CertificateSubmitter(settings: SidechainSettings,
   private[certificatesubmitter] var signaturesStatus: Option[SignaturesStatus] = None
 
   private[certificatesubmitter] var certGenerationState: Boolean = false
+
+  // Timelines of the latest certificate submissions, ordered by the last update
+  private[certificatesubmitter] val certificateLifecycles: mutable.LinkedHashMap[Int, CertificateLifecycle] = mutable.LinkedHashMap()
   private val certificateFee = if (settings.withdrawalEpochCertificateSettings.certificateAutomaticFeeComputation) None else Some(settings.withdrawalEpochCertificateSettings.certificateFee)
 
   override def preStart(): Unit = {
@@ -114,6 +120,7 @@ class CertificateSubmitter(settings: SidechainSettings,
     tryToGenerateCertificate orElse
     getCertGenerationState orElse
     getSignaturesStatus orElse
+    certificateLifecycle orElse
     submitterStatus orElse
     signerStatus orElse
     reportStrangeInput
@@ -441,6 +448,8 @@ class CertificateSubmitter(settings: SidechainSettings,
             log.info(s"Scheduling Certificate generation in $delay seconds")
             timers.startSingleTimer(CertificateGenerationTimer, TryToGenerateCertificate, FiniteDuration(delay, SECONDS))
             context.system.eventStream.publish(CertificateSubmissionStarted)
+            self ! UpdateCertificateLifecycle(status.referencedEpoch, _ => CertificateLifecycle(
+              status.referencedEpoch, status.knownSigs.size, signaturesCollectedAt = System.currentTimeMillis()))
           }
         case None =>
           log.warn("Trying to schedule certificate generation being outside Certificate submission window.")
@@ -455,23 +464,32 @@ class CertificateSubmitter(settings: SidechainSettings,
           if (checkQuality(status)) {
             def getProofGenerationData(sidechainNodeView: View): DataForProofGeneration = buildDataForProofGeneration(sidechainNodeView, status)
 
+            val proofDataRequestedAt = System.currentTimeMillis()
+            self ! UpdateCertificateLifecycle(status.referencedEpoch, _.copy(proofDataRequestedAt = Some(proofDataRequestedAt)))
             val dataForProofGeneration = Await.result(sidechainNodeViewHolderRef ? GetDataFromCurrentView(getProofGenerationData), timeoutDuration)
               .asInstanceOf[DataForProofGeneration]
             log.debug(s"Retrieved data for certificate proof calculation: $dataForProofGeneration")
 
             // Run the time consuming part of proof generation and certificate submission in a background
             // to unlock the Actor message queue for another requests.
+            val referencedEpoch = dataForProofGeneration.referencedEpochNumber
             new Thread(new Runnable() {
               override def run(): Unit = {
                 var proofWithQuality: com.horizen.utils.Pair[Array[Byte], java.lang.Long] = null
+                self ! UpdateCertificateLifecycle(referencedEpoch, _.copy(proofGenerationStartedAt = Some(System.currentTimeMillis()),
+                  backwardTransfers = Some(dataForProofGeneration.withdrawalRequests.size)))
                 try {
                   proofWithQuality = generateProof(dataForProofGeneration)
                 } catch {
                   case e: Exception =>
                     log.error("Proof creation failed.", e)
+                    self ! UpdateCertificateLifecycle(referencedEpoch, _.failed("Proof creation failed."))
                     context.system.eventStream.publish(CertificateSubmissionStopped)
                     return
                 }
+                val quality: Long = proofWithQuality.getValue
+                self ! UpdateCertificateLifecycle(referencedEpoch,
+                  _.copy(proofGenerationFinishedAt = Some(System.currentTimeMillis()), quality = Some(quality)))
                 val certificateRequest: SendCertificateRequest = CertificateRequestCreator.create(
                   params.sidechainId,
                   dataForProofGeneration.referencedEpochNumber,
@@ -496,14 +514,18 @@ class CertificateSubmitter(settings: SidechainSettings,
                 mainchainChannel.sendCertificate(certificateRequest) match {
                   case Success(certificate) =>
                     log.info(s"Backward transfer certificate response had been received. Cert hash = " + BytesUtils.toHexString(certificate.certificateId))
+                    self ! UpdateCertificateLifecycle(referencedEpoch, _.copy(sentToMainchainAt = Some(System.currentTimeMillis()),
+                      certificateId = Some(BytesUtils.toHexString(certificate.certificateId))))
 
                   case Failure(ex) =>
                     log.error("Creation of backward transfer certificate had been failed.", ex)
+                    self ! UpdateCertificateLifecycle(referencedEpoch, _.failed("Sending of the certificate to the mainchain failed."))
                 }
                 context.system.eventStream.publish(CertificateSubmissionStopped)
               }
             }).start()
           } else {
+            self ! UpdateCertificateLifecycle(status.referencedEpoch, _.failed("Better certificate is already known."))
             context.system.eventStream.publish(CertificateSubmissionStopped)
           }
         case None => // Can occur while during the random delay the Node went out of the Window.
@@ -514,10 +536,25 @@ class CertificateSubmitter(settings: SidechainSettings,
       case Success(_) =>
       case Failure(exception) =>
         log.error("Certificate creation failed.", exception)
+        signaturesStatus.foreach(status => self ! UpdateCertificateLifecycle(status.referencedEpoch, _.failed("Certificate creation failed.")))
         context.system.eventStream.publish(CertificateSubmissionStopped)
     }
   }
 
+  private def certificateLifecycle: Receive = {
+    case UpdateCertificateLifecycle(referencedEpoch, update) =>
+      val lifecycle = update(certificateLifecycles.getOrElse(referencedEpoch, CertificateLifecycle(referencedEpoch)))
+      // Reinsert to keep the most recently updated timeline at the end
+      certificateLifecycles.remove(referencedEpoch)
+      certificateLifecycles.put(referencedEpoch, lifecycle)
+      if (certificateLifecycles.size > MaxCertificateLifecyclesToKeep)
+        certificateLifecycles.remove(certificateLifecycles.head._1)
+      context.system.eventStream.publish(CertificateLifecycleChanged(lifecycle))
+
+    case GetCertificateLifecycles =>
+      sender() ! certificateLifecycles.values.toSeq
+  }
+
   case class DataForProofGeneration(referencedEpochNumber: Int,
                                     sidechainId: Array[Byte],
                                     withdrawalRequests: Seq[WithdrawalRequestBox],
@@ -664,6 +701,9 @@ object CertificateSubmitter {
   // Certificate signature broadcasting events
   case class BroadcastLocallyGeneratedSignature(info: CertificateSignatureFromRemoteInfo) extends SubmitterEvent
 
+  // Certificate lifecycle events: published on every stage reached by the certificate submission
+  case class CertificateLifecycleChanged(lifecycle: CertificateLifecycle) extends SubmitterEvent
+
 
   // Response for SignatureFromRemote message
   sealed trait SignatureProcessingStatus
@@ -687,6 +727,25 @@ object CertificateSubmitter {
 
   case class CertificateSignatureInfo(pubKeyIndex: Int, signature: SchnorrProof)
 
+  val MaxCertificateLifecyclesToKeep: Int = 10
+
+  // Timeline of the certificate submission for the referenced epoch, timestamps are in milliseconds.
+  @JsonView(Array(classOf[Views.Default]))
+  case class CertificateLifecycle(referencedEpoch: Int,
+                                  knownSignatures: Int = 0,
+                                  signaturesCollectedAt: Long = 0,
+                                  proofGenerationStartedAt: Option[Long] = None,
+                                  proofGenerationFinishedAt: Option[Long] = None,
+                                  quality: Option[Long] = None,
+                                  sentToMainchainAt: Option[Long] = None,
+                                  certificateId: Option[String] = None,
+                                  failedAt: Option[Long] = None,
+                                  failureReason: Option[String] = None,
+                                  proofDataRequestedAt: Option[Long] = None,
+                                  backwardTransfers: Option[Int] = None) {
+    def failed(reason: String): CertificateLifecycle = copy(failedAt = Some(System.currentTimeMillis()), failureReason = Some(reason))
+  }
+
   case class CertificateSignatureFromRemoteInfo(pubKeyIndex: Int, messageToSign: Array[Byte], signature: SchnorrProof) {
     require(pubKeyIndex >= 0, "pubKeyIndex can't be negative value.")
     require(messageToSign.length == FieldElementUtils.fieldElementLength(), "messageToSign has invalid length")
@@ -707,6 +766,7 @@ object CertificateSubmitter {
 
     case object TryToGenerateCertificate
 
+    case class UpdateCertificateLifecycle(referencedEpoch: Int, update: CertificateLifecycle => CertificateLifecycle)
   }
 
   // Public interface
@@ -717,6 +777,8 @@ object CertificateSubmitter {
 
     case object GetSignaturesStatus
 
+    case object GetCertificateLifecycles
+
     // messages to set/check submitter
     case object EnableSubmitter
 
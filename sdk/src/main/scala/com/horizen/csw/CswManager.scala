@@ -7,7 +7,7 @@ import com.fasterxml.jackson.annotation.{JsonProperty, JsonView}
 import com.fasterxml.jackson.databind.annotation.JsonSerialize
 import com.horizen.cryptolibprovider.CryptoLibProvider
 import com.horizen.csw.CswManager.{ProofInProcess, ProofInQueue}
-import com.horizen.csw.CswManager.ReceivableMessages.{GenerateCswProof, GetBoxNullifier, GetCeasedStatus, GetCswBoxIds, GetCswInfo}
+import com.horizen.csw.CswManager.ReceivableMessages.{GenerateCswProof, GetBoxNullifier, GetCeasedStatus, GetCswBoxIds, GetCswInfo, GetCswProofsStatus}
 import com.horizen.csw.CswManager.Responses.{Absent, CswInfo, CswProofInfo, Generated, InProcess, InQueue, InvalidAddress, NoProofData, ProofCreationFinished, ProofGenerationInProcess, ProofGenerationStarted, SidechainIsAlive}
 import com.horizen.{SidechainAppEvents, SidechainHistory, SidechainMemoryPool, SidechainSettings, SidechainState, SidechainWallet}
 import com.horizen.params.NetworkParams
@@ -72,6 +72,7 @@ class CswManager(settings: SidechainSettings,
       onGetCswBoxIds orElse
       onGenerateCswProof orElse
       onGetCswInfo orElse
+      onGetCswProofsStatus orElse
       tryScheduleProofGeneration orElse
       processProofGenerationResults orElse
       reportStrangeInput
@@ -223,6 +224,23 @@ class CswManager(settings: SidechainSettings,
       }
   }
 
+  private def onGetCswProofsStatus: Receive = {
+    case GetCswProofsStatus(boxIds: Seq[Array[Byte]]) =>
+      if (!hasSidechainCeased) {
+        sender() ! Failure(new IllegalStateException("Sidechain is alive."))
+      } else if (cswWitnessHolderOpt.isEmpty) {
+        sender() ! Failure(new IllegalStateException("No CSW witness data defined."))
+      } else {
+        sender() ! Try {
+          boxIds.map(boxId => {
+            if (findCswData(boxId).isEmpty)
+              throw new IllegalArgumentException(s"CSW info was not found for box id ${BytesUtils.toHexString(boxId)}.")
+            getProofInfo(boxId).status
+          })
+        }
+      }
+  }
+
   private def tryScheduleProofGeneration: Receive = {
     case TryToScheduleProofGeneration =>
       // Emit next proof generation only in case no other one in process
@@ -473,6 +491,7 @@ object CswManager {
     case class GetBoxNullifier(boxId: Array[Byte])
     case class GenerateCswProof(boxId: Array[Byte], receiverAddress: String)
     case class GetCswInfo(boxId: Array[Byte])
+    case class GetCswProofsStatus(boxIds: Seq[Array[Byte]])
   }
 
   // Private interface
@@ -2,6 +2,7 @@ package com.horizen.websocket.server
 
 import akka.actor.{Actor, ActorRef, ActorSystem, Props}
 import com.horizen.block.SidechainBlock
+import com.horizen.certificatesubmitter.CertificateSubmitter.CertificateLifecycleChanged
 import sparkz.core.network.NodeViewSynchronizer.ReceivableMessages.{ChangedMempool, SemanticallySuccessfulModifier}
 import scorex.util.ScorexLogging
 
@@ -22,6 +23,7 @@ class WebSocketServer(wsPort: Int)
   override def preStart(): Unit = {
     context.system.eventStream.subscribe(self, classOf[ChangedMempool[_]])
     context.system.eventStream.subscribe(self, classOf[SemanticallySuccessfulModifier[_]])
+    context.system.eventStream.subscribe(self, classOf[CertificateLifecycleChanged])
   }
 
   override def postStop(): Unit = {
@@ -43,6 +45,9 @@ class WebSocketServer(wsPort: Int)
     case SemanticallySuccessfulModifier(block: SidechainBlock) => {
       websocket.onSemanticallySuccessfulModifier(block)
     }
+    case CertificateLifecycleChanged(lifecycle) => {
+      websocket.onCertificateLifecycleChanged(lifecycle)
+    }
   }
 }
 
@@ -5,6 +5,7 @@ import com.fasterxml.jackson.databind.node.ObjectNode
 import com.fasterxml.jackson.databind.{JsonNode, ObjectMapper}
 import com.fasterxml.jackson.module.scala.DefaultScalaModule
 import com.horizen.block.SidechainBlock
+import com.horizen.certificatesubmitter.CertificateSubmitter.CertificateLifecycle
 
 import javax.websocket.{OnClose, OnError, OnMessage, OnOpen, SendHandler, SendResult, Session}
 import javax.websocket.server.ServerEndpoint
@@ -230,6 +231,13 @@ private object WebSocketServerEndpoint extends ScorexLogging {
     }
   }
 
+  def notifyCertificateLifecycleChanged(lifecycle: CertificateLifecycle): Unit = {
+    val eventPayload: ObjectNode = mapper.valueToTree(lifecycle)
+    this.sessions.forEach(session =>{
+      WebSocketServerEndpoint.sendMessage(EVENT_MESSAGE.code, -1, 3, eventPayload, session)
+    })
+  }
+
   // answerType is new field added to the default mainchain websocket events because to help the Explorer to understand
   // which type of response is included in the message
   def sendMessage(msgType: Int,  requestId: Int, answerType: Int, payload: ObjectNode, client: Session): Unit = {
@@ -1,6 +1,7 @@
 package com.horizen.websocket.server
 
 import com.horizen.block.SidechainBlock
+import com.horizen.certificatesubmitter.CertificateSubmitter.CertificateLifecycle
 
 import javax.websocket._
 import org.glassfish.tyrus.server.Server
@@ -45,6 +46,10 @@ class WebSocketServerImpl(bindPort: Int, configuration: Class[_]) extends WebSoc
     WebSocketServerEndpoint.notifySemanticallySuccessfulModifier(block)
   }
 
+  def onCertificateLifecycleChanged(lifecycle: CertificateLifecycle): Unit = {
+    WebSocketServerEndpoint.notifyCertificateLifecycleChanged(lifecycle)
+  }
+
   override def stop(): Try[Unit] = Try {
     log.info("Stopping web socket server...")
     if (this.server != null) {
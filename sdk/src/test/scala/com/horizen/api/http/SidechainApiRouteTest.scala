@@ -270,6 +270,13 @@ abstract class SidechainApiRouteTest extends AnyWordSpec with Matchers with Scal
         case GetCswBoxIds => {
           sender ! Seq(ByteUtils.fromHexString("1111"), ByteUtils.fromHexString("2222"), ByteUtils.fromHexString("3333"))
         }
+        case GetCswProofsStatus(boxIds) => {
+          if (boxIds.exists(boxId => boxId.deep != getRandomBoxId(0).deep && boxId.deep != getRandomBoxId(1).deep)) {
+            sender ! Failure(new IllegalArgumentException("CSW info was not found for given box id."))
+          } else {
+            sender ! Success(boxIds.map(boxId => if (boxId.deep == getRandomBoxId(0).deep) Generated else InProcess))
+          }
+        }
         case GetCswInfo(boxId) => {
           val expectedBoxId: Array[Byte] = getRandomBoxId(0)
           if (boxId.deep != expectedBoxId.deep) {
@@ -325,6 +325,53 @@ class SidechainBlockApiRouteTest extends SidechainApiRouteTest {
       }
     }
 
+    "Successfully reply at /generateMany skipping not forged slots" in {
+      val firstBlockId = bytesToId("manyFirstBlock".getBytes())
+      val secondBlockId = bytesToId("manySecondBlock".getBytes())
+      sidechainApiMockConfiguration.should_blockActor_ForgingInfo_reply = Success(forge.ForgingInfo(10, 60,
+        ConsensusEpochAndSlot(intToConsensusEpochNumber(7), intToConsensusSlotNumber(59)), forgingEnabled = false))
+      sidechainApiMockConfiguration.blockActor_ForgingEpochAndSlot_reply.put(
+        ConsensusEpochAndSlot(intToConsensusEpochNumber(7), intToConsensusSlotNumber(60)), Success(firstBlockId))
+      sidechainApiMockConfiguration.blockActor_ForgingEpochAndSlot_reply.put(
+        ConsensusEpochAndSlot(intToConsensusEpochNumber(8), intToConsensusSlotNumber(1)), Failure(new IllegalArgumentException))
+      sidechainApiMockConfiguration.blockActor_ForgingEpochAndSlot_reply.put(
+        ConsensusEpochAndSlot(intToConsensusEpochNumber(8), intToConsensusSlotNumber(3)), Success(secondBlockId))
+
+      Post(basePath + "generateMany").withEntity("{\"number\": 2}") ~> sidechainBlockApiRoute ~> check {
+        status.intValue() shouldBe StatusCodes.OK.intValue
+        responseEntity.getContentType() shouldEqual ContentTypes.`application/json`
+        val result = mapper.readTree(entityAs[String]).get("result")
+        if (result == null)
+          fail("Serialization failed for object SidechainApiResponseBody")
+
+        assertEquals(2, result.elements().asScala.length)
+        assertEquals(Seq(firstBlockId, secondBlockId), result.get("blockIds").elements().asScala.map(_.asText()).toSeq)
+
+        val blocks = result.get("blocks").elements().asScala.toSeq
+        assertEquals(2, blocks.size)
+        assertEquals(firstBlockId, blocks.head.get("blockId").asText())
+        assertEquals(7, blocks.head.get("epochNumber").asInt())
+        assertEquals(60, blocks.head.get("slotNumber").asInt())
+        assertEquals(0, blocks.head.get("skippedSlots").asInt())
+        assertTrue(blocks.head.get("forgingTime").isNumber)
+        assertEquals(secondBlockId, blocks(1).get("blockId").asText())
+        assertEquals(8, blocks(1).get("epochNumber").asInt())
+        assertEquals(3, blocks(1).get("slotNumber").asInt())
+        assertEquals(2, blocks(1).get("skippedSlots").asInt())
+      }
+    }
+
+    "Failed reply at /generateMany when whole epoch is skipped" in {
+      sidechainApiMockConfiguration.should_blockActor_ForgingInfo_reply = Success(forge.ForgingInfo(10, 5,
+        ConsensusEpochAndSlot(intToConsensusEpochNumber(20), intToConsensusSlotNumber(1)), forgingEnabled = false))
+
+      Post(basePath + "generateMany").withEntity("{\"number\": 1}") ~> sidechainBlockApiRoute ~> check {
+        status.intValue() shouldBe StatusCodes.OK.intValue
+        responseEntity.getContentType() shouldEqual ContentTypes.`application/json`
+        assertsOnSidechainErrorResponseSchema(entityAs[String], ErrorBlockNotCreated("", JOptional.empty()).code)
+      }
+    }
+
     "Successfully reply at /forgingInfo" in {
       val expectedConsensusSecondsInSlot = 1000
       val expectedConsensusSlotsInEpoch = 60
@@ -2,6 +2,7 @@ package com.horizen.api.http
 
 import akka.http.scaladsl.model.{ContentTypes, HttpMethods, StatusCodes}
 import akka.http.scaladsl.server.{MalformedRequestContentRejection, MethodRejection, Route}
+import com.horizen.api.http.SidechainCswErrorResponse.ErrorRetrievingCswInfo
 import com.horizen.fixtures.BoxFixture
 import com.horizen.params.MainNetParams
 import com.typesafe.scalalogging.Logger
@@ -10,6 +11,7 @@ import org.junit.Assert._
 import org.mockito.Mockito
 import org.slf4j.LoggerFactory
 
+import java.util.{Optional => JOptional}
 import scala.collection.JavaConverters._
 
 class SidechainCswApiRouteTest extends SidechainApiRouteTest with BoxFixture {
@@ -177,6 +179,45 @@ class SidechainCswApiRouteTest extends SidechainApiRouteTest with BoxFixture {
       }
     }
 
+    "reply at /cswProofsStatus" in {
+      val generatedBoxId = ByteUtils.toHexString(getRandomBoxId(0))
+      val inProcessBoxId = ByteUtils.toHexString(getRandomBoxId(1))
+      Post(basePath + "cswProofsStatus")
+        .withEntity("{\"boxIds\":[\"" + generatedBoxId + "\", \"" + inProcessBoxId + "\"]}") ~> sidechainCswApiRoute ~> check {
+        status.intValue() shouldBe StatusCodes.OK.intValue
+        responseEntity.getContentType() shouldEqual ContentTypes.`application/json`
+        val result = mapper.readTree(entityAs[String]).get("result")
+        if (result == null)
+          fail("Serialization failed for object sidechainCswApiRoute")
+
+        assertEquals(3, result.elements().asScala.length)
+        assertTrue(result.get("completed").isBoolean)
+        assertFalse(result.get("completed").asBoolean())
+        assertEquals(1, result.get("statusCounts").get("Generated").asInt())
+        assertEquals(1, result.get("statusCounts").get("InProcess").asInt())
+
+        val proofsStatus = result.get("proofsStatus").elements().asScala.toSeq
+        assertEquals(2, proofsStatus.size)
+        assertEquals(generatedBoxId, proofsStatus.head.get("boxId").asText())
+        assertEquals("Generated", proofsStatus.head.get("status").asText())
+        assertEquals(inProcessBoxId, proofsStatus(1).get("boxId").asText())
+        assertEquals("InProcess", proofsStatus(1).get("status").asText())
+      }
+
+      Post(basePath + "cswProofsStatus")
+        .withEntity("{\"boxIds\":[\"" + generatedBoxId + "\"]}") ~> sidechainCswApiRoute ~> check {
+        status.intValue() shouldBe StatusCodes.OK.intValue
+        val result = mapper.readTree(entityAs[String]).get("result")
+        assertTrue(result.get("completed").asBoolean())
+      }
+
+      Post(basePath + "cswProofsStatus")
+        .withEntity("{\"boxIds\":[\"" + ByteUtils.toHexString(getRandomBoxId(2)) + "\"]}") ~> sidechainCswApiRoute ~> check {
+        status.intValue() shouldBe StatusCodes.OK.intValue
+        assertsOnSidechainErrorResponseSchema(entityAs[String], ErrorRetrievingCswInfo("", JOptional.empty()).code)
+      }
+    }
+
     "reply at /nullifier" in {
       Post(basePath + "nullifier")
         .withEntity("{\"boxId\":\"" + ByteUtils.toHexString(getRandomBoxId(0)) + "\"}") ~> sidechainCswApiRoute ~> check {
@@ -267,6 +308,13 @@ class SidechainCswApiRouteTest extends SidechainApiRouteTest with BoxFixture {
       }
     }
 
+    "reply that it is not implemented at /cswProofsStatus" in {
+      Post(basePath + "cswProofsStatus")
+        .withEntity("{\"boxIds\":[\"" + ByteUtils.toHexString(getRandomBoxId(0)) + "\"]}") ~> sidechainCswApiRouteWithDisabledCSW ~> check {
+        checkIsNotImplemented()
+      }
+    }
+
     "reply that it is not implemented at /nullifier" in {
       Post(basePath + "nullifier")
         .withEntity("{\"boxId\":\"" + ByteUtils.toHexString(getRandomBoxId(0)) + "\"}") ~> sidechainCswApiRouteWithDisabledCSW ~> check {
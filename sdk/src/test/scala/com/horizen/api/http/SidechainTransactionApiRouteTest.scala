@@ -9,9 +9,11 @@ import com.horizen.serialization.SerializationUtil
 import com.horizen.transaction.RegularTransactionSerializer
 import com.horizen.utils.BytesUtils
 import org.junit.Assert._
+import scorex.crypto.hash.Blake2b256
 
 import scala.collection.JavaConverters._
 import java.util.{Optional => JOptional}
+import java.nio.charset.StandardCharsets
 
 class SidechainTransactionApiRouteTest extends SidechainApiRouteTest {
 
@@ -152,6 +154,22 @@ class SidechainTransactionApiRouteTest extends SidechainApiRouteTest {
         for (i <- 0 to transactionIdsJsonNode.size - 1)
           assertEquals(memoryPool.get(i).id, transactionIdsJsonNode(i).asText())
       }
+      // parameter 'digest' = true
+      Post(basePath + "allTransactions")
+        .withEntity(SerializationUtil.serialize(ReqAllTransactions(None, Some(true)))) ~> sidechainTransactionApiRoute ~> check {
+        status.intValue() shouldBe StatusCodes.OK.intValue
+        responseEntity.getContentType() shouldEqual ContentTypes.`application/json`
+        val result = mapper.readTree(entityAs[String]).get("result")
+        if (result == null)
+          fail("Serialization failed for object SidechainApiResponseBody")
+
+        assertEquals(2, result.elements().asScala.length)
+        assertEquals(memoryPool.size(), result.get("size").asInt())
+        // digest is calculated on the sorted transaction ids
+        val expectedDigest = BytesUtils.toHexString(Blake2b256.hash(
+          memoryPool.asScala.map(tx => tx.id.toString).sorted.mkString.getBytes(StandardCharsets.UTF_8)))
+        assertEquals(expectedDigest, result.get("digest").asText())
+      }
     }
 
     "reply at /findById" in {
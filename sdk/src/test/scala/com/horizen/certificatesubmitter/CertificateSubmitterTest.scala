@@ -7,7 +7,7 @@ import akka.util.Timeout
 import com.horizen._
 import com.horizen.block._
 import com.horizen.box.Box
-import com.horizen.certificatesubmitter.CertificateSubmitter.InternalReceivableMessages.TryToGenerateCertificate
+import com.horizen.certificatesubmitter.CertificateSubmitter.InternalReceivableMessages.{TryToGenerateCertificate, UpdateCertificateLifecycle}
 import com.horizen.certificatesubmitter.CertificateSubmitter.ReceivableMessages._
 import com.horizen.certificatesubmitter.CertificateSubmitter.Timers.CertificateGenerationTimer
 import com.horizen.certificatesubmitter.CertificateSubmitter._
@@ -351,6 +351,55 @@ class CertificateSubmitterTest extends JUnitSuite with MockitoSugar {
     assertEquals("Known sigs array is different.", knownSigs, status.knownSigs)
   }
 
+  @Test
+  def certificateLifecycles(): Unit = {
+    val mockedSettings: SidechainSettings = getMockedSettings(timeout.duration * 100, submitterIsEnabled = true, signerIsEnabled = true)
+
+    val certificateSubmitterRef: TestActorRef[CertificateSubmitter] = TestActorRef(
+      Props(new CertificateSubmitter(mockedSettings, TestProbe().ref, mock[NetworkParams], mock[MainchainNodeChannel])))
+
+    val submitter: CertificateSubmitter = certificateSubmitterRef.underlyingActor
+
+    // Skip initialization
+    submitter.context.become(submitter.workingCycle)
+
+    val lifecycleEventListener = TestProbe()
+    actorSystem.eventStream.subscribe(lifecycleEventListener.ref, classOf[CertificateLifecycleChanged])
+
+    // Test 1: no submissions happened
+    var lifecycles = Await.result(certificateSubmitterRef ? GetCertificateLifecycles, timeout.duration).asInstanceOf[Seq[CertificateLifecycle]]
+    assertTrue("No lifecycles expected.", lifecycles.isEmpty)
+
+    // Test 2: stages of the submission are collected and published
+    val referencedEpochNumber = 3
+    certificateSubmitterRef ! UpdateCertificateLifecycle(referencedEpochNumber, _ => CertificateLifecycle(referencedEpochNumber, 5, 1000))
+    lifecycleEventListener.expectMsg(CertificateLifecycleChanged(CertificateLifecycle(referencedEpochNumber, 5, 1000)))
+
+    certificateSubmitterRef ! UpdateCertificateLifecycle(referencedEpochNumber, _.copy(proofDataRequestedAt = Some(1500)))
+    certificateSubmitterRef ! UpdateCertificateLifecycle(referencedEpochNumber, _.copy(proofGenerationStartedAt = Some(2000), backwardTransfers = Some(10)))
+    certificateSubmitterRef ! UpdateCertificateLifecycle(referencedEpochNumber, _.copy(proofGenerationFinishedAt = Some(3000), quality = Some(5)))
+    certificateSubmitterRef ! UpdateCertificateLifecycle(referencedEpochNumber, _.copy(sentToMainchainAt = Some(4000), certificateId = Some("aa")))
+
+    val expectedLifecycle = CertificateLifecycle(referencedEpochNumber, 5, 1000, Some(2000), Some(3000), Some(5), Some(4000), Some("aa"),
+      proofDataRequestedAt = Some(1500), backwardTransfers = Some(10))
+    lifecycleEventListener.receiveN(3)
+    lifecycleEventListener.expectMsg(CertificateLifecycleChanged(expectedLifecycle))
+
+    lifecycles = Await.result(certificateSubmitterRef ? GetCertificateLifecycles, timeout.duration).asInstanceOf[Seq[CertificateLifecycle]]
+    assertEquals("Different lifecycles found.", Seq(expectedLifecycle), lifecycles)
+
+    // Test 3: only the latest lifecycles are kept
+    (0 until MaxCertificateLifecyclesToKeep).foreach(epoch =>
+      certificateSubmitterRef ! UpdateCertificateLifecycle(referencedEpochNumber + 1 + epoch, _.failed("test")))
+
+    lifecycles = Await.result(certificateSubmitterRef ? GetCertificateLifecycles, timeout.duration).asInstanceOf[Seq[CertificateLifecycle]]
+    assertEquals("Different number of lifecycles found.", MaxCertificateLifecyclesToKeep, lifecycles.size)
+    assertFalse("The oldest lifecycle expected to be removed.", lifecycles.exists(_.referencedEpoch == referencedEpochNumber))
+    assertTrue("Lifecycles expected to be failed.", lifecycles.forall(lifecycle => lifecycle.failureReason.contains("test")))
+
+    actorSystem.eventStream.unsubscribe(lifecycleEventListener.ref)
+  }
+
   @Test
   def newBlockArrived(): Unit = {
     val mockedSettings: SidechainSettings = getMockedSettings(timeout.duration * 100, submitterIsEnabled = true, signerIsEnabled = true)